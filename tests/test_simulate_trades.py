@@ -0,0 +1,51 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# The strategy reads './user_data/mgm-config.json' on import, so import it from the root of the MoniGoMani folder
+root_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(root_directory)
+sys.path.insert(0, root_directory)
+
+from freqtrade.strategy import IStrategy  # noqa: E402
+from user_data.strategies.MoniGoManiHyperStrategy import MoniGoManiHyperStrategy  # noqa: E402
+
+# Settings Freqtrade's StrategyResolver sets upon the strategy, which the simulator has to resolve by itself otherwise
+sell_settings = ['use_sell_signal', 'ignore_roi_if_buy_signal', 'sell_profit_only', 'sell_profit_offset']
+
+
+def get_candles():
+    close = np.linspace(100, 110, 20)
+    return pd.DataFrame({
+        'date': pd.date_range('2021-01-01', periods=len(close), freq='5min', tz='UTC'),
+        'open': close, 'high': close * 1.001, 'low': close * 0.999, 'close': close, 'volume': 1.0,
+        'buy': np.where(np.arange(len(close)) == 1, 1, 0),
+        'sell': np.where(np.arange(len(close)) == 5, 1, 0)
+    })
+
+
+def simulate_without_resolver(monkeypatch, config):
+    for setting in sell_settings:
+        monkeypatch.delattr(IStrategy, setting, raising=False)
+    strategy = MoniGoManiHyperStrategy({'runmode': 'backtest', **config})
+    assert all(hasattr(strategy, setting) is False for setting in sell_settings)
+
+    return strategy.simulate_trades(get_candles(), {'pair': 'BTC/USDT'}, minimal_roi={'0': 10}, stoploss=-0.99,
+                                    trailing_stop=False)
+
+
+def test_simulate_trades_without_resolver_uses_freqtrade_defaults(monkeypatch):
+    trades = simulate_without_resolver(monkeypatch, {})
+
+    assert len(trades) == 1
+    assert trades['sell_reason'].iloc[0] == 'sell_signal'
+
+
+@pytest.mark.parametrize('config', [{'ask_strategy': {'use_sell_signal': False}}, {'use_sell_signal': False}])
+def test_simulate_trades_without_resolver_uses_config_settings(monkeypatch, config):
+    trades = simulate_without_resolver(monkeypatch, config)
+
+    assert 'sell_signal' not in trades['sell_reason'].tolist()
@@ -0,0 +1,318 @@
+__copyright__ = "The GNU General Public License v3.0"
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+from freqtrade.optimize.hyperopt import IHyperOptLoss
+from pandas import DataFrame
+
+# Percentage of loss to ignore while HyperOpting (Small losses are a by-product of the MGM unclogger)
+unclogger_profit_ratio_loss_tolerance = -1/100  # -1%
+
+# Smallest max drawdown divided by in the MGMMaxDrawdownLoss (0.01 = 1% drawdown), so runs without (or with a tiny)
+# drawdown are scored continuously instead of being divided by (almost) 0
+max_drawdown_epsilon = 0.01
+
+# Names of all objectives calculated by 'calculate_objectives'
+objective_names = ['win_ratio', 'unclogged_win_ratio', 'total_profit', 'max_drawdown', 'sortino_ratio', 'sharpe_ratio']
+# Objectives where a lower value is better, all others are maximized
+minimized_objective_names = ['max_drawdown']
+
+# Default 'pareto_loss' settings, used when 'monigomani_settings' doesn't configure them
+default_pareto_loss_settings = {
+    'objective_store': 'mgm-pareto-objectives.jsonl',
+    'weights': {'unclogged_win_ratio': 1, 'total_profit': 1}
+}
+
+
+def calculate_objectives(results: DataFrame, trade_count: int, min_date: datetime, max_date: datetime) -> Dict:
+    """
+    Calculates all MGM objectives of a HyperOpt epoch at once. 'profit_ratio' is only pulled out of the results once as
+    a numpy array, no rows get copied to count the wins/draws/losses, so adding objectives barely adds scoring cost.
+
+    - win_ratio: Winning trades out of all trades
+    - unclogged_win_ratio: Winning trades out of the draws & the losses worse than the unclogger tolerance
+    - total_profit: Sum of all profit ratios
+    - max_drawdown: Largest drop of the cumulative profit ratio (trades ordered by close date)
+    - sortino_ratio & sharpe_ratio: Annualized daily expected return divided by the downside/total standard deviation
+      (Calculated the same way as Freqtrade's SortinoHyperOptLoss & SharpeHyperOptLoss)
+
+    :param results: DataFrame containing the trades of the epoch
+    :param trade_count: Amount of trades
+    :param min_date: Start date of the HyperOpt timerange
+    :param max_date: End date of the HyperOpt timerange
+    :return: Dictionary containing the value of each objective in 'objective_names'
+    """
+
+    profit_ratios = results['profit_ratio'].to_numpy(dtype=float)
+    trade_count = len(profit_ratios) if trade_count is None else trade_count
+
+    wins = np.count_nonzero(profit_ratios > 0)
+    draws = np.count_nonzero(profit_ratios == 0)
+    losing_trades_excluding_unclogger_ones = np.count_nonzero(profit_ratios < unclogger_profit_ratio_loss_tolerance)
+    total_profit = profit_ratios.sum()
+
+    unclogged_denominator = draws + losing_trades_excluding_unclogger_ones
+    objectives = {
+        'win_ratio': wins / trade_count if trade_count != 0 else 0,
+        'unclogged_win_ratio': wins / unclogged_denominator if unclogged_denominator != 0 else 0,
+        'total_profit': total_profit,
+        'max_drawdown': 0.0,
+        'sortino_ratio': -20.0,
+        'sharpe_ratio': -20.0
+    }
+    if len(profit_ratios) == 0:
+        return objectives
+
+    # Drawdown of the cumulative profit, trades ordered by close date
+    if 'close_date' in results.columns:
+        cumulative_profit = np.cumsum(profit_ratios[np.argsort(results['close_date'].to_numpy(), kind='stable')])
+    else:
+        cumulative_profit = np.cumsum(profit_ratios)
+    objectives['max_drawdown'] = float(max(np.max(np.maximum.accumulate(cumulative_profit) - cumulative_profit), 0))
+
+    # Adding slippage of 0.05% per trade (like Freqtrade does)
+    slipped_profit_ratios = profit_ratios - 0.0005
+    expected_returns_mean = slipped_profit_ratios.sum() / max((max_date - min_date).days, 1)
+    down_stdev = np.std(np.where(slipped_profit_ratios < 0, profit_ratios, 0))
+    if down_stdev != 0:
+        objectives['sortino_ratio'] = expected_returns_mean / down_stdev * np.sqrt(365)
+    up_stdev = np.std(slipped_profit_ratios)
+    if up_stdev != 0:
+        objectives['sharpe_ratio'] = expected_returns_mean / up_stdev * np.sqrt(365)
+
+    return objectives
+
+
+def get_trades_fingerprint(profit_ratios: List[float]) -> str:
+    """
+    Fingerprints the trades of an epoch, used to link a stored objective vector to its epoch in the '.fthypt' results
+    (Which store the same trades under 'results_metrics')
+    :param profit_ratios: Profit ratios of all trades of the epoch (In the order of the results)
+    :return: Fingerprint string
+    """
+
+    profit_ratios = np.asarray(profit_ratios, dtype=np.float64)
+    return f'{len(profit_ratios)}-{hashlib.sha1(profit_ratios.tobytes()).hexdigest()[:16]}'
+
+
+def get_objective_store_path(config: Dict) -> str:
+    """
+    Returns the path of the sidecar objective store (inside 'user_data/hyperopt_results/')
+    :param config: Freqtrade configuration (Including the 'monigomani_settings' of 'mgm-config.json')
+    :return: Path to the objective store
+    """
+
+    pareto_loss_settings = config.get('monigomani_settings', {}).get('pareto_loss', default_pareto_loss_settings)
+    user_data_dir = config.get('user_data_dir', os.path.join(os.getcwd(), 'user_data'))
+    return os.path.join(str(user_data_dir), 'hyperopt_results', pareto_loss_settings['objective_store'])
+
+
+def get_run_id(config: Dict) -> str:
+    """
+    Returns the identifier of the HyperOpt run (or re-score) recorded with each objective vector, so the objective store
+    can be filtered per run. The MGM strategy sets it as 'mgm_run_id' when HyperOpting (an opaque start time + process
+    id, which doesn't match the name of the '.fthypt' results file of the run, use 'join_fthypt_epochs' to link the
+    epochs to it), the HyperOpt Results ReScorer sets it to the name of the re-scored '.fthypt' file
+    :param config: Freqtrade configuration
+    :return: Run identifier ('unknown' when not set)
+    """
+
+    return str(config.get('mgm_run_id', 'unknown'))
+
+
+def load_objective_store(objective_store_path: str, run_id: str = None) -> List[Dict]:
+    """
+    Loads the objective vectors recorded by the MGMParetoLoss
+    :param objective_store_path: Path to the objective store
+    :param run_id: Only load the objective vectors of this run (Defaults to all runs)
+    :return: List of dictionaries containing the run id, fingerprint, loss & objectives of each epoch
+    """
+
+    with open(objective_store_path, 'r') as file_object:
+        epochs = [json.loads(line) for line in file_object if line.strip() != '']
+    return epochs if run_id is None else [epoch for epoch in epochs if epoch.get('run_id') == run_id]
+
+
+def join_fthypt_epochs(epochs: List[Dict], fthypt_file: str) -> List[Dict]:
+    """
+    Links stored objective vectors to their epochs in a '.fthypt' HyperOpt results file, by matching their trades
+    fingerprint with the one of the trades stored under 'results_metrics'. Epochs with identical trades are linked to the
+    first one of them.
+    :param epochs: List of dictionaries containing the fingerprint of each epoch (Like loaded from the objective store)
+    :param fthypt_file: Path to the '.fthypt' HyperOpt results file of the run
+    :return: List of the epochs, with the 'current_epoch' & 'params_dict' of their '.fthypt' epoch added when found
+    """
+
+    fthypt_epochs = {}
+    with open(fthypt_file, 'r') as file_object:
+        for line in file_object:
+            if line.strip() == '':
+                continue
+            fthypt_epoch = json.loads(line)
+            fingerprint = get_trades_fingerprint(
+                [trade['profit_ratio'] for trade in fthypt_epoch['results_metrics']['trades']])
+            fthypt_epochs.setdefault(fingerprint, {'current_epoch': fthypt_epoch.get('current_epoch'),
+                                                   'params_dict': fthypt_epoch.get('params_dict')})
+
+    return [{**epoch, **fthypt_epochs.get(epoch['fingerprint'], {})} for epoch in epochs]
+
+
+def extract_pareto_epochs(epochs: List[Dict], objectives: List[str] = None, weights: Dict = None) -> List[Dict]:
+    """
+    Extracts the Pareto-optimal epochs: The epochs that no other epoch beats on one of the objectives without being
+    worse on another one. The best epoch of any (positive) weighting of the objectives is always one of these.
+    :param epochs: List of dictionaries containing the value of each objective (Like loaded from the objective store)
+    :param objectives: Names of the objectives to compare on (Defaults to all 'objective_names')
+    :param weights: Optional weight per objective, to sort the Pareto-optimal epochs on their weighted score
+    :return: List of the Pareto-optimal epochs
+    """
+
+    objectives = objective_names if objectives is None else objectives
+    if len(epochs) == 0:
+        return []
+
+    # Orient all objectives so higher is better
+    directions = np.array([-1 if objective in minimized_objective_names else 1 for objective in objectives])
+    values = np.array([[epoch[objective] for objective in objectives] for epoch in epochs], dtype=float) * directions
+
+    # An epoch can only be dominated by epochs with a higher sum, so checking against the front found so far suffices
+    front = []
+    for epoch_index in np.argsort(-values.sum(axis=1), kind='stable'):
+        front_values = values[front]
+        if not np.any(np.all(front_values >= values[epoch_index], axis=1) &
+                      np.any(front_values > values[epoch_index], axis=1)):
+            front.append(epoch_index)
+
+    pareto_epochs = [epochs[epoch_index] for epoch_index in sorted(front)]
+    if weights is not None:
+        pareto_epochs.sort(key=lambda epoch: -sum(
+            weight * epoch[objective] * (-1 if objective in minimized_objective_names else 1)
+            for objective, weight in weights.items()))
+
+    return pareto_epochs
+
+
+class MGMWinRatioLoss(IHyperOptLoss):
+
+    @staticmethod
+    def hyperopt_loss_function(results: DataFrame, trade_count: int,
+                               min_date: datetime, max_date: datetime,
+                               config: Dict, processed: Dict[str, DataFrame],
+                               *args, **kwargs) -> float:
+        """
+        Objective function, returns smaller number for better results
+        Optimizes for the most winning trades out of all trades
+        """
+        return -calculate_objectives(results, trade_count, min_date, max_date)['win_ratio']
+
+
+class MGMUncloggedWinRatioLoss(IHyperOptLoss):
+
+    @staticmethod
+    def hyperopt_loss_function(results: DataFrame, trade_count: int,
+                               min_date: datetime, max_date: datetime,
+                               config: Dict, processed: Dict[str, DataFrame],
+                               *args, **kwargs) -> float:
+        """
+        Objective function, returns smaller number for better results
+        Optimizes for the most winning trades, ignoring the losses within the unclogger tolerance
+        """
+        return -calculate_objectives(results, trade_count, min_date, max_date)['unclogged_win_ratio']
+
+
+class MGMTotalProfitLoss(IHyperOptLoss):
+
+    @staticmethod
+    def hyperopt_loss_function(results: DataFrame, trade_count: int,
+                               min_date: datetime, max_date: datetime,
+                               config: Dict, processed: Dict[str, DataFrame],
+                               *args, **kwargs) -> float:
+        """
+        Objective function, returns smaller number for better results
+        Optimizes for the highest total profit ratio
+        """
+        return -calculate_objectives(results, trade_count, min_date, max_date)['total_profit']
+
+
+class MGMMaxDrawdownLoss(IHyperOptLoss):
+
+    @staticmethod
+    def hyperopt_loss_function(results: DataFrame, trade_count: int,
+                               min_date: datetime, max_date: datetime,
+                               config: Dict, processed: Dict[str, DataFrame],
+                               *args, **kwargs) -> float:
+        """
+        Objective function, returns smaller number for better results
+        Optimizes for the highest total profit per unit of max drawdown (Drawdowns below 'max_drawdown_epsilon' count
+        as 'max_drawdown_epsilon')
+        """
+        objectives = calculate_objectives(results, trade_count, min_date, max_date)
+        return -objectives['total_profit'] / max(objectives['max_drawdown'], max_drawdown_epsilon)
+
+
+class MGMSortinoLoss(IHyperOptLoss):
+
+    @staticmethod
+    def hyperopt_loss_function(results: DataFrame, trade_count: int,
+                               min_date: datetime, max_date: datetime,
+                               config: Dict, processed: Dict[str, DataFrame],
+                               *args, **kwargs) -> float:
+        """
+        Objective function, returns smaller number for better results
+        Optimizes for the highest Sortino ratio
+        """
+        return -calculate_objectives(results, trade_count, min_date, max_date)['sortino_ratio']
+
+
+class MGMSharpeLoss(IHyperOptLoss):
+
+    @staticmethod
+    def hyperopt_loss_function(results: DataFrame, trade_count: int,
+                               min_date: datetime, max_date: datetime,
+                               config: Dict, processed: Dict[str, DataFrame],
+                               *args, **kwargs) -> float:
+        """
+        Objective function, returns smaller number for better results
+        Optimizes for the highest Sharpe ratio
+        """
+        return -calculate_objectives(results, trade_count, min_date, max_date)['sharpe_ratio']
+
+
+class MGMParetoLoss(IHyperOptLoss):
+
+    @staticmethod
+    def hyperopt_loss_function(results: DataFrame, trade_count: int,
+                               min_date: datetime, max_date: datetime,
+                               config: Dict, processed: Dict[str, DataFrame],
+                               *args, **kwargs) -> float:
+        """
+        Objective function, returns smaller number for better results
+
+        Calculates the whole objective vector of each epoch and records it in a sidecar objective store
+        ('pareto_loss' > 'objective_store' inside 'user_data/hyperopt_results/'), so the Pareto-optimal epochs for any
+        weighting can be extracted afterwards with 'extract_pareto_epochs', all from one single HyperOpt run.
+        Each line holds the run id (See 'get_run_id') & a trades fingerprint, which 'join_fthypt_epochs' links back to
+        the epoch & its params in the '.fthypt' results.
+        HyperOpt itself is steered by the weighted sum of the objectives configured under 'pareto_loss' > 'weights'
+        """
+        pareto_loss_settings = \
+            config.get('monigomani_settings', {}).get('pareto_loss', default_pareto_loss_settings)
+        objectives = calculate_objectives(results, trade_count, min_date, max_date)
+        loss = -sum(weight * objectives[objective] * (-1 if objective in minimized_objective_names else 1)
+                    for objective, weight in pareto_loss_settings['weights'].items())
+
+        # Each epoch is appended as 1 small line in 1 write, so parallel HyperOpt workers can share the store
+        objective_store_path = get_objective_store_path(config)
+        os.makedirs(os.path.dirname(objective_store_path), exist_ok=True)
+        line = json.dumps({'run_id': get_run_id(config),
+                           'fingerprint': get_trades_fingerprint(results['profit_ratio']), 'loss': loss,
+                           **{objective: float(value) for objective, value in objectives.items()}})
+        with open(objective_store_path, 'a') as file_object:
+            file_object.write(line + '\n')
+
+        return loss
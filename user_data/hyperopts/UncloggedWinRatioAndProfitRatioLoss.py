@@ -4,12 +4,16 @@ __copyright__ = "The GNU General Public License v3.0"
 from datetime import datetime
 from typing import Dict
 
+import numpy as np
 from freqtrade.optimize.hyperopt import IHyperOptLoss
 from pandas import DataFrame
 
 
 class UncloggedWinRatioAndProfitRatioLoss(IHyperOptLoss):
 
+    # Percentage of loss to ignore while HyperOpting
+    unclogger_profit_ratio_loss_tolerance = -1/100  # -1%
+
     @staticmethod
     def hyperopt_loss_function(results: DataFrame, trade_count: int,
                                min_date: datetime, max_date: datetime,
@@ -30,14 +34,14 @@ class UncloggedWinRatioAndProfitRatioLoss(IHyperOptLoss):
         are ignored, as those are considered to be a by-product of the MGM unclogger
         """
 
-        # Percentage of loss to ignore while HyperOpting
-        unclogger_profit_ratio_loss_tolerance = -1/100  # -1%
+        unclogger_profit_ratio_loss_tolerance = \
+            UncloggedWinRatioAndProfitRatioLoss.unclogger_profit_ratio_loss_tolerance
 
-        wins = len(results[results['profit_ratio'] > 0])
-        draws = len(results[results['profit_ratio'] == 0])
-        losing_trades_excluding_unclogger_ones = \
-            len(results[results['profit_ratio'] < unclogger_profit_ratio_loss_tolerance])
-        avg_profit = results['profit_ratio'].sum() * 100.0
+        profit_ratios = results['profit_ratio'].to_numpy()
+        wins = np.count_nonzero(profit_ratios > 0)
+        draws = np.count_nonzero(profit_ratios == 0)
+        losing_trades_excluding_unclogger_ones = np.count_nonzero(profit_ratios < unclogger_profit_ratio_loss_tolerance)
+        avg_profit = profit_ratios.sum() * 100.0
 
         denominator = draws + losing_trades_excluding_unclogger_ones
         win_ratio = wins / denominator if denominator != 0 else 0
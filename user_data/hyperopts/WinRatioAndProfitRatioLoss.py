@@ -4,6 +4,7 @@ __copyright__ = "The GNU General Public License v3.0"
 from datetime import datetime
 from typing import Dict
 
+import numpy as np
 from pandas import DataFrame
 
 from freqtrade.optimize.hyperopt import IHyperOptLoss
@@ -28,8 +29,9 @@ class WinRatioAndProfitRatioLoss(IHyperOptLoss):
         and prevent over-fitting on best profit only
         """        
 
-        wins = len(results[results['profit_ratio'] > 0])
-        avg_profit = results['profit_ratio'].sum() * 100.0
+        profit_ratios = results['profit_ratio'].to_numpy()
+        wins = np.count_nonzero(profit_ratios > 0)
+        avg_profit = profit_ratios.sum() * 100.0
 
         win_ratio = wins / trade_count
         return -avg_profit * win_ratio * 100
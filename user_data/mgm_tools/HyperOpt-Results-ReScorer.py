@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# --- ↑↓ Do not remove these libs ↑↓ -----------------------------------------------------------------------------------
+import argparse
+import importlib.util
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from itertools import islice
+from multiprocessing import Pool, cpu_count
+
+import pandas as pd
+# ---- ↑ Do not remove these libs ↑ ------------------------------------------------------------------------------------
+
+# HyperOpt Results ReScorer for MoniGoMani
+# ========================================
+# Re-applies any (MGM) HyperOpt Loss function upon the trades of all epochs stored in a '.fthypt' HyperOpt results file
+# to produce a new ranking, without having to re-run the HyperOpt itself.
+#
+# Execute: `python ./user_data/mgm_tools/HyperOpt-Results-ReScorer.py -l UncloggedWinRatioAndProfitRatioLoss`
+# from your favorite terminal / CLI
+
+# Loss assigned by Freqtrade to epochs with less trades than 'hyperopt_min_trades'
+MAX_LOSS = 100000
+
+# Loss function, its module & the MGM settings loaded by each worker process
+worker_data = {}
+
+
+class FileAndConsoleLogger(object):
+    def __init__(self, *files):
+        self.files = files
+
+    def write(self, obj):
+        for f in self.files:
+            f.write(obj)
+            f.flush()  # If you want the output to be visible immediately
+
+    def flush(self):
+        for f in self.files:
+            f.flush()
+
+
+def initialize_argument_parser():
+    parser = argparse.ArgumentParser(description='HyperOpt Results ReScorer for MoniGoMani')
+    parser.add_argument('-l', '--hyperopt-loss', dest='hyperopt_loss', type=str, required=True,
+                        help='Name of the HyperOpt Loss class to re-score the epochs with (Searched for inside '
+                             './user_data/hyperopts/)')
+    parser.add_argument('-f', '--fthypt-file', dest='fthypt_file', type=str, default=None,
+                        help='Optional (Defaults to the latest HyperOpt results when omitted): The .fthypt HyperOpt '
+                             'results file to re-score')
+    parser.add_argument('-ut', '--unclogger-tolerance', dest='unclogger_tolerance', type=lambda x: eval(x),
+                        default=None, help='Optional (Unused by default): Overrides the '
+                                           'unclogger_profit_ratio_loss_tolerance of the loss function. Can be decimal '
+                                           '(-0.01) or fraction -1/100, pass negative values as -ut=-1/100')
+    parser.add_argument('-mt', '--min-trades', dest='min_trades', type=int, default=1,
+                        help='Optional (Defaults to 1 when omitted): Epochs with less trades get assigned the max loss, '
+                             'like Freqtrade\'s --min-trades')
+    parser.add_argument('-j', '--job-workers', dest='job_workers', type=int, default=cpu_count(),
+                        help='Optional (Defaults to all CPU cores when omitted): Amount of parallel worker processes')
+    parser.add_argument('-n', '--top-n', dest='top_n', type=int, default=10,
+                        help='Optional (Defaults to 10 when omitted): Amount of best epochs to print')
+    parser.add_argument('-cf', '--create-file', dest='create_file', type=str,
+                        default='./user_data/HyperOpt-Results-ReScore-Report.log',
+                        help='Optional (Unused by default): Save the HyperOpt-Results-ReScore-Report as a .log file with '
+                             'a custom filename and file output location')
+    parser.add_argument('-nf', '--no-file', dest='output_to_file', const=False, default=True, nargs='?',
+                        help='Optional (Defaults to True when not omitted): Do not output the '
+                             'HyperOpt-Results-ReScore-Report as a .log file')
+    parser.add_argument('-csv', '--csv-file', dest='csv_file', type=str, default=None,
+                        help='Optional (Unused by default): Also save the full new ranking of all epochs as a .csv file')
+    return parser
+
+
+def get_latest_fthypt_file(hyperopt_results_directory):
+    last_result_path = os.path.join(hyperopt_results_directory, '.last_result.json')
+    if os.path.isfile(last_result_path) is False:
+        sys.exit(f'HyperOptResultsReScorer - ERROR - No HyperOpt results found at \'{last_result_path}\'... Please '
+                 f'provide the .fthypt file to re-score with -f')
+
+    with open(last_result_path, 'r') as file_object:
+        return os.path.join(hyperopt_results_directory, json.load(file_object)['latest_hyperopt'])
+
+
+def load_loss_function(hyperopts_directory, hyperopt_loss):
+    # Only import the files which define the class, like Freqtrade's HyperOptLossResolver would find it
+    for file_name in sorted(os.listdir(hyperopts_directory)):
+        file_path = os.path.join(hyperopts_directory, file_name)
+        if (file_name.endswith('.py') is False) or (f'class {hyperopt_loss}(' not in open(file_path).read()):
+            continue
+
+        spec = importlib.util.spec_from_file_location(file_name[:-3], file_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module, getattr(module, hyperopt_loss)
+
+    sys.exit(f'HyperOptResultsReScorer - ERROR - The HyperOpt Loss \'{hyperopt_loss}\' can\'t be found inside '
+             f'\'{hyperopts_directory}\'...')
+
+
+def initialize_worker(hyperopts_directory, hyperopt_loss, unclogger_tolerance, min_trades, config):
+    module, loss_class = load_loss_function(hyperopts_directory, hyperopt_loss)
+    if unclogger_tolerance is not None:
+        for loss_object in [module, loss_class]:
+            if hasattr(loss_object, 'unclogger_profit_ratio_loss_tolerance'):
+                setattr(loss_object, 'unclogger_profit_ratio_loss_tolerance', unclogger_tolerance)
+
+    worker_data['loss_function'] = loss_class.hyperopt_loss_function
+    worker_data['min_trades'] = min_trades
+    worker_data['config'] = config
+
+
+def rescore_epoch(numbered_line):
+    line_number, line = numbered_line
+    epoch = json.loads(line)
+    results_metrics = epoch['results_metrics']
+    trade_count = results_metrics['total_trades']
+
+    loss = MAX_LOSS
+    if trade_count >= worker_data['min_trades']:
+        results = pd.DataFrame(results_metrics['trades'])
+        for date_column in ['open_date', 'close_date']:
+            if date_column in results.columns:
+                results[date_column] = pd.to_datetime(results[date_column], utc=True)
+
+        loss = worker_data['loss_function'](
+            results=results, trade_count=trade_count,
+            min_date=datetime.fromtimestamp(results_metrics['backtest_start_ts'] / 1000, tz=timezone.utc),
+            max_date=datetime.fromtimestamp(results_metrics['backtest_end_ts'] / 1000, tz=timezone.utc),
+            config=worker_data['config'], processed={}, backtest_stats=results_metrics)
+
+    return {
+        'epoch': epoch.get('current_epoch', line_number + 1),
+        'loss': float(loss),
+        'original_loss': epoch['loss'],
+        'trades': trade_count,
+        'profit_total_pct': round(results_metrics['profit_total'] * 100, 2),
+        'profit_mean_pct': round(results_metrics.get('profit_mean', 0) * 100, 2)
+    }
+
+
+def stream_lines(fthypt_file):
+    # Only the raw lines get read here, the (heavy) json parsing happens inside the worker processes
+    with open(fthypt_file, 'r') as file_object:
+        for line_number, line in enumerate(file_object):
+            if line.strip() != '':
+                yield line_number, line
+
+
+def get_epoch_params(fthypt_file, epoch_numbers):
+    epoch_params = {}
+    for line_number, line in stream_lines(fthypt_file):
+        epoch = json.loads(line)
+        epoch_number = epoch.get('current_epoch', line_number + 1)
+        if epoch_number in epoch_numbers:
+            epoch_params[epoch_number] = epoch['params_dict']
+    return epoch_params
+
+
+def main():
+    parser = initialize_argument_parser()
+    args = parser.parse_args()
+
+    user_data_directory = os.path.join(os.getcwd(), 'user_data')
+    fthypt_file = args.fthypt_file or get_latest_fthypt_file(os.path.join(user_data_directory, 'hyperopt_results'))
+    if os.path.isfile(fthypt_file) is False:
+        sys.exit(f'HyperOptResultsReScorer - ERROR - The HyperOpt results file \'{fthypt_file}\' can\'t be found...')
+
+    # Loss functions get handed the MoniGoMani settings, just like during HyperOpt
+    config = {'user_data_dir': user_data_directory, 'mgm_run_id': os.path.basename(fthypt_file)}
+    mgm_config_path = os.path.join(user_data_directory, 'mgm-config.json')
+    if os.path.isfile(mgm_config_path) is True:
+        with open(mgm_config_path, 'r') as file_object:
+            config.update(json.load(file_object))
+
+    # Check the loss function exists before starting any worker
+    load_loss_function(os.path.join(user_data_directory, 'hyperopts'), args.hyperopt_loss)
+
+    # Stream the epochs through the worker pool in bounded batches (Pool.imap would read the whole file up front), so
+    # memory stays flat no matter the size of the results file
+    ranking = []
+    batch_size = args.job_workers * 64
+    with Pool(processes=args.job_workers, initializer=initialize_worker,
+              initargs=(os.path.join(user_data_directory, 'hyperopts'), args.hyperopt_loss, args.unclogger_tolerance,
+                        args.min_trades, config)) as pool:
+        lines = stream_lines(fthypt_file)
+        batch = list(islice(lines, batch_size))
+        while len(batch) > 0:
+            ranking.extend(pool.map(rescore_epoch, batch, chunksize=16))
+            batch = list(islice(lines, batch_size))
+
+    ranking.sort(key=lambda epoch: (epoch['loss'], epoch['epoch']))
+    top_epochs = ranking[:args.top_n]
+    epoch_params = get_epoch_params(fthypt_file, {epoch['epoch'] for epoch in top_epochs})
+
+    if args.csv_file is not None:
+        pd.DataFrame(ranking).to_csv(args.csv_file, index=False)
+
+    # To output our prints to a file redirect the stdout
+    original_stdout = sys.stdout
+    f = {}
+
+    if args.output_to_file:
+        f = open(args.create_file, 'w')
+        sys.stdout = FileAndConsoleLogger(sys.stdout, f)
+
+    print('====================================================================')
+    print(f'HyperOpt Results ReScore Report - {args.hyperopt_loss}')
+    print('====================================================================')
+    print(f'Re-scored {len(ranking)} epochs of: {fthypt_file}')
+    print('')
+    print(pd.DataFrame(top_epochs).to_string(index=False))
+    if len(top_epochs) > 0:
+        print('')
+        print(f'Best epoch ({top_epochs[0]["epoch"]}) params:')
+        print(json.dumps(epoch_params.get(top_epochs[0]['epoch'], {}), indent=4, sort_keys=True))
+
+    if args.output_to_file:
+        f.close()
+        sys.stdout = original_stdout
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# --- ↑↓ Do not remove these libs ↑↓ -----------------------------------------------------------------------------------
+import argparse
+import gc
+import importlib
+import inspect
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+# ---- ↑ Do not remove these libs ↑ ------------------------------------------------------------------------------------
+
+# MoniGoMani Benchmark
+# ====================
+# Times each stage of the MoniGoMani strategy pipeline separately upon deterministic synthetic OHLCV data, served by a
+# stub data provider, so it runs fully offline and every performance change to MoniGoMani can be quantified.
+#
+# Execute: `python ./user_data/mgm_tools/MGM-Benchmark.py` from the root of your MoniGoMani folder
+# (Next to 'user_data/', since the strategy loads its 'mgm-config.json' from there)
+
+# Settings which have to match before 2 benchmark runs can be compared
+comparable_settings = ['strategy', 'pairs', 'candles', 'zoom_timeframe', 'open_trades', 'seed']
+
+
+class BenchmarkDataProvider:
+    """
+    Stub of Freqtrade's DataProvider serving the synthetic candles
+    """
+
+    def __init__(self, informative_dataframes: dict, analyzed_dataframes: dict):
+        self.informative_dataframes = informative_dataframes
+        self.analyzed_dataframes = analyzed_dataframes
+
+    def get_pair_dataframe(self, pair: str, timeframe: str = None) -> pd.DataFrame:
+        return self.informative_dataframes[pair].copy()
+
+    def get_analyzed_dataframe(self, pair: str, timeframe: str) -> tuple:
+        dataframe = self.analyzed_dataframes[pair]
+        return dataframe, dataframe['date'].iloc[-1]
+
+    def current_whitelist(self) -> list:
+        return list(self.informative_dataframes.keys())
+
+
+class BenchmarkTrade:
+    """
+    Stub of Freqtrade's Trade, 'trades_open' holds all open trades like it does during BackTesting/HyperOpting
+    """
+    trades_open = []
+
+    def __init__(self, pair: str, open_date_utc: datetime):
+        self.pair = pair
+        self.open_date_utc = open_date_utc
+
+    def __repr__(self):
+        return f'Trade(pair={self.pair}, open_date={self.open_date_utc.strftime("%Y-%m-%d %H:%M:%S")})'
+
+
+def initialize_argument_parser():
+    parser = argparse.ArgumentParser(description='MoniGoMani Benchmark')
+    parser.add_argument('-st', '--strategy', dest='strategy', type=str, default='MoniGoManiHyperStrategy',
+                        help='Optional (Defaults to MoniGoManiHyperStrategy when omitted): Strategy to benchmark '
+                             '(Loaded from ./user_data/strategies/)')
+    parser.add_argument('-p', '--pairs', dest='pairs', type=int, default=4,
+                        help='Optional (Defaults to 4 when omitted): Amount of synthetic pairs')
+    parser.add_argument('-c', '--candles', dest='candles', type=int, default=2000,
+                        help='Optional (Defaults to 2000 when omitted): Amount of informative timeframe (1h) candles '
+                             'per pair')
+    parser.add_argument('-z', '--zoom-timeframe', dest='zoom_timeframe', type=str, default='5m',
+                        help='Optional (Defaults to 5m when omitted): Zoomed backtest_timeframe, use the informative '
+                             'timeframe (1h) to benchmark without TimeFrame-Zoom')
+    parser.add_argument('-ot', '--open-trades', dest='open_trades', type=int, default=10,
+                        help='Optional (Defaults to 10 when omitted): Amount of open trades custom_stoploss & '
+                             'custom_sell get called for')
+    parser.add_argument('-r', '--repeats', dest='repeats', type=int, default=5,
+                        help='Optional (Defaults to 5 when omitted): Amount of timed repeats per stage')
+    parser.add_argument('-w', '--warmup', dest='warmup', type=int, default=1,
+                        help='Optional (Defaults to 1 when omitted): Amount of untimed warmup runs per stage')
+    parser.add_argument('-s', '--seed', dest='seed', type=int, default=42,
+                        help='Optional (Defaults to 42 when omitted): Seed of the synthetic OHLCV data')
+    parser.add_argument('-o', '--output', dest='output', type=str, default=None,
+                        help='Optional (Unused by default): Save the benchmark results as a .json file')
+    parser.add_argument('-hf', '--history-file', dest='history_file', type=str,
+                        default='./user_data/mgm-benchmark-history.jsonl',
+                        help='Optional (Defaults to ./user_data/mgm-benchmark-history.jsonl when omitted): History file '
+                             'holding the results of previous benchmark runs')
+    parser.add_argument('-rh', '--record-history', dest='record_history', const=True, default=False, nargs='?',
+                        help='Optional (Defaults to False when omitted): Append the results to the history file, keyed '
+                             'by git commit & strategy version')
+    parser.add_argument('-cb', '--compare-baseline', dest='compare_baseline', type=str, default=None, const='latest',
+                        nargs='?', help='Optional (Unused by default): Compare the results against a baseline from the '
+                                        'history file, the git commit or strategy version (e.g. v0.12.0) to use as '
+                                        'baseline (Defaults to the latest run of another commit when no value is '
+                                        'provided). Exits with code 1 when a stage regressed')
+    parser.add_argument('-t', '--tolerance', dest='tolerance', type=float, default=0.1,
+                        help='Optional (Defaults to 0.1 when omitted): Relative increase of the median time or peak '
+                             'memory of a stage, compared to the baseline, which is still tolerated (0.1 = 10%%)')
+    return parser
+
+
+def timeframe_to_minutes(timeframe: str) -> int:
+    multipliers = {'m': 1, 'h': 60, 'd': 1440, 'w': 10080}
+    return int(timeframe[:-1]) * multipliers[timeframe[-1]]
+
+
+def generate_ohlcv(candles: int, timeframe: str, seed: int, start: str = '2021-01-01') -> pd.DataFrame:
+    """
+    Generates deterministic OHLCV candles following a geometric random walk
+    :param candles: Amount of candles
+    :param timeframe: Timeframe of the candles
+    :param seed: Seed, the same seed always generates the same candles
+    :param start: Date of the first candle
+    :return: DataFrame with date, open, high, low, close & volume columns
+    """
+
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002 * np.sqrt(timeframe_to_minutes(timeframe)), candles)))
+    open_ = np.r_[close[0], close[:-1]]
+    return pd.DataFrame({
+        'date': pd.date_range(start, periods=candles, freq=f'{timeframe_to_minutes(timeframe)}min', tz='UTC'),
+        'open': open_,
+        'high': np.maximum(open_, close) * (1 + rng.uniform(0, 0.002, candles)),
+        'low': np.minimum(open_, close) * (1 - rng.uniform(0, 0.002, candles)),
+        'close': close,
+        'volume': rng.uniform(1, 1000, candles)
+    })
+
+
+def resample_ohlcv(dataframe: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    resampled = dataframe.resample(f'{timeframe_to_minutes(timeframe)}min', on='date').agg(
+        {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'})
+    return resampled.reset_index()
+
+
+def time_stage(setup, function, repeats: int, warmup: int) -> dict:
+    """
+    Times a stage, only 'function' gets timed. 'setup' prepares fresh (copied) inputs for each run
+    :return: Dictionary containing the timing statistics (in milliseconds)
+    """
+    timings = []
+    for run in range(warmup + repeats):
+        arguments = setup()
+        gc.collect()
+        gc.disable()
+        try:
+            start_time = time.perf_counter()
+            function(arguments)
+            elapsed_time = (time.perf_counter() - start_time) * 1000
+        finally:
+            gc.enable()
+
+        if run >= warmup:
+            timings.append(elapsed_time)
+
+    # Peak memory is traced in a separate run, since tracing slows down the timed runs
+    arguments = setup()
+    tracemalloc.start()
+    try:
+        function(arguments)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'median_ms': statistics.median(timings),
+        'min_ms': min(timings),
+        'mean_ms': statistics.mean(timings),
+        'stdev_ms': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        'peak_memory_mb': peak_memory / 1024 ** 2,
+        'repeats': len(timings)
+    }
+
+
+def get_git_commit() -> str:
+    """
+    :return: Short hash of the current git commit (Suffixed with '-dirty' when there are uncommitted changes)
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                check=True).stdout.strip()
+        changes = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True,
+                                 text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+    return f'{commit}-dirty' if changes != '' else commit
+
+
+def get_strategy_version(strategy) -> str:
+    # The version is taken from the 'MoniGoMani vX.Y.Z by Rikj000' banner
+    match = re.search(r'MoniGoMani (v\d+\.\d+\.\d+)', inspect.getdoc(type(strategy)) or '')
+    return match.group(1) if match is not None else 'unknown'
+
+
+def load_benchmark_history(history_file: str) -> list:
+    if os.path.isfile(history_file) is False:
+        return []
+
+    with open(history_file, 'r') as file_object:
+        return [json.loads(line) for line in file_object if line.strip() != '']
+
+
+def find_baseline(history: list, record: dict, baseline: str) -> dict:
+    """
+    Finds the latest comparable run in the benchmark history
+    :param history: All previous benchmark runs
+    :param record: The current benchmark run
+    :param baseline: Git commit or strategy version of the baseline, 'latest' for the latest run of another commit
+    :return: The baseline run, or None when no comparable run is found
+    """
+    for previous_record in reversed(history):
+        if any(previous_record['settings'].get(setting) != record['settings'][setting]
+               for setting in comparable_settings):
+            continue
+
+        if baseline == 'latest':
+            if previous_record['commit'] != record['commit']:
+                return previous_record
+        elif previous_record['commit'].startswith(baseline) or (previous_record['strategy_version'] == baseline):
+            return previous_record
+
+    return None
+
+
+def compare_to_baseline(record: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Prints the change of each stage compared to the baseline
+    :return: List of the stages which regressed beyond the tolerance
+    """
+    print('')
+    print(f'Compared to baseline {baseline["commit"]} ({baseline["strategy_version"]}, {baseline["timestamp"]}) with a '
+          f'tolerance of {round(tolerance * 100, 2)}%:')
+    print('{:<30s}{:>12s}{:>12s}{:>12s}{:>12s}  {:s}'.format(
+        'Stage', 'base ms', 'median ms', 'time %', 'memory %', 'result'))
+
+    regressed_stages = []
+    for stage, results in record['stages'].items():
+        if stage not in baseline['stages']:
+            continue
+
+        baseline_results = baseline['stages'][stage]
+        time_change = results['median_ms'] / baseline_results['median_ms'] - 1 \
+            if baseline_results['median_ms'] > 0 else 0.0
+        memory_change = results['peak_memory_mb'] / baseline_results['peak_memory_mb'] - 1 \
+            if baseline_results.get('peak_memory_mb', 0) > 0 else 0.0
+        regressed = (time_change > tolerance) or (memory_change > tolerance)
+        if regressed:
+            regressed_stages.append(stage)
+
+        print('{:<30s}{:>12.2f}{:>12.2f}{:>+12.1f}{:>+12.1f}  {:s}'.format(
+            stage, baseline_results['median_ms'], results['median_ms'], time_change * 100, memory_change * 100,
+            'REGRESSED' if regressed else 'ok'))
+
+    return regressed_stages
+
+
+def load_strategy(strategy_name: str, zoom_timeframe: str):
+    sys.path.insert(0, os.getcwd())
+    strategy_class = getattr(importlib.import_module(f'user_data.strategies.{strategy_name}'), strategy_name)
+    strategy_class.backtest_timeframe = zoom_timeframe
+    return strategy_class({'runmode': 'backtest'})
+
+
+def main():
+    parser = initialize_argument_parser()
+    args = parser.parse_args()
+
+    if os.path.isfile(os.path.join(os.getcwd(), 'user_data', 'mgm-config.json')) is False:
+        sys.exit('MGMBenchmark - ERROR - No \'./user_data/mgm-config.json\' found, please run the benchmark from the '
+                 'root of your MoniGoMani folder')
+
+    strategy = load_strategy(args.strategy, args.zoom_timeframe)
+    informative_timeframe = strategy.informative_timeframe
+    is_zoomed = strategy.timeframe != informative_timeframe
+    zoom_candles = args.candles * strategy.timeframe_multiplier
+
+    # Generate the zoomed candles first, so the informative candles are their exact resample
+    pairs = [f'BENCH{pair_index}/USDT' for pair_index in range(args.pairs)]
+    zoomed_dataframes = {pair: generate_ohlcv(zoom_candles, strategy.timeframe, args.seed + pair_index)
+                         for pair_index, pair in enumerate(pairs)}
+    informative_dataframes = {pair: resample_ohlcv(dataframe, informative_timeframe) if is_zoomed else dataframe
+                              for pair, dataframe in zoomed_dataframes.items()}
+    strategy.dp = BenchmarkDataProvider(informative_dataframes, {})
+
+    # Untimed reference run, providing the inputs of the later stages
+    core_trend_dataframes = {pair: strategy._populate_core_trend(dataframe.copy(), {'pair': pair})
+                             for pair, dataframe in informative_dataframes.items()}
+    indicator_dataframes = {pair: strategy.do_populate_indicators(dataframe.copy(), {'pair': pair})
+                            for pair, dataframe in core_trend_dataframes.items()}
+    analyzed_dataframes = {pair: strategy.populate_indicators(dataframe.copy(), {'pair': pair})
+                           for pair, dataframe in zoomed_dataframes.items()}
+    strategy.dp.analyzed_dataframes = analyzed_dataframes
+
+    # Open trades (spread over all pairs) opened at the start, so the unclogger runs through all of its checks
+    current_time = analyzed_dataframes[pairs[0]]['date'].iloc[-1].to_pydatetime()
+    BenchmarkTrade.trades_open = [BenchmarkTrade(pairs[trade_index % len(pairs)] if trade_index < len(pairs) else
+                                                 f'BENCH{trade_index}/USDT', current_time - timedelta(days=2))
+                                  for trade_index in range(args.open_trades)]
+    for trade in BenchmarkTrade.trades_open:
+        if trade.pair not in analyzed_dataframes:
+            analyzed_dataframes[trade.pair] = analyzed_dataframes[pairs[0]]
+
+    def run_custom_stoploss(_):
+        for trade in BenchmarkTrade.trades_open:
+            strategy.custom_stoploss(trade.pair, trade, current_time, 1.0, -0.05)
+
+    def run_custom_sell(_):
+        for trade in BenchmarkTrade.trades_open:
+            strategy.custom_sell(trade.pair, trade, current_time, 1.0, -0.05)
+
+    def reset_custom_info():
+        strategy.custom_info['open_trades'] = {}
+
+    stages = {
+        '_populate_core_trend': (
+            lambda: {pair: dataframe.copy() for pair, dataframe in informative_dataframes.items()},
+            lambda inputs: [strategy._populate_core_trend(dataframe, {'pair': pair})
+                            for pair, dataframe in inputs.items()]),
+        'do_populate_indicators': (
+            lambda: {pair: dataframe.copy() for pair, dataframe in core_trend_dataframes.items()},
+            lambda inputs: [strategy.do_populate_indicators(dataframe, {'pair': pair})
+                            for pair, dataframe in inputs.items()]),
+        'zoom merge': (
+            lambda: {pair: (zoomed_dataframes[pair].copy(), indicator_dataframes[pair].copy()) for pair in pairs},
+            lambda inputs: [strategy._merge_informative_dataframe(dataframe, informative)
+                            for dataframe, informative in inputs.values()]),
+        'populate_indicators (total)': (
+            lambda: {pair: dataframe.copy() for pair, dataframe in zoomed_dataframes.items()},
+            lambda inputs: [strategy.populate_indicators(dataframe, {'pair': pair})
+                            for pair, dataframe in inputs.items()]),
+        '_populate_trend buy': (
+            lambda: {pair: analyzed_dataframes[pair].copy() for pair in pairs},
+            lambda inputs: [strategy._populate_trend('buy', dataframe, {'pair': pair})
+                            for pair, dataframe in inputs.items()]),
+        '_populate_trend sell': (
+            lambda: {pair: analyzed_dataframes[pair].copy() for pair in pairs},
+            lambda inputs: [strategy._populate_trend('sell', dataframe, {'pair': pair})
+                            for pair, dataframe in inputs.items()]),
+        'custom_stoploss': (reset_custom_info, run_custom_stoploss),
+        # custom_info is filled by the custom_stoploss calls, like when BackTesting
+        'custom_sell': (lambda: run_custom_stoploss(None), run_custom_sell)
+    }
+    if is_zoomed is False:
+        stages.pop('zoom merge')
+
+    print(f'MoniGoMani Benchmark - {args.strategy} - {args.pairs} pairs x {args.candles} {informative_timeframe} '
+          f'candles ({zoom_candles} {strategy.timeframe} candles) - {args.open_trades} open trades - '
+          f'{args.repeats} repeats')
+    print('{:<30s}{:>12s}{:>12s}{:>12s}{:>12s}{:>12s}'.format(
+        'Stage', 'median ms', 'min ms', 'mean ms', 'stdev ms', 'peak MB'))
+    results = {}
+    for stage, (setup, function) in stages.items():
+        results[stage] = time_stage(setup, function, args.repeats, args.warmup)
+        print('{:<30s}{:>12.2f}{:>12.2f}{:>12.2f}{:>12.2f}{:>12.2f}'.format(
+            stage, results[stage]['median_ms'], results[stage]['min_ms'], results[stage]['mean_ms'],
+            results[stage]['stdev_ms'], results[stage]['peak_memory_mb']))
+
+    record = {
+        'timestamp': datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S'),
+        'commit': get_git_commit(),
+        'strategy_version': get_strategy_version(strategy),
+        'settings': {setting: value for setting, value in vars(args).items() if setting in comparable_settings +
+                     ['repeats', 'warmup']},
+        'environment': {'python': platform.python_version(), 'numpy': np.__version__,
+                        'pandas': pd.__version__, 'machine': platform.machine(),
+                        'processor': platform.processor()},
+        'stages': results
+    }
+
+    if args.output is not None:
+        with open(args.output, 'w') as file_object:
+            json.dump(record, file_object, indent=4)
+
+    regressed_stages = []
+    if args.compare_baseline is not None:
+        baseline = find_baseline(load_benchmark_history(args.history_file), record, args.compare_baseline)
+        if baseline is None:
+            print(f'MGMBenchmark - WARNING - No comparable baseline found for \'{args.compare_baseline}\' inside '
+                  f'\'{args.history_file}\' (Runs are only compared when using the same {comparable_settings})')
+        else:
+            regressed_stages = compare_to_baseline(record, baseline, args.tolerance)
+
+    # Each run is appended as 1 line, so the history file never has to be rewritten
+    if args.record_history:
+        with open(args.history_file, 'a') as file_object:
+            file_object.write(json.dumps(record) + '\n')
+        print(f'Recorded the results of {record["commit"]} ({record["strategy_version"]}) in \'{args.history_file}\'')
+
+    if len(regressed_stages) > 0:
+        sys.exit(f'MGMBenchmark - ERROR - {len(regressed_stages)} stages regressed beyond the tolerance: '
+                 f'{", ".join(regressed_stages)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# --- ↑↓ Do not remove these libs ↑↓ -----------------------------------------------------------------------------------
+import argparse
+import importlib
+import os
+import sys
+
+import pandas as pd
+# ---- ↑ Do not remove these libs ↑ ------------------------------------------------------------------------------------
+
+# Memory Report for MoniGoMani
+# ============================
+# Reports the bytes used by each column of saved analyzed dataframes (per column, per pair & in total), flags the
+# object-dtype columns and estimates the savings under the MGM dtype policy. Use the projection to size the RAM needed
+# for large whitelists.
+#
+# Save an analyzed dataframe with `dataframe.to_pickle('BTC_USDT.pkl')` (.feather & .parquet files work too)
+# Execute: `python ./user_data/mgm_tools/MGM-Memory-Report.py -f BTC_USDT.pkl -pp 120`
+# from your favorite terminal / CLI, from the root of your MoniGoMani folder
+
+
+def initialize_argument_parser():
+    parser = argparse.ArgumentParser(description='Memory Report for MoniGoMani')
+    parser.add_argument('-f', '--dataframe-files', dest='dataframe_files', type=str, nargs='+', required=True,
+                        help='Saved analyzed dataframes to report on (.pkl, .feather or .parquet), the file name is '
+                             'used as the pair name')
+    parser.add_argument('-s', '--strategy', dest='strategy', type=str, default='MoniGoManiHyperStrategy',
+                        help='Optional (Defaults to MoniGoManiHyperStrategy when omitted): Strategy providing the '
+                             'dtype policy used to estimate the savings')
+    parser.add_argument('-pp', '--projected-pairs', dest='projected_pairs', type=int, default=None,
+                        help='Optional (Unused by default): Projects the memory needed for a whitelist of this many '
+                             'pairs, based on the average pair reported')
+    parser.add_argument('-n', '--top-n', dest='top_n', type=int, default=20,
+                        help='Optional (Defaults to 20 when omitted): Amount of largest columns to print per pair')
+    parser.add_argument('-csv', '--csv-file', dest='csv_file', type=str, default=None,
+                        help='Optional (Unused by default): Also save the full per column report of all pairs as a '
+                             '.csv file')
+    return parser
+
+
+def load_dataframe(dataframe_file):
+    if os.path.isfile(dataframe_file) is False:
+        sys.exit(f'MGMMemoryReport - ERROR - The dataframe file \'{dataframe_file}\' can\'t be found...')
+
+    if dataframe_file.endswith('.feather'):
+        return pd.read_feather(dataframe_file)
+    elif dataframe_file.endswith('.parquet'):
+        return pd.read_parquet(dataframe_file)
+    elif dataframe_file.endswith(('.pkl', '.pickle')):
+        return pd.read_pickle(dataframe_file)
+    sys.exit(f'MGMMemoryReport - ERROR - Unsupported dataframe file \'{dataframe_file}\', please use a .pkl, .feather '
+             f'or .parquet file (.csv & .json files don\'t keep the column dtypes)')
+
+
+def format_megabytes(size_bytes):
+    return f'{size_bytes / 1024 ** 2:.2f} MB'
+
+
+def main():
+    parser = initialize_argument_parser()
+    args = parser.parse_args()
+
+    # Only the class is needed (for its dtype policy), so the strategy doesn't get initialized
+    sys.path.insert(0, os.getcwd())
+    strategy_class = getattr(importlib.import_module(f'user_data.strategies.{args.strategy}'), args.strategy)
+
+    memory_reports = {}
+    for dataframe_file in args.dataframe_files:
+        pair = os.path.splitext(os.path.basename(dataframe_file))[0]
+        memory_reports[pair] = strategy_class.get_memory_report(load_dataframe(dataframe_file))
+
+    print('====================================================================')
+    print('MoniGoMani Memory Report')
+    print('====================================================================')
+    for pair, memory_report in memory_reports.items():
+        print(f'{pair}: {format_megabytes(memory_report["bytes"].sum())} in {len(memory_report)} columns, the dtype '
+              f'policy could save {format_megabytes(memory_report["savings"].sum())}')
+        object_columns = memory_report.loc[memory_report['is_object'], 'column'].tolist()
+        if len(object_columns) > 0:
+            print(f'Object-dtype columns: {", ".join(object_columns)}')
+        print(memory_report.head(args.top_n).to_string(index=False))
+        print('')
+
+    all_reports = pd.concat([memory_report.assign(pair=pair) for pair, memory_report in memory_reports.items()],
+                            ignore_index=True)
+    print('Total per column kind:')
+    print(all_reports.groupby('kind')[['bytes', 'suggested_bytes', 'savings']].sum()
+          .sort_values('bytes', ascending=False).to_string())
+    print('')
+
+    total_bytes = all_reports['bytes'].sum()
+    suggested_bytes = all_reports['suggested_bytes'].sum()
+    print(f'Total over {len(memory_reports)} pairs: {format_megabytes(total_bytes)} '
+          f'({format_megabytes(suggested_bytes)} under the dtype policy)')
+    if args.projected_pairs is not None:
+        print(f'Projected for {args.projected_pairs} pairs: '
+              f'{format_megabytes(total_bytes / len(memory_reports) * args.projected_pairs)} '
+              f'({format_megabytes(suggested_bytes / len(memory_reports) * args.projected_pairs)} under the dtype '
+              f'policy)')
+
+    if args.csv_file is not None:
+        all_reports.to_csv(args.csv_file, index=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# --- ↑↓ Do not remove these libs ↑↓ -----------------------------------------------------------------------------------
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from multiprocessing import Pool, cpu_count
+
+import numpy as np
+import pandas as pd
+# ---- ↑ Do not remove these libs ↑ ------------------------------------------------------------------------------------
+
+# Parallel BackTester for MoniGoMani
+# ==================================
+# Splits the BackTest '--timerange' into shards, BackTests all shards in parallel (with the same 'mgm-config*.json'
+# files) & stitches their trades back together into 1 report.
+#
+# Freqtrade already loads 'startup_candle_count' candles before the start of each shard, so the signals of each shard
+# are identical to the ones of a single BackTest. Open trades are what differs at the shard edges: Each shard (except
+# the first) also BackTests 'warmup_days' before its start, so trades still open at the end of the previous shard get
+# opened in the next shard too. Trades force sold at a shard edge get replaced by the same trade (same pair & open
+# date) from the next shard, which ran until its real sell. Edge trades without a match can't be reconciled, their
+# absolute profit is reported as the error bound of the stitched results.
+#
+# Execute: `python ./user_data/mgm_tools/MGM-Parallel-Backtest.py -tr 20210101-20211231`
+# from your favorite terminal / CLI, from the root of your MoniGoMani folder
+
+# Sell reason Freqtrade gives trades still open at the end of a BackTest
+FORCE_SELL = 'force_sell'
+
+
+def initialize_argument_parser():
+    parser = argparse.ArgumentParser(description='Parallel BackTester for MoniGoMani')
+    parser.add_argument('-tr', '--timerange', dest='timerange', type=str, required=True,
+                        help='Timerange to BackTest, with a start & end date (e.g. 20210101-20211231)')
+    parser.add_argument('-sh', '--shards', dest='shards', type=int, default=cpu_count(),
+                        help='Optional (Defaults to the amount of CPU cores when omitted): Amount of timerange shards')
+    parser.add_argument('-wd', '--warmup-days', dest='warmup_days', type=int, default=7,
+                        help='Optional (Defaults to 7 when omitted): Days each shard overlaps with the previous one, '
+                             'should be longer than most trades last')
+    parser.add_argument('-j', '--job-workers', dest='job_workers', type=int, default=None,
+                        help='Optional (Defaults to the amount of shards when omitted): Amount of parallel BackTests')
+    parser.add_argument('-s', '--strategy', dest='strategy', type=str, default='MoniGoManiHyperStrategy',
+                        help='Optional (Defaults to MoniGoManiHyperStrategy when omitted): Strategy to BackTest')
+    parser.add_argument('-c', '--config', dest='config', type=str, nargs='+',
+                        default=['./user_data/mgm-config.json', './user_data/mgm-config-private.json'],
+                        help='Optional (Defaults to ./user_data/mgm-config.json ./user_data/mgm-config-private.json '
+                             'when omitted): Configuration files passed to Freqtrade')
+    parser.add_argument('-ep', '--enable-protections', dest='enable_protections', action='store_true',
+                        help='Optional (Defaults to False when omitted): BackTest with --enable-protections')
+    parser.add_argument('-o', '--output-directory', dest='output_directory', type=str,
+                        default='./user_data/backtest_results/parallel',
+                        help='Optional (Defaults to ./user_data/backtest_results/parallel when omitted): Directory '
+                             'holding the results of each shard & the stitched results')
+    parser.add_argument('-fc', '--freqtrade-command', dest='freqtrade_command', type=str, default='freqtrade',
+                        help='Optional (Defaults to freqtrade when omitted): Command used to run Freqtrade')
+    return parser
+
+
+def parse_timerange(timerange):
+    try:
+        start, end = [datetime.strptime(date, '%Y%m%d').replace(tzinfo=timezone.utc) for date in timerange.split('-')]
+    except ValueError:
+        sys.exit(f'MGMParallelBacktest - ERROR - Invalid timerange \'{timerange}\', please provide both a start & end '
+                 f'date like 20210101-20211231')
+    if start >= end:
+        sys.exit(f'MGMParallelBacktest - ERROR - The start of timerange \'{timerange}\' must be before its end')
+    return start, end
+
+
+def get_shards(start, end, shard_count, warmup_days):
+    # Shards are split on whole days, each one (except the first) starts 'warmup_days' early
+    total_days = (end - start).days
+    shard_count = max(min(shard_count, total_days), 1)
+    edges = [start + timedelta(days=round(total_days * shard_index / shard_count))
+             for shard_index in range(shard_count + 1)]
+
+    return [{'shard': shard_index, 'start': edges[shard_index], 'end': edges[shard_index + 1],
+             'backtest_start': max(edges[shard_index] - timedelta(days=warmup_days), start)}
+            for shard_index in range(shard_count)]
+
+
+def backtest_shard(shard_job):
+    shard, args = shard_job
+    export_directory = os.path.abspath(os.path.join(args.output_directory, f'shard-{shard["shard"]}'))
+    os.makedirs(export_directory, exist_ok=True)
+
+    command = [*args.freqtrade_command.split(), 'backtesting', '-s', args.strategy,
+               '--timerange', f'{shard["backtest_start"]:%Y%m%d}-{shard["end"]:%Y%m%d}',
+               '--export', 'trades', '--export-filename', export_directory]
+    for config_file in args.config:
+        command.extend(['-c', config_file])
+    if args.enable_protections is True:
+        command.append('--enable-protections')
+
+    start_time = time.perf_counter()
+    backtest = subprocess.run(command, capture_output=True, text=True)
+    duration = time.perf_counter() - start_time
+    with open(os.path.join(export_directory, 'backtest.log'), 'w') as file_object:
+        file_object.write(backtest.stdout + backtest.stderr)
+    if backtest.returncode != 0:
+        return {**shard, 'error': f'Freqtrade exited with code {backtest.returncode}, see '
+                                  f'{os.path.join(export_directory, "backtest.log")}'}
+
+    # Each shard exports to its own directory, so their '.last_result.json' files can't get mixed up
+    with open(os.path.join(export_directory, '.last_result.json'), 'r') as file_object:
+        result_file = os.path.join(export_directory, json.load(file_object)['latest_backtest'])
+    with open(result_file, 'r') as file_object:
+        strategy_results = json.load(file_object)['strategy'][args.strategy]
+
+    return {**shard, 'trades': strategy_results['trades'], 'duration': duration,
+            'starting_balance': strategy_results.get('starting_balance')}
+
+
+def stitch_trades(shard_results):
+    """
+    Keeps the trades opened inside each shard (not the ones opened in its warmup) & reconciles the trades force sold at
+    a shard edge with the same trade from the following shards
+    :return: Tuple of the stitched trades, the amount of reconciled edge trades & the unreconciled edge trades
+    """
+
+    trades_by_key = [{(trade['pair'], trade['open_date']): trade for trade in shard_result['trades']}
+                     for shard_result in shard_results]
+    stitched_trades = []
+    reconciled_count = 0
+    unreconciled_trades = []
+    for shard_index, shard_result in enumerate(shard_results):
+        for trade in shard_result['trades']:
+            open_date = pd.Timestamp(trade['open_date'])
+            if not (shard_result['start'] <= open_date < shard_result['end']):
+                continue
+
+            # Follow the trade through the next shards until it got sold for real (or the data ran out)
+            next_shard_index = shard_index + 1
+            while (trade['sell_reason'] == FORCE_SELL) and (next_shard_index < len(shard_results)):
+                next_trade = trades_by_key[next_shard_index].get((trade['pair'], trade['open_date']))
+                if next_trade is None:
+                    unreconciled_trades.append(trade)
+                    break
+                trade = next_trade
+                reconciled_count += 1
+                next_shard_index += 1
+
+            stitched_trades.append(trade)
+
+    return stitched_trades, reconciled_count, unreconciled_trades
+
+
+def get_summary(trades, starting_balance):
+    if len(trades) == 0:
+        return pd.DataFrame(), {'Total trades': 0}
+
+    trades = pd.DataFrame(trades)
+    trades['close_date'] = pd.to_datetime(trades['close_date'], utc=True)
+    profit_ratios = trades['profit_ratio'].to_numpy(dtype=float)
+    cumulative_profit = np.cumsum(trades.sort_values('close_date', kind='stable')['profit_abs'].to_numpy(dtype=float))
+
+    per_pair = trades.groupby('pair').agg(trades=('pair', 'size'), avg_profit_pct=('profit_ratio', 'mean'),
+                                          total_profit_abs=('profit_abs', 'sum'),
+                                          wins=('profit_ratio', lambda profit: int((profit > 0).sum())))
+    per_pair['avg_profit_pct'] = (per_pair['avg_profit_pct'] * 100).round(2)
+    per_pair = per_pair.sort_values('total_profit_abs', ascending=False)
+
+    summary = {
+        'Total trades': len(trades),
+        'Win / Draw / Loss': f'{np.count_nonzero(profit_ratios > 0)} / {np.count_nonzero(profit_ratios == 0)} / '
+                             f'{np.count_nonzero(profit_ratios < 0)}',
+        'Avg profit %': round(float(profit_ratios.mean()) * 100, 2),
+        'Total profit abs': round(float(cumulative_profit[-1]), 8),
+        'Total profit %': round(float(cumulative_profit[-1]) / starting_balance * 100, 2)
+        if starting_balance else None,
+        'Max drawdown abs': round(float(max(np.max(np.maximum.accumulate(cumulative_profit) - cumulative_profit), 0)),
+                                  8),
+        'Sell reasons': trades['sell_reason'].value_counts().to_dict()
+    }
+    return per_pair, summary
+
+
+def main():
+    parser = initialize_argument_parser()
+    args = parser.parse_args()
+
+    start, end = parse_timerange(args.timerange)
+    shards = get_shards(start, end, args.shards, args.warmup_days)
+    os.makedirs(args.output_directory, exist_ok=True)
+
+    start_time = time.perf_counter()
+    with Pool(processes=args.job_workers or len(shards)) as pool:
+        shard_results = pool.map(backtest_shard, [(shard, args) for shard in shards], chunksize=1)
+    wall_time = time.perf_counter() - start_time
+
+    failed_shards = [shard_result for shard_result in shard_results if 'error' in shard_result]
+    if len(failed_shards) > 0:
+        sys.exit('MGMParallelBacktest - ERROR - ' + ', '.join(f'Shard {shard_result["shard"]}: {shard_result["error"]}'
+                                                               for shard_result in failed_shards))
+
+    stitched_trades, reconciled_count, unreconciled_trades = stitch_trades(shard_results)
+    starting_balance = shard_results[0]['starting_balance']
+    per_pair, summary = get_summary(stitched_trades, starting_balance)
+    error_bound = float(sum(abs(trade['profit_abs']) for trade in unreconciled_trades))
+
+    print('====================================================================')
+    print(f'MoniGoMani Parallel BackTest - {args.strategy} - {args.timerange}')
+    print('====================================================================')
+    for shard_result in shard_results:
+        print(f'Shard {shard_result["shard"]}: {shard_result["start"]:%Y-%m-%d} - {shard_result["end"]:%Y-%m-%d} '
+              f'(Warmup from {shard_result["backtest_start"]:%Y-%m-%d}) - {len(shard_result["trades"])} trades in '
+              f'{shard_result["duration"]:.1f}s')
+    print(f'Wall time: {wall_time:.1f}s (Sequential shard time: '
+          f'{sum(shard_result["duration"] for shard_result in shard_results):.1f}s)')
+    print('')
+    if len(per_pair) > 0:
+        print(per_pair.to_string())
+        print('')
+    for metric, value in summary.items():
+        print(f'{metric}: {value}')
+    print('')
+    print(f'Edge trades reconciled with the next shard: {reconciled_count}')
+    print(f'Edge trades which could not be reconciled: {len(unreconciled_trades)} (Raise --warmup-days to reconcile '
+          f'them)' if len(unreconciled_trades) > 0 else 'Edge trades which could not be reconciled: 0')
+    print(f'Error bound of the total profit: ±{error_bound:.8f}' +
+          (f' (±{error_bound / starting_balance * 100:.2f}%)' if starting_balance else ''))
+
+    stitched_results_path = os.path.join(args.output_directory, 'stitched-results.json')
+    with open(stitched_results_path, 'w') as file_object:
+        json.dump({'timerange': args.timerange, 'summary': summary, 'error_bound_abs': error_bound,
+                   'unreconciled_edge_trades': len(unreconciled_trades), 'trades': stitched_trades},
+                  file_object, indent=4, default=str)
+    print(f'Stitched trades & summary saved to: {stitched_results_path}')
+
+
+if __name__ == '__main__':
+    main()
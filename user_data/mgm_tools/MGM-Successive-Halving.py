@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# --- ↑↓ Do not remove these libs ↑↓ -----------------------------------------------------------------------------------
+import argparse
+import hashlib
+import importlib.util
+import inspect
+import json
+import math
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+# ---- ↑ Do not remove these libs ↑ ------------------------------------------------------------------------------------
+
+# Successive Halving Optimizer for MoniGoMani
+# ===========================================
+# Most parameter candidates are obviously bad after a few weeks of data already. This optimizer samples many candidates
+# from the MGM search spaces (The weighted signal, total signal needed & lookback window spaces set up by '_init_vars',
+# including the refined spaces & overrides of a 2nd HyperOpt Run), scores all of them upon a short slice of the
+# timerange & only promotes the best 1/eta of them to the next, eta times longer, slice until the full timerange.
+#
+# Candidates are scored in batches with 'populate_trend_batch' & 'simulate_trades' (No wallet, max_open_trades,
+# protections or unclogger), using the same HyperOpt Loss functions as HyperOpt. Send the best candidates to a real
+# BackTest before using them!
+#
+# Scores are memoized in a results cache, keyed on the effective parameter vector of each candidate (See
+# 'get_effective_parameter_keys'), so candidates generating identical signals to an already scored one (in this or any
+# previous session upon the same data, strategy code & loss) are never scored twice.
+#
+# Execute: `python ./user_data/mgm_tools/MGM-Successive-Halving.py -tr 20210101-20210701 -l MGMUncloggedWinRatioLoss`
+# from your favorite terminal / CLI, from the root of your MoniGoMani folder
+
+# Loss assigned to candidates with less trades than '--min-trades'
+MAX_LOSS = 100000
+
+
+def initialize_argument_parser():
+    parser = argparse.ArgumentParser(description='Successive Halving Optimizer for MoniGoMani')
+    parser.add_argument('-tr', '--timerange', dest='timerange', type=str, required=True,
+                        help='Full timerange to optimize upon, with a start & end date (e.g. 20210101-20210701)')
+    parser.add_argument('-l', '--hyperopt-loss', dest='hyperopt_loss', type=str, required=True,
+                        help='Name of the HyperOpt Loss class to score the candidates with (Searched for inside '
+                             './user_data/hyperopts/)')
+    parser.add_argument('-n', '--candidates', dest='candidates', type=int, default=729,
+                        help='Optional (Defaults to 729 when omitted): Amount of candidates sampled for the 1st slice')
+    parser.add_argument('-eta', '--eta', dest='eta', type=int, default=3,
+                        help='Optional (Defaults to 3 when omitted): Only the best 1/eta candidates get promoted to the '
+                             'next slice, which is eta times longer')
+    parser.add_argument('-md', '--min-days', dest='min_days', type=int, default=2,
+                        help='Optional (Defaults to 2 when omitted): Minimal amount of days in the 1st slice')
+    parser.add_argument('-mt', '--min-trades', dest='min_trades', type=int, default=1,
+                        help='Optional (Defaults to 1 when omitted): Candidates with less trades get assigned the max '
+                             'loss, like Freqtrade\'s --min-trades')
+    parser.add_argument('-s', '--strategy', dest='strategy', type=str, default='MoniGoManiHyperStrategy',
+                        help='Optional (Defaults to MoniGoManiHyperStrategy when omitted): Strategy to optimize')
+    parser.add_argument('-c', '--config', dest='config', type=str, nargs='+',
+                        default=['./user_data/mgm-config.json', './user_data/mgm-config-private.json'],
+                        help='Optional (Defaults to ./user_data/mgm-config.json ./user_data/mgm-config-private.json '
+                             'when omitted): Configuration files, used to find the pairs & downloaded data')
+    parser.add_argument('-sd', '--seed', dest='seed', type=int, default=42,
+                        help='Optional (Defaults to 42 when omitted): Seed used to sample the candidates')
+    parser.add_argument('-t', '--top', dest='top', type=int, default=5,
+                        help='Optional (Defaults to 5 when omitted): Amount of best candidates to print')
+    parser.add_argument('-rc', '--results-cache', dest='results_cache', type=str,
+                        default='./user_data/hyperopt_results/mgm-results-cache.sqlite',
+                        help='Optional (Defaults to ./user_data/hyperopt_results/mgm-results-cache.sqlite when '
+                             'omitted): SQLite database memoizing the scores of all candidates across sessions')
+    parser.add_argument('-nrc', '--no-results-cache', dest='use_results_cache', action='store_false',
+                        help='Optional (Defaults to False when omitted): Score every candidate, without reading or '
+                             'writing the results cache')
+    parser.add_argument('-o', '--output', dest='output', type=str,
+                        default='./user_data/mgm-successive-halving-results.json',
+                        help='Optional (Defaults to ./user_data/mgm-successive-halving-results.json when omitted): '
+                             'File to save the best candidates to, their "params" use the mgm-config-hyperopt.json '
+                             'format')
+    return parser
+
+
+def load_rescorer_tool():
+    # Re-use the HyperOpt Loss loading of the HyperOpt Results ReScorer
+    tool_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'HyperOpt-Results-ReScorer.py')
+    spec = importlib.util.spec_from_file_location('hyperopt_results_rescorer', tool_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class CandleDataProvider:
+    """
+    Minimal stand-in for Freqtrade's DataProvider, serving the informative candles for TimeFrame-Zoom
+    """
+
+    def __init__(self, informative_dataframes: dict):
+        self.informative_dataframes = informative_dataframes
+
+    def get_pair_dataframe(self, pair: str, timeframe: str = None) -> pd.DataFrame:
+        return self.informative_dataframes[pair].copy()
+
+    def current_whitelist(self) -> list:
+        return list(self.informative_dataframes.keys())
+
+
+def load_strategy(config, strategy_name):
+    """
+    Loads the strategy through Freqtrade's StrategyResolver, so it gets initialized with the configuration files just
+    like during a BackTest (stake currency, order types, sell settings, ...)
+    :param config: Configuration loaded from the configuration files
+    :param strategy_name: Name of the strategy class to load
+    :return: The loaded strategy
+    """
+
+    from freqtrade.enums import RunMode
+    from freqtrade.resolvers import StrategyResolver
+
+    sys.path.insert(0, os.getcwd())
+    return StrategyResolver.load_strategy({
+        **config, 'strategy': strategy_name, 'runmode': RunMode.BACKTEST,
+        'user_data_dir': Path(config.get('user_data_dir', os.path.join(os.getcwd(), 'user_data')))})
+
+
+def load_candles(config, strategy, timerange):
+    """
+    Loads the downloaded (zoomed) candles of all whitelisted pairs, including the startup candles
+    :return: Tuple of the candles & the informative candles per pair
+    """
+
+    from freqtrade.configuration import TimeRange
+    from freqtrade.data.history import load_pair_history
+
+    candles = {}
+    informative_candles = {}
+    for pair in config['exchange']['pair_whitelist']:
+        candles[pair] = load_pair_history(pair=pair, timeframe=strategy.timeframe, datadir=Path(config['datadir']),
+                                          timerange=TimeRange.parse_timerange(timerange),
+                                          startup_candles=strategy.startup_candle_count,
+                                          data_format=config.get('dataformat_ohlcv', 'json'))
+        if strategy.informative_timeframe != strategy.timeframe:
+            informative_candles[pair] = load_pair_history(pair=pair, timeframe=strategy.informative_timeframe,
+                                                          datadir=Path(config['datadir']),
+                                                          data_format=config.get('dataformat_ohlcv', 'json'))
+    return candles, informative_candles
+
+
+def get_search_space(strategy):
+    """
+    Collects the parameters scored by 'populate_trend_batch' which are optimized (The 'optimize' flag is set by
+    '_init_vars', so overridden parameters of a 2nd HyperOpt Run keep their fixed value)
+    :return: Dictionary containing the (low, high) range of each optimized parameter
+    """
+
+    parameter_names = strategy._refresh_parameter_snapshot()['parameter_names']
+    return {parameter_name: (getattr(strategy, parameter_name).low, getattr(strategy, parameter_name).high)
+            for parameter_name in parameter_names if getattr(strategy, parameter_name).optimize is True}
+
+
+def get_rungs(total_days, candidates, eta, min_days):
+    rung_count = max(int(math.floor(math.log(max(total_days / min_days, 1), eta))) + 1, 1)
+    return [{'rung': rung, 'days': total_days / eta ** (rung_count - 1 - rung),
+             'candidates': max(int(math.ceil(candidates / eta ** rung)), 1)} for rung in range(rung_count)]
+
+
+def open_results_cache(results_cache):
+    os.makedirs(os.path.dirname(os.path.abspath(results_cache)), exist_ok=True)
+    connection = sqlite3.connect(results_cache)
+    # Caches written with an older layout are simply discarded
+    columns = [column[1] for column in connection.execute('PRAGMA table_info(results)')]
+    if (len(columns) > 0) and ('results' not in columns):
+        connection.execute('DROP TABLE results')
+    connection.execute('CREATE TABLE IF NOT EXISTS results (context TEXT NOT NULL, parameter_key TEXT NOT NULL, '
+                       'loss REAL NOT NULL, trades INTEGER NOT NULL, results TEXT NOT NULL, '
+                       'PRIMARY KEY (context, parameter_key))')
+    return connection
+
+
+def get_results_context(strategy, loss_file, config, analyzed_dataframes, start, end, min_trades):
+    """
+    Fingerprints everything besides the parameters which influences a score: The strategy & loss code, the MGM settings
+    (which losses like the MGMParetoLoss read), the candles of all pairs, the slice & the minimal amount of trades
+    :return: Hexadecimal context key
+    """
+
+    code = ''.join(inspect.getsource(cls) for cls in type(strategy).__mro__
+                   if cls.__module__.startswith('user_data.'))
+    with open(loss_file, 'r') as file_object:
+        code += file_object.read()
+    candles = [(pair, len(dataframe), str(dataframe['date'].iloc[0]), str(dataframe['date'].iloc[-1]),
+                float(dataframe['close'].sum())) for pair, dataframe in sorted(analyzed_dataframes.items())]
+    context = json.dumps([code, config.get('monigomani_settings'), config.get('stake_currency'), candles, str(start),
+                          str(end), min_trades, strategy.minimal_roi, strategy.stoploss,
+                          strategy.trailing_stop, strategy.trailing_stop_positive,
+                          strategy.trailing_stop_positive_offset, strategy.trailing_only_offset_is_reached])
+    return hashlib.sha1(context.encode('utf-8')).hexdigest()
+
+
+def get_results_summary(results):
+    """
+    Summarizes the simulated trades of a candidate like the report prints them
+    :return: Dictionary containing the trade count, wins/draws/losses, profit & drawdown percentages and sell reasons
+    """
+
+    if len(results) == 0:
+        return {'trades': 0, 'wins': 0, 'draws': 0, 'losses': 0, 'avg_profit_pct': 0.0, 'total_profit_pct': 0.0,
+                'max_drawdown_pct': 0.0, 'avg_duration_minutes': 0.0, 'sell_reasons': {}}
+
+    profit_ratios = results['profit_ratio'].to_numpy(dtype=float)
+    cumulative_profit = np.cumsum(profit_ratios[np.argsort(results['close_date'].to_numpy(), kind='stable')])
+    return {
+        'trades': len(results),
+        'wins': int(np.count_nonzero(profit_ratios > 0)),
+        'draws': int(np.count_nonzero(profit_ratios == 0)),
+        'losses': int(np.count_nonzero(profit_ratios < 0)),
+        'avg_profit_pct': round(float(profit_ratios.mean()) * 100, 2),
+        'total_profit_pct': round(float(profit_ratios.sum()) * 100, 2),
+        'max_drawdown_pct': round(float(max(np.max(np.maximum.accumulate(cumulative_profit) - cumulative_profit),
+                                            0)) * 100, 2),
+        'avg_duration_minutes': round(float(results['trade_duration'].mean()), 1),
+        'sell_reasons': {str(sell_reason): int(count)
+                         for sell_reason, count in results['sell_reason'].value_counts().items()}
+    }
+
+
+def score_candidates(strategy, analyzed_dataframes, parameter_sets, start, end, margin, loss_function, config,
+                     min_trades):
+    """
+    Scores all parameter sets upon the [start, end) slice of the analyzed dataframes
+    :return: Tuple of the loss, trade count & results summary of each parameter set and the amount of
+        candle-evaluations done
+    """
+
+    trades = [[] for _ in parameter_sets]
+    candle_evaluations = 0
+    for pair, dataframe in analyzed_dataframes.items():
+        dates = dataframe['date']
+        first_index = int(dates.searchsorted(start))
+        last_index = int(dates.searchsorted(end))
+        # Include the candles of the longest lookback window before the slice, so the slice start scores like in a
+        # BackTest of the full timerange
+        margin_index = max(first_index - margin, 0)
+        batch_dataframe = dataframe.iloc[margin_index:last_index].reset_index(drop=True)
+        slice_dataframe = batch_dataframe.iloc[first_index - margin_index:].reset_index(drop=True)
+        if len(slice_dataframe) < 2:
+            continue
+
+        batch_signals = strategy.populate_trend_batch(batch_dataframe, {'pair': pair}, parameter_sets)
+        candle_evaluations += len(batch_dataframe) * len(parameter_sets)
+        for candidate in range(len(parameter_sets)):
+            trades[candidate].append(strategy.simulate_trades(
+                slice_dataframe, {'pair': pair}, buy=batch_signals['buy'][first_index - margin_index:, candidate],
+                sell=batch_signals['sell'][first_index - margin_index:, candidate]))
+
+    losses = []
+    trade_counts = []
+    summaries = []
+    for candidate_trades in trades:
+        results = pd.concat(candidate_trades, ignore_index=True) if len(candidate_trades) > 0 else pd.DataFrame()
+        trade_counts.append(len(results))
+        summaries.append(get_results_summary(results))
+        if len(results) < min_trades:
+            losses.append(MAX_LOSS)
+            continue
+        losses.append(float(loss_function(results=results, trade_count=len(results), min_date=start.to_pydatetime(),
+                                          max_date=end.to_pydatetime(), config=config, processed={},
+                                          backtest_stats={})))
+
+    return np.array(losses), np.array(trade_counts), summaries, candle_evaluations
+
+
+def score_candidates_memoized(strategy, analyzed_dataframes, parameter_sets, start, end, margin, loss_class,
+                              loss_file, config, min_trades, connection):
+    """
+    Scores all parameter sets like 'score_candidates', but only scores each effective parameter vector once & takes the
+    scores & results of effective parameter vectors already found in the results cache (if any) from there
+    :return: Tuple of the loss, trade count & results summary of each parameter set, the amount of candle-evaluations
+        done, the amount of duplicate parameter sets & the amount of scores taken from the results cache
+    """
+
+    parameter_keys = strategy.get_effective_parameter_keys(parameter_sets)
+    unique_keys = list(dict.fromkeys(parameter_keys))
+    scores = {}
+    context = None
+    if connection is not None:
+        context = get_results_context(strategy, loss_file, config, analyzed_dataframes, start, end, min_trades)
+        for key_index in range(0, len(unique_keys), 500):
+            keys = unique_keys[key_index:key_index + 500]
+            scores.update({parameter_key: (loss, trades, json.loads(results))
+                           for parameter_key, loss, trades, results in connection.execute(
+                               f'SELECT parameter_key, loss, trades, results FROM results WHERE context = ? AND '
+                               f'parameter_key IN ({",".join("?" * len(keys))})', [context, *keys])})
+    cached_count = len(scores)
+
+    missing_keys = [parameter_key for parameter_key in unique_keys if parameter_key not in scores]
+    candle_evaluations = 0
+    if len(missing_keys) > 0:
+        first_parameter_sets = dict(zip(reversed(parameter_keys), reversed(parameter_sets)))
+        losses, trade_counts, summaries, candle_evaluations = score_candidates(
+            strategy, analyzed_dataframes, [first_parameter_sets[parameter_key] for parameter_key in missing_keys],
+            start, end, margin, loss_class.hyperopt_loss_function, config, min_trades)
+        new_scores = {parameter_key: (float(loss), int(trades), summary)
+                      for parameter_key, loss, trades, summary in zip(missing_keys, losses, trade_counts, summaries)}
+        scores.update(new_scores)
+
+        if connection is not None:
+            with connection:
+                connection.executemany('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)',
+                                       [(context, parameter_key, loss, trades, json.dumps(summary))
+                                        for parameter_key, (loss, trades, summary) in new_scores.items()])
+
+    return (np.array([scores[parameter_key][0] for parameter_key in parameter_keys]),
+            np.array([scores[parameter_key][1] for parameter_key in parameter_keys]),
+            [scores[parameter_key][2] for parameter_key in parameter_keys],
+            candle_evaluations, len(parameter_keys) - len(unique_keys), cached_count)
+
+
+def main():
+    parser = initialize_argument_parser()
+    args = parser.parse_args()
+
+    if os.path.isfile(os.path.join(os.getcwd(), 'user_data', 'mgm-config.json')) is False:
+        sys.exit('MGMSuccessiveHalving - ERROR - No \'./user_data/mgm-config.json\' found, please run the optimizer '
+                 'from the root of your MoniGoMani folder')
+
+    try:
+        start, end = [pd.Timestamp(date, tz='UTC') for date in args.timerange.split('-')]
+    except ValueError:
+        sys.exit(f'MGMSuccessiveHalving - ERROR - Invalid timerange \'{args.timerange}\', please provide both a start & '
+                 f'end date like 20210101-20210701')
+
+    from freqtrade.configuration import Configuration
+    config = Configuration.from_files(args.config)
+    loss_module, loss_class = load_rescorer_tool().load_loss_function(
+        os.path.join(os.getcwd(), 'user_data', 'hyperopts'), args.hyperopt_loss)
+    strategy = load_strategy(config, args.strategy)
+
+    # Indicators (& signal activations) don't depend on the parameters, so they only get computed once per pair
+    candles, informative_candles = load_candles(config, strategy, args.timerange)
+    strategy.dp = CandleDataProvider(informative_candles)
+    analyzed_dataframes = {pair: strategy.populate_indicators(dataframe, {'pair': pair})
+                           for pair, dataframe in candles.items() if len(dataframe) > 0}
+    if len(analyzed_dataframes) == 0:
+        sys.exit('MGMSuccessiveHalving - ERROR - No candles found for the whitelisted pairs, please download them first')
+
+    search_space = get_search_space(strategy)
+    random_generator = np.random.default_rng(args.seed)
+    parameter_sets = [{parameter_name: int(random_generator.integers(low, high + 1))
+                       for parameter_name, (low, high) in search_space.items()} for _ in range(args.candidates)]
+    margin = int(strategy.max_trend_total_signal_needed_candles_lookback_window_value *
+                 (strategy.timeframe_multiplier or 1))
+
+    connection = open_results_cache(args.results_cache) if args.use_results_cache is True else None
+    start_time = time.perf_counter()
+    total_days = (end - start).total_seconds() / 86400
+    rung_results = []
+    total_candle_evaluations = 0
+    candidate_indexes = np.arange(len(parameter_sets))
+    for rung in get_rungs(total_days, len(parameter_sets), args.eta, args.min_days):
+        candidate_indexes = candidate_indexes[:rung['candidates']]
+        slice_end = min(start + pd.Timedelta(days=rung['days']), end)
+        losses, trade_counts, summaries, candle_evaluations, duplicate_count, cached_count = score_candidates_memoized(
+            strategy, analyzed_dataframes, [parameter_sets[index] for index in candidate_indexes], start, slice_end,
+            margin, loss_class, loss_module.__file__, config, args.min_trades, connection)
+        total_candle_evaluations += candle_evaluations
+
+        # Best candidates first, so the next rung promotes the front of the list
+        order = np.argsort(losses, kind='stable')
+        candidate_indexes = candidate_indexes[order]
+        rung_results.append({'rung': rung['rung'], 'slice': f'{start:%Y%m%d}-{slice_end:%Y%m%d}',
+                             'candidates': len(order), 'duplicates': duplicate_count, 'cached': cached_count,
+                             'best_loss': float(losses[order[0]]), 'median_loss': float(np.median(losses)),
+                             'candle_evaluations': candle_evaluations})
+        final_losses, final_trade_counts = losses[order], trade_counts[order]
+        final_summaries = [summaries[index] for index in order]
+
+    # What scoring every candidate upon the full timerange would have cost
+    full_candle_evaluations = len(parameter_sets) * sum(
+        len(dataframe) - max(int(dataframe['date'].searchsorted(start)) - margin, 0)
+        for dataframe in analyzed_dataframes.values())
+
+    best_candidates = [{'loss': float(final_losses[rank]), 'trades': int(final_trade_counts[rank]),
+                        'results': final_summaries[rank],
+                        'params': {**{parameter_name: value for parameter_name, value in
+                                      zip(strategy.parameter_snapshot['parameter_names'],
+                                          strategy.parameter_snapshot['key'])},
+                                   **parameter_sets[candidate_indexes[rank]]}}
+                       for rank in range(min(args.top, len(candidate_indexes)))]
+
+    print('====================================================================')
+    print(f'MoniGoMani Successive Halving - {args.strategy} - {args.hyperopt_loss} - {args.timerange}')
+    print('====================================================================')
+    print(f'{len(parameter_sets)} candidates sampled from {len(search_space)} optimized parameters, '
+          f'{len(analyzed_dataframes)} pairs, eta {args.eta} - {time.perf_counter() - start_time:.1f}s')
+    print('')
+    print(pd.DataFrame(rung_results).to_string(index=False))
+    print('')
+    if total_candle_evaluations > 0:
+        print(f'Candle-evaluations: {total_candle_evaluations} '
+              f'({full_candle_evaluations / total_candle_evaluations:.1f}x less than scoring all candidates upon the '
+              f'full timerange)')
+    else:
+        print('Candle-evaluations: 0 (All candidates were scored from the results cache)')
+    print('')
+    for rank, best_candidate in enumerate(best_candidates):
+        results = best_candidate['results']
+        print(f'{rank + 1}. Loss: {best_candidate["loss"]:.5f} - Simulated trades: {best_candidate["trades"]} '
+              f'({results["wins"]}/{results["draws"]}/{results["losses"]} Wins/Draws/Losses) - Total profit: '
+              f'{results["total_profit_pct"]}% - Max drawdown: {results["max_drawdown_pct"]}%')
+
+    with open(args.output, 'w') as file_object:
+        json.dump({'timerange': args.timerange, 'hyperopt_loss': args.hyperopt_loss, 'rungs': rung_results,
+                   'best_candidates': best_candidates}, file_object, indent=4)
+    print(f'Best candidates saved to: {args.output}')
+
+
+if __name__ == '__main__':
+    main()
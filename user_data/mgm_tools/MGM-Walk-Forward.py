@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# --- ↑↓ Do not remove these libs ↑↓ -----------------------------------------------------------------------------------
+import argparse
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from datetime import timedelta
+from multiprocessing import Pool, cpu_count
+
+import pandas as pd
+# ---- ↑ Do not remove these libs ↑ ------------------------------------------------------------------------------------
+
+# Walk-Forward Optimizer for MoniGoMani
+# =====================================
+# Defines rolling train/test windows (folds) over the '--timerange'. Each fold runs the MGM HyperOpt flow upon its train
+# window (A wide search, followed by refined searches within the ±search_threshold spaces of the previous results),
+# then BackTests the found parameters upon its out-of-sample test window. All folds run in parallel, each inside its own
+# workspace with an isolated 'mgm-config-hyperopt.json'. The out-of-sample results of all folds are aggregated into 1
+# report.
+#
+# The indicators of all pairs are computed once per window & re-used by the following HyperOpt runs of its fold through
+# the MGM indicator cache. The cache is keyed on the first candle, so each window gets the exact same indicators as
+# without the cache.
+#
+# Execute: `python ./user_data/mgm_tools/MGM-Walk-Forward.py -tr 20210101-20211231 -l MGMUncloggedWinRatioLoss`
+# from your favorite terminal / CLI, from the root of your MoniGoMani folder
+
+# Entries of 'user_data' which aren't copied into the fold workspaces
+skipped_user_data_entries = ['backtest_results', 'hyperopt_results', 'logs', 'mgm-config-hyperopt.json',
+                             'mgm_signal_matrices', 'mgm_debug_signals', 'mgm_indicator_cache', 'walk_forward']
+# Entries of 'user_data' which are shared (read-only) with the fold workspaces instead of copied
+shared_user_data_entries = ['data']
+
+
+def initialize_argument_parser():
+    parser = argparse.ArgumentParser(description='Walk-Forward Optimizer for MoniGoMani')
+    parser.add_argument('-tr', '--timerange', dest='timerange', type=str, required=True,
+                        help='Timerange to walk forward over, with a start & end date (e.g. 20210101-20211231)')
+    parser.add_argument('-l', '--hyperopt-loss', dest='hyperopt_loss', type=str, required=True,
+                        help='Name of the HyperOpt Loss class to HyperOpt with')
+    parser.add_argument('-trd', '--train-days', dest='train_days', type=int, default=90,
+                        help='Optional (Defaults to 90 when omitted): Days in the train (HyperOpt) window of each fold')
+    parser.add_argument('-ted', '--test-days', dest='test_days', type=int, default=30,
+                        help='Optional (Defaults to 30 when omitted): Days in the out-of-sample test (BackTest) window of '
+                             'each fold, the windows roll forward by this many days per fold')
+    parser.add_argument('-e', '--epochs', dest='epochs', type=int, default=800,
+                        help='Optional (Defaults to 800 when omitted): Epochs per HyperOpt run')
+    parser.add_argument('-hr', '--hyperopt-runs', dest='hyperopt_runs', type=int, default=2,
+                        help='Optional (Defaults to 2 when omitted): HyperOpt runs per fold, each run after the first '
+                             'refines the results of the previous one')
+    parser.add_argument('-sp', '--spaces', dest='spaces', type=str, nargs='+', default=['all'],
+                        help='Optional (Defaults to all when omitted): HyperOpt spaces')
+    parser.add_argument('-j', '--job-workers', dest='job_workers', type=int, default=None,
+                        help='Optional (Defaults to the amount of folds when omitted): Amount of folds ran in parallel')
+    parser.add_argument('-hj', '--hyperopt-job-workers', dest='hyperopt_job_workers', type=int, default=None,
+                        help='Optional (Defaults to the CPU cores divided over the parallel folds when omitted): '
+                             'HyperOpt job workers (-j) of each fold')
+    parser.add_argument('-s', '--strategy', dest='strategy', type=str, default='MoniGoManiHyperStrategy',
+                        help='Optional (Defaults to MoniGoManiHyperStrategy when omitted): Strategy to optimize')
+    parser.add_argument('-c', '--config', dest='config', type=str, nargs='+',
+                        default=['./user_data/mgm-config.json', './user_data/mgm-config-private.json'],
+                        help='Optional (Defaults to ./user_data/mgm-config.json ./user_data/mgm-config-private.json '
+                             'when omitted): Configuration files passed to Freqtrade')
+    parser.add_argument('-ep', '--enable-protections', dest='enable_protections', action='store_true',
+                        help='Optional (Defaults to False when omitted): HyperOpt & BackTest with --enable-protections')
+    parser.add_argument('-nc', '--no-indicator-cache', dest='indicator_cache', action='store_false',
+                        help='Optional (Defaults to False when omitted): Let every fold compute its own indicators')
+    parser.add_argument('-o', '--output-directory', dest='output_directory', type=str,
+                        default='./user_data/walk_forward',
+                        help='Optional (Defaults to ./user_data/walk_forward when omitted): Directory holding the fold '
+                             'workspaces & the walk-forward results')
+    parser.add_argument('-fc', '--freqtrade-command', dest='freqtrade_command', type=str, default='freqtrade',
+                        help='Optional (Defaults to freqtrade when omitted): Command used to run Freqtrade')
+    return parser
+
+
+def load_parallel_backtest_tool():
+    # Re-use the timerange parsing & trade summary of the Parallel BackTester
+    tool_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'MGM-Parallel-Backtest.py')
+    spec = importlib.util.spec_from_file_location('mgm_parallel_backtest', tool_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+parallel_backtest = load_parallel_backtest_tool()
+
+
+def get_folds(start, end, train_days, test_days):
+    folds = []
+    train_start = start
+    while train_start + timedelta(days=train_days + test_days) <= end:
+        train_end = train_start + timedelta(days=train_days)
+        folds.append({'fold': len(folds), 'train_start': train_start, 'train_end': train_end,
+                      'test_start': train_end, 'test_end': train_end + timedelta(days=test_days)})
+        train_start += timedelta(days=test_days)
+    return folds
+
+
+def create_workspace(workspace_directory, args):
+    """
+    Creates an isolated copy of 'user_data' to run Freqtrade in (Downloaded data is shared through a symlink)
+    :return: Absolute path to the workspace
+    """
+
+    workspace_directory = os.path.abspath(workspace_directory)
+    workspace_user_data = os.path.join(workspace_directory, 'user_data')
+    if os.path.isdir(workspace_user_data):
+        shutil.rmtree(workspace_user_data)
+    os.makedirs(workspace_user_data)
+
+    user_data_directory = os.path.join(os.getcwd(), 'user_data')
+    for entry in os.listdir(user_data_directory):
+        source = os.path.join(user_data_directory, entry)
+        if (entry in skipped_user_data_entries) or \
+                (os.path.abspath(source) == os.path.abspath(args.output_directory)):
+            continue
+        elif entry in shared_user_data_entries:
+            os.symlink(source, os.path.join(workspace_user_data, entry))
+        elif os.path.isdir(source):
+            shutil.copytree(source, os.path.join(workspace_user_data, entry),
+                            ignore=shutil.ignore_patterns('__pycache__'))
+        else:
+            shutil.copy2(source, os.path.join(workspace_user_data, entry))
+
+    # Share 1 indicator cache between all workspaces
+    if args.indicator_cache is True:
+        shared_indicator_cache = os.path.abspath(os.path.join(args.output_directory, 'mgm_indicator_cache'))
+        os.makedirs(shared_indicator_cache, exist_ok=True)
+        os.symlink(shared_indicator_cache, os.path.join(workspace_user_data, 'mgm_indicator_cache'))
+
+        mgm_config_path = os.path.join(workspace_user_data, 'mgm-config.json')
+        with open(mgm_config_path, 'r') as file_object:
+            mgm_config = json.load(file_object)
+        mgm_config['monigomani_settings']['indicator_cache'] = {'enabled': True, 'directory': 'mgm_indicator_cache'}
+        with open(mgm_config_path, 'w') as file_object:
+            json.dump(mgm_config, file_object, indent=2)
+
+    return workspace_directory
+
+
+def run_freqtrade(arguments, workspace_directory, args, log_name):
+    command = [*args.freqtrade_command.split(), *arguments]
+    for config_file in args.config:
+        command.extend(['-c', config_file])
+
+    freqtrade = subprocess.run(command, capture_output=True, text=True, cwd=workspace_directory)
+    log_path = os.path.join(workspace_directory, f'{log_name}.log')
+    with open(log_path, 'w') as file_object:
+        file_object.write(freqtrade.stdout + freqtrade.stderr)
+    if freqtrade.returncode != 0:
+        raise RuntimeError(f'Freqtrade {arguments[0]} exited with code {freqtrade.returncode}, see {log_path}')
+    return freqtrade.stdout
+
+
+def merge_dicts(base, update):
+    # Deep merge, like the `jq -s '.[0] * .[1]'` used to combine the results of multiple HyperOpt runs
+    merged = dict(base)
+    for key, value in update.items():
+        merged[key] = merge_dicts(merged[key], value) \
+            if isinstance(value, dict) and isinstance(merged.get(key), dict) else value
+    return merged
+
+
+def run_fold(fold_job):
+    fold, args = fold_job
+    protections = ['--enable-protections'] if args.enable_protections is True else []
+    start_time = time.perf_counter()
+    try:
+        workspace_directory = create_workspace(os.path.join(args.output_directory, f'fold-{fold["fold"]}'), args)
+        mgm_config_hyperopt_path = os.path.join(workspace_directory, 'user_data', 'mgm-config-hyperopt.json')
+
+        # Each HyperOpt run after the first one searches within the refined spaces of the previous results
+        for hyperopt_run in range(1, args.hyperopt_runs + 1):
+            run_freqtrade(['hyperopt', '-s', args.strategy, '--hyperopt-loss', args.hyperopt_loss,
+                           '--spaces', *args.spaces, '-e', str(args.epochs), '-j', str(args.hyperopt_job_workers),
+                           '--timerange', f'{fold["train_start"]:%Y%m%d}-{fold["train_end"]:%Y%m%d}', *protections],
+                          workspace_directory, args, f'hyperopt-{hyperopt_run}')
+            best_epoch_output = run_freqtrade(['hyperopt-show', '--best', '--no-header', '--print-json'],
+                                              workspace_directory, args, f'hyperopt-show-{hyperopt_run}')
+            best_epoch = json.loads([line for line in best_epoch_output.splitlines() if line.strip() != ''][-1])
+
+            mgm_config_hyperopt = {}
+            if os.path.isfile(mgm_config_hyperopt_path) is True:
+                with open(mgm_config_hyperopt_path, 'r') as file_object:
+                    mgm_config_hyperopt = json.load(file_object)
+            mgm_config_hyperopt = merge_dicts(mgm_config_hyperopt, best_epoch)
+            with open(mgm_config_hyperopt_path, 'w') as file_object:
+                json.dump(mgm_config_hyperopt, file_object, indent=4)
+
+        # BackTest the optimized parameters upon the out-of-sample test window
+        export_directory = os.path.join(workspace_directory, 'user_data', 'backtest_results')
+        os.makedirs(export_directory, exist_ok=True)
+        run_freqtrade(['backtesting', '-s', args.strategy,
+                       '--timerange', f'{fold["test_start"]:%Y%m%d}-{fold["test_end"]:%Y%m%d}',
+                       '--export', 'trades', '--export-filename', export_directory, *protections],
+                      workspace_directory, args, 'backtest')
+        with open(os.path.join(export_directory, '.last_result.json'), 'r') as file_object:
+            result_file = os.path.join(export_directory, json.load(file_object)['latest_backtest'])
+        with open(result_file, 'r') as file_object:
+            strategy_results = json.load(file_object)['strategy'][args.strategy]
+    except (OSError, RuntimeError, ValueError, KeyError) as exception:
+        return {**fold, 'error': str(exception)}
+
+    return {**fold, 'trades': strategy_results['trades'], 'starting_balance': strategy_results.get('starting_balance'),
+            'mgm_config_hyperopt': mgm_config_hyperopt, 'duration': time.perf_counter() - start_time}
+
+
+def main():
+    parser = initialize_argument_parser()
+    args = parser.parse_args()
+
+    start, end = parallel_backtest.parse_timerange(args.timerange)
+    folds = get_folds(start, end, args.train_days, args.test_days)
+    if len(folds) == 0:
+        sys.exit(f'MGMWalkForward - ERROR - The timerange \'{args.timerange}\' is too short for a train window of '
+                 f'{args.train_days} days followed by a test window of {args.test_days} days')
+    args.job_workers = args.job_workers or len(folds)
+    args.hyperopt_job_workers = args.hyperopt_job_workers or max(cpu_count() // args.job_workers, 1)
+    os.makedirs(args.output_directory, exist_ok=True)
+
+    start_time = time.perf_counter()
+    with Pool(processes=args.job_workers) as pool:
+        fold_results = pool.map(run_fold, [(fold, args) for fold in folds], chunksize=1)
+    wall_time = time.perf_counter() - start_time
+
+    failed_folds = [fold_result for fold_result in fold_results if 'error' in fold_result]
+    if len(failed_folds) > 0:
+        sys.exit('MGMWalkForward - ERROR - ' + ', '.join(f'Fold {fold_result["fold"]}: {fold_result["error"]}'
+                                                          for fold_result in failed_folds))
+
+    starting_balance = fold_results[0]['starting_balance']
+    fold_rows = []
+    for fold_result in fold_results:
+        _, fold_summary = parallel_backtest.get_summary(fold_result['trades'], starting_balance)
+        fold_result['summary'] = fold_summary
+        fold_rows.append({'fold': fold_result['fold'],
+                          'train': f'{fold_result["train_start"]:%Y%m%d}-{fold_result["train_end"]:%Y%m%d}',
+                          'test': f'{fold_result["test_start"]:%Y%m%d}-{fold_result["test_end"]:%Y%m%d}',
+                          'trades': fold_summary['Total trades'],
+                          'profit_pct': fold_summary.get('Total profit %'),
+                          'avg_profit_pct': fold_summary.get('Avg profit %'),
+                          'max_drawdown_abs': fold_summary.get('Max drawdown abs'),
+                          'duration_s': round(fold_result['duration'], 1)})
+    per_pair, summary = parallel_backtest.get_summary(
+        [trade for fold_result in fold_results for trade in fold_result['trades']], starting_balance)
+
+    print('====================================================================')
+    print(f'MoniGoMani Walk-Forward Optimization - {args.strategy} - {args.hyperopt_loss} - {args.timerange}')
+    print('====================================================================')
+    print(f'{len(folds)} folds ({args.train_days} train days, {args.test_days} test days) x {args.hyperopt_runs} '
+          f'HyperOpt runs of {args.epochs} epochs - Wall time: {wall_time:.1f}s (Sequential fold time: '
+          f'{sum(fold_result["duration"] for fold_result in fold_results):.1f}s)')
+    print('')
+    print(pd.DataFrame(fold_rows).to_string(index=False))
+    print('')
+    print('Out-of-sample results of all folds:')
+    if len(per_pair) > 0:
+        print(per_pair.to_string())
+        print('')
+    for metric, value in summary.items():
+        print(f'{metric}: {value}')
+
+    walk_forward_results_path = os.path.join(args.output_directory, 'walk-forward-results.json')
+    with open(walk_forward_results_path, 'w') as file_object:
+        json.dump({'timerange': args.timerange, 'hyperopt_loss': args.hyperopt_loss, 'summary': summary,
+                   'folds': fold_results}, file_object, indent=4, default=str)
+    print(f'Walk-forward results saved to: {walk_forward_results_path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# --- ↑↓ Do not remove these libs ↑↓ -----------------------------------------------------------------------------------
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import time
+from multiprocessing import Pool, cpu_count
+
+import pandas as pd
+# ---- ↑ Do not remove these libs ↑ ------------------------------------------------------------------------------------
+
+# Test Results Database for MoniGoMani
+# ====================================
+# Parses the BackTest & HyperOpt logs stored under 'Some Test Results/' into an indexed SQLite database (runs,
+# parameters, per-pair results & summary metrics), so results of all versions can be compared with a single query.
+# Logs are only (re-)parsed when they are new or have been changed since the last ingest.
+#
+# Execute: `python ./user_data/mgm_tools/Test-Results-Database.py -i` from your favorite terminal / CLI to ingest,
+# then for example: `python ./user_data/mgm_tools/Test-Results-Database.py -bp buy__sideways_trend_total_signal_needed
+# -v v0.12` to find the best sideways buy threshold across all v0.12 runs
+
+database_schema = '''
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    version TEXT,
+    kind TEXT,
+    command TEXT,
+    start_date TEXT,
+    end_date TEXT,
+    mtime REAL,
+    size INTEGER
+);
+CREATE TABLE IF NOT EXISTS parameters (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    source TEXT,
+    name TEXT,
+    value REAL,
+    value_text TEXT
+);
+CREATE TABLE IF NOT EXISTS pair_results (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    pair TEXT,
+    trades INTEGER,
+    avg_profit_pct REAL,
+    cum_profit_pct REAL,
+    total_profit_pct REAL,
+    avg_duration TEXT,
+    wins INTEGER,
+    draws INTEGER,
+    losses INTEGER
+);
+CREATE TABLE IF NOT EXISTS summary_metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    metric TEXT,
+    value REAL,
+    value_text TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_version ON runs(version);
+CREATE INDEX IF NOT EXISTS parameters_name_value ON parameters(name, value);
+CREATE INDEX IF NOT EXISTS parameters_run_id ON parameters(run_id);
+CREATE INDEX IF NOT EXISTS pair_results_pair ON pair_results(pair);
+CREATE INDEX IF NOT EXISTS pair_results_run_id ON pair_results(run_id);
+CREATE INDEX IF NOT EXISTS summary_metrics_metric_value ON summary_metrics(metric, value);
+CREATE INDEX IF NOT EXISTS summary_metrics_run_id ON summary_metrics(run_id);
+'''
+
+strategy_parameter_pattern = re.compile(r'Strategy Parameter: (\w+) = (.+)$')
+timerange_pattern = re.compile(r'(?:Backtesting|Hyperopting) with data from ([\d\-: ]+) up to ([\d\-: ]+)')
+dictionary_start_pattern = re.compile(r'^\s+(\w+) = \{')
+dictionary_entry_pattern = re.compile(r'^\s+["\'](\w+)["\']\s*:\s*([^,]+),?\s*$')
+scalar_pattern = re.compile(r'^\s+(\w+) = ([^{]+)$')
+best_result_start_pattern = re.compile(r'^(Best result:|\s+\d+/\d+:)')
+number_pattern = re.compile(r'-?\d[\d,]*(?:\.\d+)?')
+
+# Metrics of the 'Best result:' of a HyperOpt log, named like their BackTest 'SUMMARY METRICS' counterparts
+best_result_patterns = {
+    'Total trades': re.compile(r'(\d+) trades\.'),
+    'Wins/Draws/Losses': re.compile(r'(\d+/\d+/\d+) Wins/Draws/Losses'),
+    'Avg profit %': re.compile(r'Avg profit\s+(-?[\d.]+)%'),
+    'Median profit %': re.compile(r'Median profit\s+(-?[\d.]+)%'),
+    'Absolute profit': re.compile(r'Total profit\s+(-?[\d.]+ \w+)'),
+    'Total profit %': re.compile(r'Total profit\s+-?[\d.]+ \w+ \(\s*(-?[\d.,]+)Σ?%\)'),
+    'Objective': re.compile(r'Objective: (-?[\d.,]+\d)')
+}
+
+
+def initialize_argument_parser():
+    parser = argparse.ArgumentParser(description='Test Results Database for MoniGoMani')
+    parser.add_argument('-d', '--database', dest='database', type=str, default='./user_data/mgm-test-results.sqlite',
+                        help='Optional (Defaults to ./user_data/mgm-test-results.sqlite when omitted): The SQLite '
+                             'database file to ingest into / query from')
+    parser.add_argument('-i', '--ingest', dest='ingest', const=True, default=False, nargs='?',
+                        help='Optional (Defaults to False when omitted): Ingest all new or changed logs')
+    parser.add_argument('-r', '--results-directory', dest='results_directory', type=str,
+                        default='./Some Test Results',
+                        help='Optional (Defaults to ./Some Test Results when omitted): Directory holding the logs to '
+                             'ingest, with a sub directory per MoniGoMani version')
+    parser.add_argument('-j', '--job-workers', dest='job_workers', type=int, default=cpu_count(),
+                        help='Optional (Defaults to all CPU cores when omitted): Amount of parallel worker processes')
+    parser.add_argument('-bp', '--best-parameter', dest='best_parameter', type=str, default=None,
+                        help='Optional (Unused by default): Print the value of this parameter in the best runs')
+    parser.add_argument('-v', '--version', dest='version', type=str, default=None,
+                        help='Optional (Unused by default): Only use the runs of versions starting with this value '
+                             '(e.g. v0.12)')
+    parser.add_argument('-m', '--metric', dest='metric', type=str, default='Total profit %',
+                        help='Optional (Defaults to \'Total profit %%\' when omitted): Summary metric used to rank the '
+                             'runs with -bp, higher is better')
+    parser.add_argument('-n', '--top-n', dest='top_n', type=int, default=10,
+                        help='Optional (Defaults to 10 when omitted): Amount of best runs to print with -bp')
+    parser.add_argument('-q', '--query', dest='query', type=str, default=None,
+                        help='Optional (Unused by default): Run a custom SQL query upon the database and print the '
+                             'results')
+    return parser
+
+
+def parse_number(value):
+    match = number_pattern.search(value)
+    return float(match.group().replace(',', '')) if match is not None else None
+
+
+def parse_table_row(line):
+    return [cell.strip() for cell in line.strip().strip('|').split('|')]
+
+
+def parse_pair_result(header, cells):
+    row = dict(zip(header, cells))
+    pair_result = {
+        'pair': row.get('Pair'),
+        'trades': parse_number(row.get('Buys', '')),
+        'avg_profit_pct': parse_number(row.get('Avg Profit %', '')),
+        'cum_profit_pct': parse_number(row.get('Cum Profit %', '')),
+        'total_profit_pct': parse_number(row.get('Tot Profit %', '')),
+        'avg_duration': row.get('Avg Duration'),
+        'wins': parse_number(row.get('Wins', '')),
+        'draws': parse_number(row.get('Draws', '')),
+        'losses': parse_number(row.get('Losses', ''))
+    }
+
+    # Newer Freqtrade versions combine the wins, draws & losses in 1 column
+    if 'Win  Draw  Loss  Win%' in row:
+        counts = row['Win  Draw  Loss  Win%'].split()
+        pair_result['wins'], pair_result['draws'], pair_result['losses'] = [float(count) for count in counts[:3]]
+
+    return pair_result
+
+
+def parse_log(log_job):
+    """
+    Parses 1 BackTest or HyperOpt log, ran inside the ingest worker processes
+    :return: Dictionary containing the run & its parameters, per-pair results and summary metrics
+    """
+    path, relative_path = log_job
+    with open(path, 'r', encoding='utf-8', errors='replace') as file_object:
+        lines = file_object.read().splitlines()
+
+    file_name = os.path.basename(relative_path).lower()
+    run = {
+        'path': relative_path,
+        'version': relative_path.split(os.sep)[0] if os.sep in relative_path else None,
+        'kind': 'hyperopt' if 'hyperopt' in file_name else 'backtest' if 'backtest' in file_name else 'other',
+        'command': lines[0].strip() if (len(lines) > 0) and lines[0].startswith('freqtrade') else None,
+        'start_date': None,
+        'end_date': None,
+        'mtime': os.path.getmtime(path),
+        'size': os.path.getsize(path)
+    }
+    parameters = []
+    pair_results = []
+    summary_metrics = []
+
+    table = None
+    table_header = None
+    best_result_lines = None
+    dictionary_name = None
+    for line in lines:
+        strategy_parameter = strategy_parameter_pattern.search(line)
+        if strategy_parameter is not None:
+            parameters.append(('strategy_parameter', strategy_parameter.group(1), strategy_parameter.group(2).strip()))
+            continue
+
+        timerange = timerange_pattern.search(line)
+        if (timerange is not None) and (run['start_date'] is None):
+            run['start_date'], run['end_date'] = timerange.group(1).strip(), timerange.group(2).strip()
+            continue
+
+        # Freqtrade report tables
+        if line.startswith('='):
+            table = 'pairs' if (('BACKTESTING REPORT' in line) and (len(pair_results) == 0)) else \
+                'summary' if 'SUMMARY METRICS' in line else None
+            table_header = None
+            continue
+        if (table is not None) and line.startswith('|'):
+            cells = parse_table_row(line)
+            if table_header is None:
+                table_header = cells
+            elif line.startswith('|-') is False:
+                if (table == 'pairs') and (cells[0] != 'TOTAL'):
+                    pair_results.append(parse_pair_result(table_header, cells))
+                elif (table == 'summary') and (cells[0] != '') and \
+                        (cells[0] not in [summary_metric[0] for summary_metric in summary_metrics]):
+                    # Only keep the first occurrence of metrics reported twice (e.g. 'Drawdown')
+                    summary_metrics.append((cells[0], cells[-1]))
+            continue
+        table = None
+
+        # HyperOpt 'Best result:' section (Or the epoch printed by 'freqtrade hyperopt-show')
+        if (best_result_lines is None) and (best_result_start_pattern.match(line) is not None):
+            best_result_lines = [line]
+            continue
+        if best_result_lines is not None:
+            dictionary_start = dictionary_start_pattern.match(line)
+            dictionary_entry = dictionary_entry_pattern.match(line)
+            scalar = scalar_pattern.match(line)
+            if dictionary_start is not None:
+                dictionary_name = dictionary_start.group(1)
+            elif line.strip().startswith('}'):
+                dictionary_name = None
+            elif (dictionary_name is not None) and (dictionary_entry is not None):
+                name = dictionary_entry.group(1)
+                parameters.append((dictionary_name, name if dictionary_name.endswith('_params') else
+                                   f'{dictionary_name}_{name}', dictionary_entry.group(2).strip()))
+            elif (dictionary_name is None) and (scalar is not None):
+                parameters.append(('best_result', scalar.group(1), scalar.group(2).strip()))
+            elif (dictionary_name is None) and (line.strip().startswith('#') is False):
+                best_result_lines.append(line)
+
+    if (run['start_date'] is None) and (len(summary_metrics) > 0):
+        summary = dict(summary_metrics)
+        run['start_date'], run['end_date'] = summary.get('Backtesting from'), summary.get('Backtesting to')
+
+    if best_result_lines is not None:
+        best_result = ' '.join(best_result_lines)
+        for metric, pattern in best_result_patterns.items():
+            match = pattern.search(best_result)
+            if (match is not None) and (metric not in [summary_metric[0] for summary_metric in summary_metrics]):
+                summary_metrics.append((metric, match.group(1)))
+
+    return {
+        'run': run,
+        'parameters': [(source, name, parse_number(value) if value not in ['True', 'False', 'true', 'false']
+                        else float(value.lower() == 'true'), value) for source, name, value in parameters],
+        'pair_results': pair_results,
+        'summary_metrics': [(metric, parse_number(value), value) for metric, value in summary_metrics]
+    }
+
+
+def connect_database(database):
+    connection = sqlite3.connect(database)
+    connection.execute('PRAGMA foreign_keys = ON')
+    connection.executescript(database_schema)
+    return connection
+
+
+def ingest_logs(connection, results_directory, job_workers):
+    # Only (re-)parse the logs which are new or changed since the last ingest
+    ingested_runs = {path: (run_id, mtime, size) for run_id, path, mtime, size in
+                     connection.execute('SELECT id, path, mtime, size FROM runs')}
+    log_jobs = []
+    for directory, _, file_names in os.walk(results_directory):
+        for file_name in sorted(file_names):
+            if file_name.endswith('.log') is False:
+                continue
+
+            path = os.path.join(directory, file_name)
+            relative_path = os.path.relpath(path, results_directory)
+            ingested_run = ingested_runs.get(relative_path)
+            if (ingested_run is None) or (ingested_run[1:] != (os.path.getmtime(path), os.path.getsize(path))):
+                log_jobs.append((path, relative_path))
+
+    if len(log_jobs) == 0:
+        return 0
+
+    with Pool(processes=min(job_workers, len(log_jobs))) as pool, connection:
+        for parsed_log in pool.imap_unordered(parse_log, log_jobs, chunksize=4):
+            run = parsed_log['run']
+            connection.execute('DELETE FROM runs WHERE path = ?', (run['path'],))
+            run_id = connection.execute(
+                'INSERT INTO runs (path, version, kind, command, start_date, end_date, mtime, size) '
+                'VALUES (:path, :version, :kind, :command, :start_date, :end_date, :mtime, :size)', run).lastrowid
+            connection.executemany('INSERT INTO parameters VALUES (?, ?, ?, ?, ?)',
+                                   [(run_id, *parameter) for parameter in parsed_log['parameters']])
+            connection.executemany(
+                'INSERT INTO pair_results VALUES (:run_id, :pair, :trades, :avg_profit_pct, :cum_profit_pct, '
+                ':total_profit_pct, :avg_duration, :wins, :draws, :losses)',
+                [{'run_id': run_id, **pair_result} for pair_result in parsed_log['pair_results']])
+            connection.executemany('INSERT INTO summary_metrics VALUES (?, ?, ?, ?)',
+                                   [(run_id, *summary_metric) for summary_metric in parsed_log['summary_metrics']])
+
+    return len(log_jobs)
+
+
+def query_best_parameter(connection, parameter, metric, version, top_n):
+    # HyperOpt runs report the value of their best result ('buy_params', 'sell_params', ...), the values logged at
+    # startup ('strategy_parameter') are only the ones HyperOpt started from. Other runs only report the latter.
+    # Each run only uses the first occurrence of the parameter & metric.
+    return pd.read_sql_query(
+        'SELECT runs.version, runs.kind, runs.path, parameters.value AS value, summary_metrics.value AS metric '
+        'FROM runs '
+        'JOIN parameters ON parameters.rowid = ('
+        '    SELECT MIN(rowid) FROM parameters WHERE parameters.run_id = runs.id AND parameters.name = ? '
+        '    AND (parameters.source = \'strategy_parameter\') = (runs.kind != \'hyperopt\')) '
+        'JOIN summary_metrics ON summary_metrics.rowid = ('
+        '    SELECT MIN(rowid) FROM summary_metrics WHERE summary_metrics.run_id = runs.id '
+        '    AND summary_metrics.metric = ?) '
+        'WHERE (? IS NULL OR runs.version LIKE ? || \'%\') '
+        'ORDER BY metric DESC LIMIT ?',
+        connection, params=(parameter, metric, version, version, top_n))
+
+
+def main():
+    parser = initialize_argument_parser()
+    args = parser.parse_args()
+
+    connection = connect_database(args.database)
+
+    if args.ingest:
+        if os.path.isdir(args.results_directory) is False:
+            sys.exit(f'TestResultsDatabase - ERROR - The results directory \'{args.results_directory}\' can\'t be '
+                     f'found...')
+
+        start_time = time.time()
+        ingested_logs = ingest_logs(connection, args.results_directory, args.job_workers)
+        print(f'Ingested {ingested_logs} new or changed logs into \'{args.database}\' in '
+              f'{round(time.time() - start_time, 2)}s')
+
+    if args.best_parameter is not None:
+        start_time = time.time()
+        results = query_best_parameter(connection, args.best_parameter, args.metric, args.version, args.top_n)
+        print(f'Best \'{args.best_parameter}\' values ranked by \'{args.metric}\' '
+              f'({round((time.time() - start_time) * 1000, 2)}ms):')
+        print(results.to_string(index=False) if len(results) > 0 else 'No matching runs found')
+
+    if args.query is not None:
+        try:
+            print(pd.read_sql_query(args.query, connection).to_string(index=False))
+        except (sqlite3.Error, pd.io.sql.DatabaseError) as error:
+            sys.exit(f'TestResultsDatabase - ERROR - The query failed: {error}')
+
+    connection.close()
+
+
+if __name__ == '__main__':
+    main()
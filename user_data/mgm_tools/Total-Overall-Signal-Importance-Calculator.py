@@ -1,9 +1,15 @@
 #!/user/bin/python3
 # --- ↑↓ Do not remove these libs ↑↓ -----------------------------------------------------------------------------------
 import argparse
+import glob
+import heapq
 import json
 import os
 import sys
+from multiprocessing import Pool, cpu_count
+
+import numpy as np
+import pandas as pd
 # ---- ↑ Do not remove these libs ↑ ------------------------------------------------------------------------------------
 
 
@@ -60,6 +66,23 @@ def initialize_argument_parser():
     parser.add_argument('-nf', '--no-file', dest='output_to_file', const=False, default=True, nargs='?',
                         help='Optional (Defaults to True when not omitted): Do not output the '
                              'Total-Average-Signal-Importance-Report as a .log file')
+    parser.add_argument('-fr', '--fthypt-results', dest='fthypt_results', type=str, default=None, const='latest',
+                        nargs='?', help='Optional (Unused by default): Stream all epochs of a .fthypt HyperOpt results '
+                                        'file (Defaults to the latest HyperOpt results when no file is provided) '
+                                        'instead of only reading the best result from mgm-config-hyperopt.json')
+    parser.add_argument('-tn', '--top-n-epochs', dest='top_n_epochs', type=int, default=None,
+                        help='Optional (Defaults to all epochs when omitted): Only use the N epochs with the lowest loss '
+                             'when streaming a .fthypt HyperOpt results file')
+    parser.add_argument('-b', '--batch', dest='batch', type=str, default=None,
+                        help='Optional (Unused by default): Directory (searched recursively) or glob of '
+                             'mgm-config-hyperopt*.json files to compare in one aggregated signal importance table')
+    parser.add_argument('-bf', '--batch-file', dest='batch_file', type=str,
+                        default='./user_data/Signal-Importance-Comparison.csv',
+                        help='Optional (Defaults to ./user_data/Signal-Importance-Comparison.csv when omitted): Output '
+                             'file of the batch comparison table, saved as parquet when ending on .parquet')
+    parser.add_argument('-j', '--job-workers', dest='job_workers', type=int, default=cpu_count(),
+                        help='Optional (Defaults to all CPU cores when omitted): Amount of parallel worker processes '
+                             'used in batch mode')
     return parser
 
 
@@ -213,6 +236,111 @@ def print_sell_unclogger_check(unclogger_check, value):
     print(signal_format.format(f'{unclogger_check}:', str(value).replace('.0', '')))
 
 
+def get_latest_fthypt_file():
+    hyperopt_results_directory = os.getcwd() + '/user_data/hyperopt_results'
+    last_result_path = hyperopt_results_directory + '/.last_result.json'
+    if os.path.isfile(last_result_path) is False:
+        sys.exit(f'TotalOverallSignalImportanceCalculator - ERROR - No HyperOpt results found at '
+                 f'\'{last_result_path}\'... Please provide the .fthypt file to stream with -fr')
+
+    with open(last_result_path, 'r') as file_object:
+        return hyperopt_results_directory + '/' + json.load(file_object)['latest_hyperopt']
+
+
+def get_epoch_weights(epoch, spaces, mgm_trends, weighted_signal_names, precision_used):
+    # Also include the weights of the spaces that weren't optimized
+    params = dict(epoch['params_dict'])
+    for space in spaces:
+        params.update(epoch.get('params_not_optimized', {}).get(space, {}))
+
+    # Spaces can hold a different amount of signals, the signal axis of the shorter ones is padded with zeros
+    weights = np.zeros((len(spaces), len(mgm_trends) + 1, max(len(names) for names in weighted_signal_names)))
+    for space_index, space in enumerate(spaces):
+        for trend_index, trend in enumerate(mgm_trends):
+            for signal_index, signal in enumerate(weighted_signal_names[space_index]):
+                weights[space_index, trend_index, signal_index] = params[f'{space}_{trend}_trend_{signal}_weight']
+
+    # The last 'trend' holds the average over all trends
+    weights[:, -1] = weights[:, :-1].mean(axis=1)
+    return weights / precision_used
+
+
+def stream_fthypt_signal_statistics(fthypt_file, spaces, mgm_trends, weighted_signal_names, precision_used,
+                                    top_n_epochs=None):
+    """
+    Streams a .fthypt file line by line, accumulating the weight statistics of each (space, trend, signal) in numpy
+    accumulators, so memory stays constant no matter how large the HyperOpt results file is.
+    Epochs get loss-weighted by their negated loss (Epochs with a loss of 0 or worse don't count there).
+    When using the top N epochs only a heap of the N best weight arrays is kept in memory.
+    """
+    epoch_count = 0
+    weight_sum = weight_squared_sum = loss_weighted_sum = None
+    loss_weight_sum = 0
+    top_epochs = []
+
+    def accumulate(loss, weights):
+        nonlocal epoch_count, weight_sum, weight_squared_sum, loss_weighted_sum, loss_weight_sum
+        if weight_sum is None:
+            weight_sum, weight_squared_sum, loss_weighted_sum = \
+                np.zeros_like(weights), np.zeros_like(weights), np.zeros_like(weights)
+
+        loss_weight = max(-loss, 0)
+        epoch_count += 1
+        weight_sum += weights
+        weight_squared_sum += weights ** 2
+        loss_weighted_sum += weights * loss_weight
+        loss_weight_sum += loss_weight
+
+    with open(fthypt_file, 'r') as file_object:
+        for line_number, line in enumerate(file_object):
+            if line.strip() == '':
+                continue
+
+            epoch = json.loads(line)
+            weights = get_epoch_weights(epoch, spaces, mgm_trends, weighted_signal_names, precision_used)
+            if top_n_epochs is None:
+                accumulate(epoch['loss'], weights)
+            elif len(top_epochs) < top_n_epochs:
+                heapq.heappush(top_epochs, (-epoch['loss'], line_number, weights))
+            elif -epoch['loss'] > top_epochs[0][0]:
+                heapq.heapreplace(top_epochs, (-epoch['loss'], line_number, weights))
+
+    for negated_loss, _, weights in top_epochs:
+        accumulate(-negated_loss, weights)
+
+    if epoch_count == 0:
+        sys.exit(f'TotalOverallSignalImportanceCalculator - ERROR - No epochs found inside \'{fthypt_file}\'...')
+
+    mean = weight_sum / epoch_count
+    return {
+        'epochs': epoch_count,
+        'mean': mean,
+        'std': np.sqrt(np.maximum(weight_squared_sum / epoch_count - mean ** 2, 0)),
+        'loss_weighted': loss_weighted_sum / loss_weight_sum if loss_weight_sum > 0 else mean
+    }
+
+
+def print_streamed_signal_header():
+    print(full_signal_format.format('', 'avg', 'down', 'side', 'up'))
+
+
+def print_streamed_signal_statistics_header():
+    print(full_signal_format.format('', '', 'avg', 'std', 'lw'))
+
+
+def print_streamed_signal(signal, space_index, signal_index, statistics, trend_count):
+    print(full_signal_format.format(
+        f'{str(signal)}:', f'{str(round(statistics["mean"][space_index, trend_count, signal_index], 2))}%',
+        *[str(round(statistics['mean'][space_index, trend_index, signal_index], 2)) + '%'
+          for trend_index in range(trend_count)]))
+
+
+def print_streamed_signal_statistics(signal, space_index, signal_index, statistics, trend_count):
+    print(full_signal_format.format(
+        f'{str(signal)}:', '', *[str(round(statistics[statistic][space_index, trend_count, signal_index], 2)) + '%'
+                                 for statistic in ['mean', 'std', 'loss_weighted']]))
+
+
 def print_buy_sell_params(calculator_data):
     print('')
     print('# Buy hyperspace params:')
@@ -224,6 +352,115 @@ def print_buy_sell_params(calculator_data):
           replace('\"', '\'').replace('true', 'True').replace('false', 'False').replace('.0', ''))
 
 
+def calculate_total_overall_weights(buy_params, sell_params, spaces, mgm_trends, weighted_buy_signal_names,
+                                    weighted_sell_signal_names, combined_weighted_signal_names):
+    total_overall_buy_weights = {}
+    total_overall_sell_weights = {}
+    total_overall_weights = {}
+    avg_trend_weights = {}
+
+    # Calculate the total overall buy/sell weights
+    for space in spaces:
+        indicator_names = weighted_buy_signal_names if space == 'buy' else weighted_sell_signal_names
+        params = buy_params if space == 'buy' else sell_params
+
+        for indicator in indicator_names:
+            weight = 0
+
+            for trend in mgm_trends:
+                dictionary_key = f'{space}_{trend}_trend_{indicator}_weight'
+                weight += int(params[dictionary_key])
+
+            if space == 'buy':
+                total_overall_buy_weights[indicator] = weight / len(mgm_trends)
+            else:
+                total_overall_sell_weights[indicator] = weight / len(mgm_trends)
+
+    # Calculate the total overall combined weights
+    for combined_indicator in combined_weighted_signal_names.keys():
+        indicators = combined_weighted_signal_names[combined_indicator]
+
+        for trend in mgm_trends:
+            avg_weight = (int(buy_params[f'buy_{trend}_trend_{indicators[0]}_weight']) +
+                          int(sell_params[f'sell_{trend}_trend_{indicators[-1]}_weight'])) / 2
+            avg_trend_weights[f'avg_{trend}_trend_{combined_indicator}_weight'] = avg_weight
+
+        total_overall_weights[combined_indicator] = \
+            (total_overall_buy_weights[indicators[0]] + total_overall_sell_weights[indicators[-1]]) / 2
+
+    return total_overall_buy_weights, total_overall_sell_weights, total_overall_weights, avg_trend_weights
+
+
+def calculate_batch_signal_importance(batch_job):
+    """
+    Calculates the signal importance of 1 'mgm-config-hyperopt.json' file, ran inside the batch worker processes
+    :return: Dictionary containing 1 row of the comparison table, or None when the file can't be used
+    """
+    mgm_config_hyperopt_path, precision_used, spaces, mgm_trends, weighted_buy_signal_names, \
+        weighted_sell_signal_names, combined_weighted_signal_names = batch_job
+
+    try:
+        with open(mgm_config_hyperopt_path, 'r') as file_object:
+            hyperopt_params = json.load(file_object)['params']
+
+        space_params = {'buy': {}, 'sell': {}}
+        for space in spaces:
+            indicator_names = weighted_buy_signal_names if space == 'buy' else weighted_sell_signal_names
+            for trend in mgm_trends:
+                for indicator in indicator_names:
+                    dictionary_key = f'{space}_{trend}_trend_{indicator}_weight'
+                    space_params[space][dictionary_key] = hyperopt_params[dictionary_key] / precision_used
+    except (KeyError, ValueError) as error:
+        print(f'TotalOverallSignalImportanceCalculator - WARNING - Skipping \'{mgm_config_hyperopt_path}\', it can\'t '
+              f'be used: {repr(error)}', file=sys.stderr)
+        return None
+
+    total_overall_buy_weights, total_overall_sell_weights, total_overall_weights, _ = \
+        calculate_total_overall_weights(space_params['buy'], space_params['sell'], spaces, mgm_trends,
+                                        weighted_buy_signal_names, weighted_sell_signal_names,
+                                        combined_weighted_signal_names)
+
+    return {'run': mgm_config_hyperopt_path,
+            **{f'overall_{signal}': importance for signal, importance in total_overall_weights.items()},
+            **{f'buy_{signal}': importance for signal, importance in total_overall_buy_weights.items()},
+            **{f'sell_{signal}': importance for signal, importance in total_overall_sell_weights.items()}}
+
+
+def batch_signal_importance(args, spaces, mgm_trends, weighted_buy_signal_names, weighted_sell_signal_names,
+                            combined_weighted_signal_names):
+    if os.path.isdir(args.batch):
+        mgm_config_hyperopt_paths = glob.glob(os.path.join(args.batch, '**', 'mgm-config-hyperopt*.json'),
+                                              recursive=True)
+    else:
+        mgm_config_hyperopt_paths = glob.glob(args.batch, recursive=True)
+
+    if len(mgm_config_hyperopt_paths) == 0:
+        sys.exit(f'TotalOverallSignalImportanceCalculator - ERROR - No mgm-config-hyperopt*.json files found for '
+                 f'\'{args.batch}\'...')
+
+    batch_jobs = [(mgm_config_hyperopt_path, args.precision_used, spaces, mgm_trends, weighted_buy_signal_names,
+                   weighted_sell_signal_names, combined_weighted_signal_names)
+                  for mgm_config_hyperopt_path in sorted(mgm_config_hyperopt_paths)]
+    with Pool(processes=min(args.job_workers, len(batch_jobs))) as pool:
+        rows = [row for row in pool.map(calculate_batch_signal_importance, batch_jobs) if row is not None]
+
+    if len(rows) == 0:
+        sys.exit(f'TotalOverallSignalImportanceCalculator - ERROR - None of the mgm-config-hyperopt*.json files found '
+                 f'for \'{args.batch}\' could be used...')
+
+    comparison_table = pd.DataFrame(rows)
+    if args.batch_file.endswith('.parquet'):
+        try:
+            comparison_table.to_parquet(args.batch_file, index=False)
+        except ImportError as error:
+            sys.exit(f'TotalOverallSignalImportanceCalculator - ERROR - Saving as parquet requires pyarrow or '
+                     f'fastparquet to be installed: {error}')
+    else:
+        comparison_table.to_csv(args.batch_file, index=False)
+
+    print(f'Compared the signal importance of {len(rows)} HyperOpt results in: {args.batch_file}')
+
+
 def main():
     # Initialize the Total Overall Signal Importance Calculator
     calculator_data = TotalOverallSignalImportanceCalculator
@@ -238,12 +475,6 @@ def main():
     combined_weighted_signal_names = initialize_combined_weighted_signal_names()
     unclogger_check_names = initialize_unclogger_check_names()
 
-    # Initialize empty dictionaries which will contain data for the report
-    total_overall_buy_weights = {}
-    total_overall_sell_weights = {}
-    total_overall_weights = {}
-    avg_trend_weights = {}
-
     # Load the MoniGoMani settings
     mgm_config_path = os.getcwd() + '/user_data/' + calculator_data.mgm_config_name
     if os.path.isfile(mgm_config_path) is True:
@@ -257,6 +488,56 @@ def main():
                  f'({calculator_data.mgm_config_name}) can\'t be found at: \'{mgm_config_path}\'... Please provide the '
                  f'correct file and/or alter "mgm_config_name" in "Total-Overall-Signal-Importance-Calculator.py"')
 
+    # Compare the signal importance of many HyperOpt results at once
+    if args.batch is not None:
+        batch_signal_importance(args, spaces, mgm_trends, weighted_buy_signal_names, weighted_sell_signal_names,
+                                combined_weighted_signal_names)
+        return
+
+    # Stream all epochs of a HyperOpt results file instead of only reading the best result
+    if args.fthypt_results is not None:
+        fthypt_file = get_latest_fthypt_file() if args.fthypt_results == 'latest' else args.fthypt_results
+        if os.path.isfile(fthypt_file) is False:
+            sys.exit(f'TotalOverallSignalImportanceCalculator - ERROR - The HyperOpt results file \'{fthypt_file}\' '
+                     f'can\'t be found...')
+        try:
+            statistics = stream_fthypt_signal_statistics(
+                fthypt_file, spaces, mgm_trends, [weighted_buy_signal_names, weighted_sell_signal_names],
+                args.precision_used, args.top_n_epochs)
+        except KeyError as missing_setting:
+            sys.exit(f'TotalOverallSignalImportanceCalculator - ERROR - The epochs inside \'{fthypt_file}\' are '
+                     f'missing some parameters. {missing_setting} has been detected as missing...')
+
+        # To output our prints to a file redirect the stdout
+        original_stdout = sys.stdout
+        f = {}
+
+        if args.output_to_file:
+            f = open(args.create_file, 'w')
+            sys.stdout = FileAndConsoleLogger(sys.stdout, f)
+
+        print_section_header('MoniGoMani - Signal Importance Report', False, True)
+        print_section_header(signal_format.format('Stake currency:', mgm_config_json_data['stake_currency']))
+        print_section_header(signal_format.format('Epochs used:', str(statistics['epochs'])))
+        print(f'Streamed from: {fthypt_file}')
+
+        for space_index, space in enumerate(spaces):
+            indicator_names = weighted_buy_signal_names if space == 'buy' else weighted_sell_signal_names
+            print_section_header(f'Total Overall {space.capitalize()} Signal Importance:')
+            print_streamed_signal_header()
+            for signal_index, signal in enumerate(indicator_names):
+                print_streamed_signal(signal, space_index, signal_index, statistics, len(mgm_trends))
+
+            print_section_header(f'{space.capitalize()} Signal Importance Statistics (avg / std / loss-weighted):')
+            print_streamed_signal_statistics_header()
+            for signal_index, signal in enumerate(indicator_names):
+                print_streamed_signal_statistics(signal, space_index, signal_index, statistics, len(mgm_trends))
+
+        if args.output_to_file:
+            f.close()
+            sys.stdout = original_stdout
+        return
+
     # If results from a previous HyperOpt Run are found then continue the next HyperOpt Run upon them
     mgm_config_hyperopt_path = os.getcwd() + '/user_data/' + calculator_data.mgm_config_hyperopt_name
     if os.path.isfile(mgm_config_hyperopt_path) is True:
@@ -313,34 +594,11 @@ def main():
             if isinstance(params[p], (int, float, complex)) and not isinstance(params[p], bool):
                 params[p] /= args.precision_used
 
-    # Calculate the total overall buy/sell weights
-    for space in spaces:
-        indicator_names = weighted_buy_signal_names if space == 'buy' else weighted_sell_signal_names
-        params = calculator_data.buy_params if space == 'buy' else calculator_data.sell_params
-
-        for indicator in indicator_names:
-            weight = 0
-
-            for trend in mgm_trends:
-                dictionary_key = f'{space}_{trend}_trend_{indicator}_weight'
-                weight += int(params[dictionary_key])
-
-            if space == 'buy':
-                total_overall_buy_weights[indicator] = weight / len(mgm_trends)
-            else:
-                total_overall_sell_weights[indicator] = weight / len(mgm_trends)
-
-    # Calculate the total overall combined weights
-    for combined_indicator in combined_weighted_signal_names.keys():
-        indicators = combined_weighted_signal_names[combined_indicator]
-
-        for trend in mgm_trends:
-            avg_weight = (int(calculator_data.buy_params[f'buy_{trend}_trend_{indicators[0]}_weight']) +
-                          int(calculator_data.sell_params[f'sell_{trend}_trend_{indicators[-1]}_weight'])) / 2
-            avg_trend_weights[f'avg_{trend}_trend_{combined_indicator}_weight'] = avg_weight
-
-        total_overall_weights[combined_indicator] = \
-            (total_overall_buy_weights[indicators[0]] + total_overall_sell_weights[indicators[-1]]) / 2
+    # Calculate the total overall buy/sell/combined weights
+    total_overall_buy_weights, total_overall_sell_weights, total_overall_weights, avg_trend_weights = \
+        calculate_total_overall_weights(calculator_data.buy_params, calculator_data.sell_params, spaces, mgm_trends,
+                                        weighted_buy_signal_names, weighted_sell_signal_names,
+                                        combined_weighted_signal_names)
 
     # To output our prints to a file redirect the stdout
     original_stdout = sys.stdout
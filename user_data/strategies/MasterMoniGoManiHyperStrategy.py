@@ -1,19 +1,29 @@
 # --- ↓ Do not remove these libs ↓ -------------------------------------------------------------------------------------
+import atexit
+import hashlib
+import inspect
 import json
 import logging
+import bisect
+import math
 import os
 import sys
+import threading
+import time
+import weakref
 from abc import ABC
-from datetime import datetime, timedelta
-from functools import reduce
-from typing import Any, List
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache, reduce, wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
 
 import numpy as np  # noqa
 import pandas as pd  # noqa
 import talib.abstract as ta
 from numpy import timedelta64
 from pandas import DataFrame
-from scipy.interpolate import interp1d
+from scipy.signal import lfilter
 
 from freqtrade.exchange import timeframe_to_prev_date
 from freqtrade.optimize.space import Categorical, Dimension, SKDecimal
@@ -62,9 +72,33 @@ class MasterMoniGoManiHyperStrategy(IStrategy, ABC):
     #                                            END OF CONFIG NAMES SECTION                                           #
     ####################################################################################################################
 
-    # MGM trend names
+    # MGM space & trend names
+    mgm_spaces = ['buy', 'sell']
     mgm_trends = ['downwards', 'sideways', 'upwards']
 
+    # Paired crossover results of each (alive) DataFrame, shared between the buy & sell signals
+    _crossover_cache = {}
+
+    # Signals with less than 1 event per this amount of candles are handled as sparse events by '_rolling_any'
+    sparse_signal_candles_per_event = 500
+
+    # Callbacks timed when using performance profiling & the resolution of their duration histograms
+    profiled_callbacks = ['_populate_indicators', 'do_populate_indicators', '_populate_trend', 'custom_stoploss',
+                          'custom_sell', 'mgm_logger']
+    performance_profile_buckets_per_octave = 8
+
+    # Type & help text of each metric served by the metrics exporter (in the Prometheus text format)
+    metric_descriptions = {
+        'mgm_analysis_seconds': ('gauge', 'Duration of the last analysis of a pair, per analysis stage'),
+        'mgm_analysis_seconds_total': ('counter', 'Total time spent analyzing a pair, per analysis stage'),
+        'mgm_analyses_total': ('counter', 'Amount of analyses of a pair, per analysis stage'),
+        'mgm_signals_fired_total': ('counter', 'Buy/Sell signals fired on the last candle, per trend'),
+        'mgm_total_signal_strength': ('gauge', 'Current total_buy/sell_signal_strength of a pair'),
+        'mgm_unclogger_decisions_total': ('counter', 'Decisions taken by the Open Trade Unclogger'),
+        'mgm_unclogger_check_rejects_total': ('counter', 'Unclogger runs stopped by each of its checks'),
+        'mgm_custom_info_open_trades': ('gauge', 'Amount of open trades stored in custom_info')
+    }
+
     # Initialize empty buy/sell_params dictionaries and initial (trailing)stoploss values
     buy_params = {}
     sell_params = {}
@@ -119,6 +153,13 @@ class MasterMoniGoManiHyperStrategy(IStrategy, ABC):
         trailing_stop_positive_offset = mgm_config['default_stub_values']['trailing_stop_positive_offset']
         trailing_only_offset_is_reached = mgm_config['default_stub_values']['trailing_only_offset_is_reached']
         debuggable_weighted_signal_dataframe = mgm_config['debuggable_weighted_signal_dataframe']
+        debuggable_weighted_signal_store = mgm_config['debuggable_weighted_signal_store']
+        shared_signal_matrices = mgm_config['shared_signal_matrices']
+        dtype_policy = mgm_config['dtype_policy']
+        performance_profiling = mgm_config['performance_profiling']
+        metrics_exporter = mgm_config['metrics_exporter']
+        memory_report = mgm_config['memory_report']
+        indicator_cache = mgm_config['indicator_cache']
         use_mgm_logging = mgm_config['use_mgm_logging']
         mgm_log_levels_enabled = mgm_config['mgm_log_levels_enabled']
     except KeyError as missing_setting:
@@ -180,23 +221,46 @@ class MasterMoniGoManiHyperStrategy(IStrategy, ABC):
     # Initialize some parameters which will be automatically configured/used by MoniGoMani
     use_custom_stoploss = True  # Leave this enabled (Needed for open_trade custom_information_storage)
     is_dry_live_run_detected = True  # Class level runmode detection, Gets set automatically
+    is_hyperopt_run_detected = False  # Class level runmode detection, Gets set automatically
     informative_timeframe = timeframe  # Gets set automatically
     timeframe_multiplier = None  # Gets set automatically
+    parameter_snapshot = None  # Gets set automatically, refreshed once per HyperOpt epoch
+    attached_signal_matrices = None  # Gets set automatically when using shared signal matrices
+    debug_signal_ring = None  # Gets set automatically when using the in-memory debuggable weighted signal store
+    roi_table_keys = None  # Gets set automatically, sorted keys of the current ROI-Table
+    performance_profile = None  # Gets set automatically when using performance profiling
+    metrics = None  # Gets set automatically when using the metrics exporter (Dry/Live-Runs only)
+    # Suggested values shown when a dtype policy setting is invalid
+    dtype_policy_defaults = {'indicators': 'float32', 'signals': 'uint8', 'weights': 'int16', 'trend': 'int8'}
+    # Process-level metrics exporter server & threads, re-pointed at the newest strategy instance (e.g. after a reload)
+    metrics_exporter_runtime = {'strategy': None, 'server': None, 'address': None, 'textfile_thread': None}
+    memory_reports = None  # Gets set automatically when using the memory report
 
     class HyperOpt:
         # Generate a Custom Long Continuous ROI-Table with less gaps in it
         @staticmethod
         def generate_roi_table(params):
-            step = MasterMoniGoManiHyperStrategy.roi_table_step_size
-            minimal_roi = {0: params['roi_p1'] + params['roi_p2'] + params['roi_p3'],
-                           params['roi_t3']: params['roi_p1'] + params['roi_p2'],
-                           params['roi_t3'] + params['roi_t2']: params['roi_p1'],
-                           params['roi_t3'] + params['roi_t2'] + params['roi_t1']: 0}
-
-            max_value = max(map(int, minimal_roi.keys()))
-            f = interp1d(list(map(int, minimal_roi.keys())), list(minimal_roi.values()))
-            x = list(range(0, max_value, step))
-            y = list(map(float, map(f, x)))
+            # Copy the memoized ROI-Table, so it can't be altered
+            return dict(MasterMoniGoManiHyperStrategy.HyperOpt.generate_memoized_roi_table(
+                params['roi_p1'], params['roi_p2'], params['roi_p3'], params['roi_t1'], params['roi_t2'],
+                params['roi_t3'], MasterMoniGoManiHyperStrategy.roi_table_step_size))
+
+        @staticmethod
+        @lru_cache(maxsize=1024)
+        def generate_memoized_roi_table(roi_p1: float, roi_p2: float, roi_p3: float, roi_t1: int, roi_t2: int,
+                                        roi_t3: int, step: int) -> dict:
+            """
+            Expands the 4 compact ROI breakpoints into a Long Continuous ROI-Table (one entry per 'step' minutes) by
+            linear interpolation. Memoized per parameter tuple, since HyperOpt often revisits the same ROI values.
+            """
+            minimal_roi = {0: roi_p1 + roi_p2 + roi_p3,
+                           roi_t3: roi_p1 + roi_p2,
+                           roi_t3 + roi_t2: roi_p1,
+                           roi_t3 + roi_t2 + roi_t1: 0}
+
+            roi_minutes, roi_values = MasterMoniGoManiHyperStrategy.get_roi_breakpoints(minimal_roi)
+            x = list(range(0, int(roi_minutes[-1]), step))
+            y = np.interp(x, roi_minutes, roi_values).tolist()
             if y[-1] != 0:
                 x.append(x[-1] + step)
                 y.append(0)
@@ -266,6 +330,11 @@ class MasterMoniGoManiHyperStrategy(IStrategy, ABC):
                 raise SystemExit(f'MoniGoManiHyperStrategy - ERROR - TimeFrame-Zoom - "timeframe" must be bigger than '
                                  f'"backtest_timeframe"')
             self.startup_candle_count *= self.timeframe_multiplier
+            self.is_hyperopt_run_detected = RunMode(config['runmode']) == RunMode.HYPEROPT
+            if self.is_hyperopt_run_detected is True:
+                # Identifies this HyperOpt run in the MGMParetoLoss objective store (Opaque, it doesn't match the name
+                # of the '.fthypt' results file. Epochs get linked to those through their trades fingerprint instead)
+                config.setdefault('mgm_run_id', f'{datetime.now().strftime("%Y-%m-%d_%H-%M-%S")}-{os.getpid()}')
 
         else:
             if os.path.isfile(self.mgm_config_hyperopt_path) is False:
@@ -280,6 +349,15 @@ class MasterMoniGoManiHyperStrategy(IStrategy, ABC):
 
         super().__init__(config)
 
+        if self.dtype_policy['enabled'] is True:
+            self._validate_dtype_policy()
+
+        if self.performance_profiling['enabled'] is True:
+            self._enable_performance_profiling()
+
+        if (self.is_dry_live_run_detected is True) and (self.metrics_exporter['enabled'] is True):
+            self._enable_metrics_exporter()
+
     def _populate_core_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
         Adds the core indicators used to define trends to the strategy engine.
@@ -339,32 +417,139 @@ class MasterMoniGoManiHyperStrategy(IStrategy, ABC):
             first_informative = dataframe["date"].min().floor("H")
             informative = informative[informative["date"] >= first_informative]
 
-            # Populate core trend indicators
-            informative = self._populate_core_trend(informative, metadata)
-
-            # Populate indicators at a larger timeframe
-            informative = self.do_populate_indicators(informative.copy(), metadata)
+            # Populate core trend indicators & indicators at a larger timeframe (or take them from the indicator cache)
+            cached_informative = self._get_cached_indicators(informative, metadata)
+            if cached_informative is None:
+                informative = self._populate_core_trend(informative, metadata)
+                informative = self.do_populate_indicators(informative.copy(), metadata)
+                self._store_cached_indicators(informative, metadata)
+            else:
+                informative = cached_informative
 
             # Merge indicators back in with, filling in missing values.
-            dataframe = \
-                merge_informative_pair(dataframe, informative, self.timeframe, self.informative_timeframe, ffill=True)
-
-            # Rename columns, since merge_informative_pair adds `_<timeframe>` to the end of each name.
-            # Skip over date etc..
-            skip_columns = [(s + "_" + self.informative_timeframe) for s in
-                            ['date', 'open', 'high', 'low', 'close', 'volume']]
-            dataframe.rename(columns=lambda s: s.replace("_{}".format(self.informative_timeframe), "") if
-            (not s in skip_columns) else s, inplace=True)
+            dataframe = self._merge_informative_dataframe(dataframe, informative)
 
         # Compute indicator data normally during Dry & Live Running or when not using TimeFrame-Zoom
         else:
             self.mgm_logger('info', timeframe_zoom,
                             f'Dry/Live-running MoniGoMani with normal timeframe ({self.timeframe} candles)')
-            # Populate core trend indicators
-            dataframe = self._populate_core_trend(dataframe, metadata)
+            # Populate core trend indicators & just populate indicators (or take them from the indicator cache)
+            cached_dataframe = self._get_cached_indicators(dataframe, metadata)
+            if cached_dataframe is None:
+                dataframe = self._populate_core_trend(dataframe, metadata)
+                dataframe = self.do_populate_indicators(dataframe, metadata)
+                self._store_cached_indicators(dataframe, metadata)
+            else:
+                dataframe = cached_dataframe
+
+        # Downcast the indicator & trend columns (before publishing, so published signals are evaluated on them)
+        if self.dtype_policy['enabled'] is True:
+            dataframe = self._apply_dtype_policy(dataframe, metadata)
+
+        # Publish the signal activation matrices once, so HyperOpt workers can attach to them read-only
+        if (self.is_dry_live_run_detected is False) and (self.shared_signal_matrices['enabled'] is True):
+            dataframe = self._publish_signal_matrices(dataframe, metadata)
+
+        return dataframe
+
+    def _get_indicator_cache_path(self, pair: str, first_date: datetime) -> str:
+        """
+        Returns the path of the indicator cache of a pair. The file name contains the date of the first candle, since
+        indicators with a long memory (like EMAs) or cumulative ones (like VWAP) depend on the history they're computed
+        upon, and a fingerprint of the source of all MGM strategy classes (the Master & its subclasses), so changing the
+        indicators, the helpers computing them or the indicator settings of a subclass never re-uses stale indicators
+        :param pair: Pair of which the indicators are cached
+        :param first_date: Date of the first candle the indicators are computed upon
+        :return: Path to the cached indicators
+        """
+
+        return os.path.join(self._get_pair_directory(self.indicator_cache['directory'], pair),
+                            f'{self.informative_timeframe}-{first_date:%Y%m%d%H%M}-'
+                            f'{self._get_source_fingerprint()}.pkl')
+
+    def _get_source_fingerprint(self) -> str:
+        """
+        :return: Fingerprint of the source of all MGM strategy classes (the Master & its subclasses)
+        """
+
+        source_code = ''.join(inspect.getsource(cls) for cls in type(self).__mro__
+                              if issubclass(cls, MasterMoniGoManiHyperStrategy))
+        return hashlib.sha1(source_code.encode('utf-8')).hexdigest()[:12]
+
+    def _get_cached_indicators(self, dataframe: DataFrame, metadata: dict) -> Any:
+        """
+        Indicator Cache:
+        ----------------
+        Takes the indicators of a dataframe from the indicator cache, when the cache starts at the same candle, covers
+        all of its candles and holds the exact same candle data (Only used while BackTesting/HyperOpting, when the
+        indicator cache is enabled). Cached indicators are computed upon the exact same history as a fresh computation,
+        so they're identical to it.
+        :param dataframe: Dataframe with data from the exchange
+        :param metadata: Additional information, like the currently traded pair
+        :return: Dataframe with all core trend indicators & indicators, or None when the cache can't be used
+        """
+
+        if (self.is_dry_live_run_detected is True) or (self.indicator_cache['enabled'] is False) or \
+                (len(dataframe) == 0):
+            return None
+
+        indicator_cache_path = self._get_indicator_cache_path(metadata['pair'], dataframe['date'].iloc[0])
+        if os.path.isfile(indicator_cache_path) is False:
+            return None
+
+        cached_dataframe = pd.read_pickle(indicator_cache_path).iloc[:len(dataframe)]
+        if (len(cached_dataframe) != len(dataframe)) or \
+                any(np.array_equal(cached_dataframe[column].to_numpy(), dataframe[column].to_numpy()) is False
+                    for column in ['date', 'open', 'high', 'low', 'close', 'volume']):
+            return None
+
+        self.mgm_logger('info', 'Indicator Cache', f'Using the cached indicators of pair ({metadata["pair"]})')
+        return cached_dataframe.set_axis(dataframe.index, axis=0)
+
+    def _store_cached_indicators(self, dataframe: DataFrame, metadata: dict) -> None:
+        """
+        Stores the indicators of a dataframe in the indicator cache, unless the cache starting at the same candle
+        already covers all of its candles
+        (Only used while BackTesting/HyperOpting, when the indicator cache is enabled)
+        :param dataframe: Dataframe populated with all core trend indicators & indicators
+        :param metadata: Additional information, like the currently traded pair
+        """
+
+        if (self.is_dry_live_run_detected is True) or (self.indicator_cache['enabled'] is False) or \
+                (len(dataframe) == 0):
+            return
+
+        indicator_cache_path = self._get_indicator_cache_path(metadata['pair'], dataframe['date'].iloc[0])
+        if (os.path.isfile(indicator_cache_path) is True) and \
+                (pd.read_pickle(indicator_cache_path)['date'].iloc[-1] >= dataframe['date'].iloc[-1]):
+            return
+
+        # Write to a temporary file first, so parallel runs never read a half written cache
+        os.makedirs(os.path.dirname(indicator_cache_path), exist_ok=True)
+        temporary_path = f'{indicator_cache_path}.{os.getpid()}.tmp'
+        dataframe.to_pickle(temporary_path)
+        os.replace(temporary_path, indicator_cache_path)
+        self.mgm_logger('info', 'Indicator Cache', f'Cached the indicators of pair ({metadata["pair"]}) to: '
+                                                   f'{indicator_cache_path}')
+
+    def _merge_informative_dataframe(self, dataframe: DataFrame, informative: DataFrame) -> DataFrame:
+        """
+        Merges the indicators computed upon the 'informative_timeframe' (1h candles) back into the zoomed
+        'backtest_timeframe' (5m or 1m candles) dataframe, filling in missing values.
+
+        :param dataframe: Dataframe with the zoomed 'backtest_timeframe' candles
+        :param informative: Dataframe with the 'informative_timeframe' candles & their indicators
+        :return: The zoomed dataframe with all indicators merged in
+        """
+        dataframe = \
+            merge_informative_pair(dataframe, informative, self.timeframe, self.informative_timeframe, ffill=True)
 
-            # Just populate indicators.
-            dataframe = self.do_populate_indicators(dataframe, metadata)
+        # Rename columns, since merge_informative_pair adds `_<timeframe>` to the end of each name.
+        # Skip over date etc..
+        skip_columns = [(s + "_" + self.informative_timeframe) for s in
+                        ['date', 'open', 'high', 'low', 'close', 'volume']]
+        dataframe.rename(columns=lambda s: s.replace("_{}".format(self.informative_timeframe), "") if
+        (not s in skip_columns) else s, inplace=True)
 
         return dataframe
 
@@ -520,6 +705,7 @@ class MasterMoniGoManiHyperStrategy(IStrategy, ABC):
                                     f'Open trades ({str(len(self.custom_info["open_trades"]))}) in custom_storage do '
                                     f'not match yet with trades in live open trades ({str(len(all_open_trades))}) '
                                     f'aborting unclogger for now!')
+                    self._count_unclogger_reject('custom_info_outdated')
                 else:
                     # Open Trade Unclogger
                     # --------------------
@@ -544,6 +730,7 @@ class MasterMoniGoManiHyperStrategy(IStrategy, ABC):
                             self.sell___unclogger_minimal_losing_trades_open.value / self.precision):
                         self.mgm_logger('debug', open_trade_unclogger,
                                         f'No unclogging needed! Not enough losing trades currently open!')
+                        self._count_unclogger_reject('minimal_losing_trades_open')
                     else:
                         self.mgm_logger('debug', open_trade_unclogger,
                                         f'Enough losing trades detected! Proceeding to the next check!')
@@ -553,6 +740,7 @@ class MasterMoniGoManiHyperStrategy(IStrategy, ABC):
                             self.mgm_logger('debug', open_trade_unclogger,
                                             f'No unclogging needed! Currently checked pair ({pair}) is not making a '
                                             f'loss at this point in time!')
+                            self._count_unclogger_reject('pair_not_losing')
                         else:
                             self.mgm_logger('debug', open_trade_unclogger,
                                             f'Currently checked pair ({pair}) is losing! Proceeding to the next check!')
@@ -570,6 +758,7 @@ class MasterMoniGoManiHyperStrategy(IStrategy, ABC):
                                 self.mgm_logger('debug', open_trade_unclogger,
                                                 f'No unclogging needed! Currently checked pair ({pair}) has not been '
                                                 f'open been open for long enough!')
+                                self._count_unclogger_reject('minimal_losing_trade_duration')
                             else:
                                 self.mgm_logger('debug', open_trade_unclogger,
                                                 f'Trade has been open for long enough! Proceeding to the next check!')
@@ -584,6 +773,7 @@ class MasterMoniGoManiHyperStrategy(IStrategy, ABC):
                                     self.mgm_logger('debug', open_trade_unclogger,
                                                     f'No unclogging needed! Percentage of open trades losing needed '
                                                     f'has not been satisfied!')
+                                    self._count_unclogger_reject('open_trades_losing_percentage')
                                 else:
                                     self.mgm_logger('debug', open_trade_unclogger,
                                                     f'Percentage of open trades losing needed has been satisfied! '
@@ -641,6 +831,7 @@ class MasterMoniGoManiHyperStrategy(IStrategy, ABC):
                                     if len(stored_trend_dataframe) < round(temp / self.precision):
                                         self.mgm_logger('debug', open_trade_unclogger,
                                                         f'No unclogging needed! Not enough trend data stored yet!')
+                                        self._count_unclogger_reject('trend_data_stored')
                                     else:
 
                                         # Print all fetched 'trend' trade data
@@ -679,15 +870,18 @@ class MasterMoniGoManiHyperStrategy(IStrategy, ABC):
                                             self.sell___unclogger_trend_lookback_candles_window_percentage_needed.value
                                         if unclogger_candles_percentage_satisfied >= round(temp / self.precision):
                                             self.mgm_logger('info', open_trade_unclogger, f'Unclogging losing trade...')
+                                            self._count_unclogger_decision('unclog')
                                             return "MGM_unclogging_losing_trade"
                                         else:
                                             self.mgm_logger('info', open_trade_unclogger,
                                                             f'No need to unclog open trade...')
+                                            self._count_unclogger_reject('trend_lookback_window_percentage')
 
             except Exception as e:
                 self.mgm_logger('error', open_trade_unclogger,
                                 f'Following error has occurred in the Open Trade Unclogger:')
                 self.mgm_logger('error', open_trade_unclogger, str(e))
+                self._count_unclogger_decision('error')
 
         return None  # By default we don't want a force sell to occur
 
@@ -718,64 +912,481 @@ class MasterMoniGoManiHyperStrategy(IStrategy, ABC):
                 logger.setLevel(logging.ERROR)
                 logger.error(code_section + ' - ' + message)
 
-    def _generate_weight_condition(self, dataframe: DataFrame, space: str) -> DataFrame:
+    def _enable_performance_profiling(self) -> None:
+        """
+        Wraps the 'profiled_callbacks' of this instance with monotonic timers. Their durations are aggregated per pair
+        into in-memory histograms, which get dumped to 'user_data/' + 'file' every 'dump_interval_minutes' & on shutdown
+        """
+
+        self.performance_profile = {}
+        self.performance_profile_started = time.monotonic()
+        self.performance_profile_last_dump = time.monotonic()
+        for callback_name in self.profiled_callbacks:
+            setattr(self, callback_name, self._profile_callback(callback_name, getattr(self, callback_name)))
+
+        atexit.register(self.dump_performance_profile)
+        self.mgm_logger('info', 'Performance Profiling', f'Timing {", ".join(self.profiled_callbacks)}')
+
+    def _profile_callback(self, callback_name: str, callback: Any) -> Any:
+        """
+        Wraps a callback with a monotonic timer
+        :param callback_name: Name under which the durations are aggregated
+        :param callback: Bound method to time
+        :return: The timed callback
+        """
+
+        @wraps(callback)
+        def profiled_callback(*args, **kwargs):
+            start_time = time.perf_counter_ns()
+            try:
+                return callback(*args, **kwargs)
+            finally:
+                self._record_callback_duration(callback_name, self._get_callback_pair(args, kwargs),
+                                               time.perf_counter_ns() - start_time)
+
+        return profiled_callback
+
+    @staticmethod
+    def _get_callback_pair(args: tuple, kwargs: dict) -> str:
+        """
+        Finds the pair a callback got called for, inside its 'metadata' or 'pair' argument
+        :return: The pair, or 'all' for callbacks which aren't called per pair (like mgm_logger)
+        """
+
+        metadata = kwargs.get('metadata', next((arg for arg in args if isinstance(arg, dict) and 'pair' in arg), None))
+        if metadata is not None:
+            return str(metadata['pair'])
+        if 'pair' in kwargs:
+            return str(kwargs['pair'])
+        if (len(args) > 0) and isinstance(args[0], str) and ('/' in args[0]):
+            return args[0]
+        return 'all'
+
+    def _record_callback_duration(self, callback_name: str, pair: str, duration: int) -> None:
+        """
+        Adds a duration to the histogram of a (callback, pair). Buckets are logarithmic, so every histogram stays small
+        while its percentiles are accurate to a fraction of an octave
+        :param callback_name: Name of the timed callback
+        :param pair: Pair the callback got called for
+        :param duration: Duration in nanoseconds
+        """
+
+        histogram = self.performance_profile.get((callback_name, pair))
+        if histogram is None:
+            histogram = self.performance_profile[(callback_name, pair)] = \
+                {'count': 0, 'total': 0, 'max': 0, 'buckets': {}}
+
+        histogram['count'] += 1
+        histogram['total'] += duration
+        histogram['max'] = max(histogram['max'], duration)
+        bucket = int(math.log2(max(duration, 1)) * self.performance_profile_buckets_per_octave)
+        histogram['buckets'][bucket] = histogram['buckets'].get(bucket, 0) + 1
+
+        if time.monotonic() - self.performance_profile_last_dump >= \
+                self.performance_profiling['dump_interval_minutes'] * 60:
+            self.dump_performance_profile()
+
+    def _get_histogram_percentile(self, buckets: dict, count: int, percentile: float) -> float:
+        """
+        :return: The (approximate) percentile of a duration histogram, in milliseconds
+        """
+
+        needed = percentile / 100 * count
+        seen = 0
+        for bucket in sorted(buckets):
+            seen += buckets[bucket]
+            if seen >= needed:
+                # Geometric middle of the bucket
+                return 2 ** ((bucket + 0.5) / self.performance_profile_buckets_per_octave) / 1e6
+        return 0.0
+
+    def dump_performance_profile(self) -> None:
+        """
+        Dumps the counts, totals & p50/p95/p99 durations of each profiled callback per pair (and over all pairs) to
+        'user_data/' + 'performance_profiling' > 'file'
+        """
+
+        if self.performance_profile is None:
+            return
+
+        # Combine the histograms of all pairs into an 'all' histogram per callback
+        callbacks = {}
+        for (callback_name, pair), histogram in list(self.performance_profile.items()):
+            pairs = callbacks.setdefault(callback_name, {'all': {'count': 0, 'total': 0, 'max': 0, 'buckets': {}}})
+            if pair != 'all':
+                pairs[pair] = histogram
+
+            combined = pairs['all']
+            combined['count'] += histogram['count']
+            combined['total'] += histogram['total']
+            combined['max'] = max(combined['max'], histogram['max'])
+            for bucket, bucket_count in histogram['buckets'].items():
+                combined['buckets'][bucket] = combined['buckets'].get(bucket, 0) + bucket_count
+
+        profile = {
+            'dumped_at': datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S'),
+            'profiled_seconds': round(time.monotonic() - self.performance_profile_started, 3),
+            'callbacks': {callback_name: {pair: {
+                'count': histogram['count'],
+                'total_ms': histogram['total'] / 1e6,
+                'mean_ms': histogram['total'] / histogram['count'] / 1e6,
+                'p50_ms': self._get_histogram_percentile(histogram['buckets'], histogram['count'], 50),
+                'p95_ms': self._get_histogram_percentile(histogram['buckets'], histogram['count'], 95),
+                'p99_ms': self._get_histogram_percentile(histogram['buckets'], histogram['count'], 99),
+                'max_ms': histogram['max'] / 1e6
+            } for pair, histogram in sorted(pairs.items())} for callback_name, pairs in callbacks.items()}
+        }
+
+        # Write to a temporary file first, so a half written profile is never read
+        profile_path = os.path.join(os.getcwd(), 'user_data', self.performance_profiling['file'])
+        temporary_path = f'{profile_path}.{os.getpid()}.tmp'
+        with open(temporary_path, 'w') as file_object:
+            json.dump(profile, file_object, indent=4)
+        os.replace(temporary_path, profile_path)
+        self.performance_profile_last_dump = time.monotonic()
+
+    def _enable_metrics_exporter(self) -> None:
+        """
+        Starts collecting MGM metrics & serves them in the Prometheus text format, over HTTP on 'host':'port' and/or
+        as a 'textfile' (for the node exporter's textfile collector) re-written every 'textfile_interval_seconds'.
+
+        All metrics are updated from the bot's main thread only, with plain dictionary increments (no locks on the hot
+        path). The exporter threads only ever read copies of them.
+
+        The HTTP server & textfile thread live once per process: When the strategy gets instantiated again (e.g. by
+        Freqtrade's '/reload_config') they are re-pointed at the new instance instead of binding the port again.
+        """
+
+        self.metrics = {'counters': {}, 'gauges': {}, 'last_candles': {}}
+        self._populate_indicators = self._measure_analysis('indicators', self._populate_indicators)
+        self._populate_trend = self._measure_analysis('trend', self._populate_trend)
+
+        metrics_exporter = 'Metrics Exporter'
+        runtime = MasterMoniGoManiHyperStrategy.metrics_exporter_runtime
+        runtime['strategy'] = self
+        address = None if self.metrics_exporter['port'] is None else \
+            (self.metrics_exporter['host'], self.metrics_exporter['port'])
+        if (runtime['server'] is not None) and (runtime['address'] != address):
+            runtime['server'].shutdown()
+            runtime['server'].server_close()
+            runtime['server'] = runtime['address'] = None
+
+        if (address is not None) and (runtime['server'] is None):
+            class MetricsRequestHandler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    metrics = runtime['strategy'].render_metrics().encode('utf-8')
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                    self.send_header('Content-Length', str(len(metrics)))
+                    self.end_headers()
+                    self.wfile.write(metrics)
+
+                def log_message(self, format, *args):
+                    pass  # Keep scrapes out of the bot's log
+
+            try:
+                metrics_server = ThreadingHTTPServer(address, MetricsRequestHandler)
+            except OSError as error:
+                # Never crash the bot over its metrics
+                logger.warning(f'{metrics_exporter} - Could not serve metrics on http://{address[0]}:{address[1]}/'
+                               f'metrics: {error}')
+            else:
+                metrics_server.daemon_threads = True
+                threading.Thread(target=metrics_server.serve_forever, name='mgm-metrics-server', daemon=True).start()
+                runtime['server'], runtime['address'] = metrics_server, address
+                self.mgm_logger('info', metrics_exporter,
+                                f'Serving metrics on http://{address[0]}:{address[1]}/metrics')
+
+        if (self.metrics_exporter['textfile'] is not None) and \
+                ((runtime['textfile_thread'] is None) or (runtime['textfile_thread'].is_alive() is False)):
+            runtime['textfile_thread'] = threading.Thread(target=self._write_metrics_textfile_loop,
+                                                          name='mgm-metrics-textfile', daemon=True)
+            runtime['textfile_thread'].start()
+            self.mgm_logger('info', metrics_exporter, f'Writing metrics to {self.metrics_exporter["textfile"]}')
+
+    def _measure_analysis(self, stage: str, callback: Any) -> Any:
+        """
+        Wraps an analysis callback, to record its latency & (for the trend stage) the signals it fired
+        :param stage: Name of the analysis stage ('indicators' or 'trend')
+        :param callback: Bound method to measure
+        :return: The measured callback
+        """
+
+        @wraps(callback)
+        def measured_callback(*args, **kwargs):
+            start_time = time.perf_counter()
+            dataframe = callback(*args, **kwargs)
+            duration = time.perf_counter() - start_time
+
+            pair = self._get_callback_pair(args, kwargs)
+            space = args[0] if stage == 'trend' else None
+            labels = (('pair', pair), ('stage', stage if space is None else f'{stage}_{space}'))
+            self._set_gauge('mgm_analysis_seconds', labels, duration)
+            self._increment_counter('mgm_analysis_seconds_total', labels, duration)
+            self._increment_counter('mgm_analyses_total', labels)
+
+            if (space is not None) and (len(dataframe) > 0):
+                last_candle = dataframe.iloc[-1]
+                self._set_gauge('mgm_total_signal_strength', (('pair', pair), ('space', space)),
+                                float(last_candle[f'total_{space}_signal_strength']))
+
+                # Only count each candle once, also when 'process_only_new_candles' is disabled
+                if (last_candle[space] == 1) and (self.metrics['last_candles'].get((pair, space)) !=
+                                                  last_candle['date']):
+                    self.metrics['last_candles'][(pair, space)] = last_candle['date']
+                    self._increment_counter('mgm_signals_fired_total',
+                                            (('space', space), ('trend', str(last_candle['trend']))))
+
+            return dataframe
+
+        return measured_callback
+
+    def _increment_counter(self, metric_name: str, labels: tuple, value: float = 1) -> None:
+        """
+        Lock-free counter increment (Only called from the bot's main thread)
+        """
+
+        counters = self.metrics['counters']
+        counters[(metric_name, labels)] = counters.get((metric_name, labels), 0) + value
+
+    def _set_gauge(self, metric_name: str, labels: tuple, value: float) -> None:
+        """
+        Lock-free gauge update (Only called from the bot's main thread)
+        """
+
+        self.metrics['gauges'][(metric_name, labels)] = value
+
+    def _count_unclogger_reject(self, check: str) -> None:
+        """
+        Counts an Open Trade Unclogger run stopped by one of its checks (Which means the trade is held)
+        :param check: Name of the check that stopped the unclogger
+        """
+
+        if self.metrics is not None:
+            self._increment_counter('mgm_unclogger_check_rejects_total', (('check', check),))
+            self._increment_counter('mgm_unclogger_decisions_total', (('decision', 'hold'),))
+
+    def _count_unclogger_decision(self, decision: str) -> None:
+        """
+        Counts a decision of the Open Trade Unclogger
+        :param decision: 'unclog' or 'error'
+        """
+
+        if self.metrics is not None:
+            self._increment_counter('mgm_unclogger_decisions_total', (('decision', decision),))
+
+    def render_metrics(self) -> str:
+        """
+        Renders all collected metrics in the Prometheus text exposition format
+        :return: The metrics as text
+        """
+
+        # Dictionary copies are atomic, so the main thread never has to wait on a scrape
+        samples = {**self.metrics['counters'].copy(), **self.metrics['gauges'].copy(),
+                   ('mgm_custom_info_open_trades', ()): len(self.custom_info['open_trades'])}
+
+        lines = []
+        for metric_name, (metric_type, metric_help) in self.metric_descriptions.items():
+            lines.extend([f'# HELP {metric_name} {metric_help}', f'# TYPE {metric_name} {metric_type}'])
+            for (sample_name, labels), value in sorted(samples.items(), key=lambda sample: sample[0]):
+                if sample_name == metric_name:
+                    label_text = ','.join(f'{label}="{label_value}"' for label, label_value in labels)
+                    lines.append(f'{metric_name}{{{label_text}}} {value}' if label_text != '' else
+                                 f'{metric_name} {value}')
+        return '\n'.join(lines) + '\n'
+
+    @classmethod
+    def _write_metrics_textfile_loop(cls) -> None:
+        """
+        Keeps re-writing the metrics 'textfile' of the newest strategy instance, atomically so the node exporter never
+        reads a half written file. Failed writes are logged & retried on the next interval.
+        """
+
+        while True:
+            strategy = cls.metrics_exporter_runtime['strategy']
+            textfile_path = strategy.metrics_exporter['textfile']
+            if textfile_path is not None:
+                try:
+                    temporary_path = f'{textfile_path}.{os.getpid()}.tmp'
+                    with open(temporary_path, 'w') as file_object:
+                        file_object.write(strategy.render_metrics())
+                    os.replace(temporary_path, textfile_path)
+                except Exception as error:
+                    logger.warning(f'Metrics Exporter - Could not write the metrics to {textfile_path}: {error}')
+            time.sleep(strategy.metrics_exporter['textfile_interval_seconds'])
+
+    def _refresh_parameter_snapshot(self) -> dict:
+        """
+        Materializes all current weighted signal parameter values into numpy arrays, already divided by 'precision':
+        - weights[space, trend, signal]
+        - thresholds[space, trend]
+        - windows[space, trend] (Already multiplied with the 'timeframe_multiplier' when TimeFrame-Zooming)
+
+        The parameter objects are resolved only once, afterwards the arrays only get rebuilt when one of their values
+        changed (So once per HyperOpt epoch), which saves a lot of f-string + getattr lookups on every populate call.
+        :return: Dictionary containing the parameter snapshot
+        """
+
+        # Resolve the parameter objects + their positions in the snapshot arrays only once
+        if self.parameter_snapshot is None:
+            signal_names = {space: list(getattr(self, f'{space}_signals')) for space in self.mgm_spaces}
+            weight_parameter_names = []
+            weight_positions = []
+            trend_parameter_names = {'thresholds': [], 'windows': []}
+            for space_index, space in enumerate(self.mgm_spaces):
+                for trend_index, trend in enumerate(self.mgm_trends):
+                    for signal_index, signal_name in enumerate(signal_names[space]):
+                        weight_parameter_names.append(f'{space}_{trend}_trend_{signal_name}_weight')
+                        weight_positions.append((space_index, trend_index, signal_index))
+
+                    trend_parameter_names['thresholds'].append(f'{space}__{trend}_trend_total_signal_needed')
+                    trend_parameter_names['windows'].append(
+                        f'{space}__{trend}_trend_total_signal_needed_candles_lookback_window')
+
+            parameter_names = \
+                weight_parameter_names + trend_parameter_names['thresholds'] + trend_parameter_names['windows']
+            self.parameter_snapshot = {
+                'key': None,
+                'signal_names': signal_names,
+                'signal_indexes': {space: {signal_name: signal_index for signal_index, signal_name
+                                           in enumerate(signal_names[space])} for space in self.mgm_spaces},
+                'parameter_names': parameter_names,
+                'parameters': [getattr(self, parameter_name) for parameter_name in parameter_names],
+                'weight_positions': tuple(np.array(weight_positions, dtype=int).reshape(-1, 3).T)
+            }
+
+        snapshot = self.parameter_snapshot
+        key = tuple(parameter.value for parameter in snapshot['parameters'])
+        if key == snapshot['key']:
+            return snapshot
+
+        # Parameter values changed (new HyperOpt epoch), rebuild the snapshot arrays
+        weights, thresholds, windows = self._parameter_values_to_arrays(np.array([key], dtype=float))
+        snapshot['weights'] = weights[0]
+        snapshot['thresholds'] = thresholds[0]
+        snapshot['windows'] = windows[0]
+        snapshot['weight_dtype'] = self._get_weight_dtype(snapshot['weights'])
+        snapshot['key'] = key
+
+        return snapshot
+
+    def _get_weight_dtype(self, weights: np.ndarray) -> Any:
+        """
+        Determines the dtype of the total signal strength & debug weight columns according to the dtype policy.
+        An integer 'weights' dtype is only used when it can hold all weights and their totals exactly.
+        :param weights: Weights array of the parameter snapshot
+        :return: Numpy dtype to use, or None when the dtype policy is disabled
+        """
+
+        if self.dtype_policy['enabled'] is False:
+            return None
+
+        weight_dtype = np.dtype(self.dtype_policy['weights'])
+        if np.issubdtype(weight_dtype, np.integer):
+            total_weights = weights.sum(axis=-1)
+            if (np.any(weights != np.rint(weights)) or (total_weights.max(initial=0) > np.iinfo(weight_dtype).max) or
+                    (weights.min(initial=0) < np.iinfo(weight_dtype).min)):
+                self.mgm_logger('warning', 'Dtype Policy', f'Weights can\'t be stored exactly as {weight_dtype}, '
+                                                           f'falling back to float64 weights')
+                return np.dtype(np.float64)
+
+        return weight_dtype
+
+    def _parameter_values_to_arrays(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Converts raw parameter values (ordered as 'parameter_names' in the parameter snapshot) of K parameter sets into
+        the weights[K, space, trend, signal], thresholds[K, space, trend] and windows[K, space, trend] arrays.
+        :param values: Array of shape (K, number of parameters) containing the raw (HyperOpt) parameter values
+        :return: Tuple containing the weights, thresholds and windows arrays, already divided by 'precision'
+        """
+
+        snapshot = self.parameter_snapshot
+        shape = (len(values), len(self.mgm_spaces), len(self.mgm_trends))
+        number_of_weights = len(snapshot['weight_positions'][0])
+        number_of_trend_values = shape[1] * shape[2]
+        values = values / self.precision
+
+        weights = np.zeros(shape + (max(len(names) for names in snapshot['signal_names'].values()),))
+        weights[(slice(None),) + snapshot['weight_positions']] = values[:, :number_of_weights]
+
+        thresholds = values[:, number_of_weights:number_of_weights + number_of_trend_values].reshape(shape)
+
+        windows = np.maximum(np.rint(values[:, number_of_weights + number_of_trend_values:]), 1).astype(int)
+        if (self.is_dry_live_run_detected is False) and (self.informative_timeframe != self.backtest_timeframe):
+            windows *= self.timeframe_multiplier
+
+        return weights, thresholds, windows.reshape(shape)
+
+    def _generate_weight_condition(self, dataframe: DataFrame, space: str, trend_masks: dict = None) -> DataFrame:
         """
         Generates the final condition that checks the weights per trend
         :param dataframe: DataFrame populated with indicators
         :param space: buy or sell space
+        :param trend_masks: Optional dictionary containing the boolean mask of each trend
         :return: Lambda conditions 
         """
         conditions_weight = []
+        thresholds = self.parameter_snapshot['thresholds'][self.mgm_spaces.index(space)]
+        trend_masks = self._get_trend_masks(dataframe) if trend_masks is None else trend_masks
         # If TimeFrame-Zooming => Only use 'informative_timeframe' data
-        for trend in self.mgm_trends:
-            signal_needed = getattr(self, f'{space}__{trend}_trend_total_signal_needed')
-
+        for trend_index, trend in enumerate(self.mgm_trends):
             conditions_weight.append(
                 (
-                        (dataframe['trend'] == trend) & (dataframe[f'total_{space}_signal_strength']
-                                                         >= signal_needed.value / self.precision)
+                        trend_masks[trend] & (dataframe[f'total_{space}_signal_strength'] >= thresholds[trend_index])
                 ))
 
         return reduce(lambda x, y: x | y, conditions_weight)
 
-    def _add_signal(self, signal_name: str, space: str, dataframe: DataFrame, condition: Any):
+    def _add_signal(self, signal_name: str, space: str, dataframe: DataFrame, condition: Any,
+                    trend_masks: dict = None, debug_signals: dict = None):
         """
         Calculates the weight of each signal, also adds the signal to the dataframe if debugging is enabled.
         :param signal_name: Name of the signal to be added
         :param space: buy or sell
         :param dataframe: DataFrame populated with indicators
         :param condition: A valid condition to evaluate the signal
+        :param trend_masks: Optional dictionary containing the boolean mask of each trend
+        :param debug_signals: Optional dictionary collecting the signal contributions for the debug signal store
         :return: DataFrame with debug signals 
         """
 
         # Weighted Variables
         # ------------------
         # Initialize total signal variables (should be 0 = false by default)
+        weight_dtype = self.parameter_snapshot['weight_dtype']
         if 'total_buy_signal_strength' not in dataframe.columns:
-            dataframe['total_buy_signal_strength'] = dataframe['total_sell_signal_strength'] = 0
-
-        # If TimeFrame-Zooming => Only use 'informative_timeframe' data
-        has_multiplier = \
-            (self.is_dry_live_run_detected is False) and (self.informative_timeframe != self.backtest_timeframe)
-        for trend in self.mgm_trends:
-            parameter_name = f'{space}_{trend}_trend_{signal_name}_weight'
-            signal_weight = getattr(self, parameter_name)
-
-            rolling_needed = getattr(self, f'{space}__{trend}_trend_total_signal_needed_candles_lookback_window')
-            rolling_needed_value = \
-                rolling_needed.value * self.timeframe_multiplier if has_multiplier else rolling_needed.value
+            for total_signal_strength in ['total_buy_signal_strength', 'total_sell_signal_strength']:
+                dataframe[total_signal_strength] = 0 if weight_dtype is None else np.zeros(len(dataframe), weight_dtype)
+
+        space_index = self.mgm_spaces.index(space)
+        signal_index = self.parameter_snapshot['signal_indexes'][space][signal_name]
+        weights = self.parameter_snapshot['weights'][space_index, :, signal_index]
+        if weight_dtype is not None:
+            weights = weights.astype(weight_dtype)
+        windows = self.parameter_snapshot['windows'][space_index]
+        trend_masks = self._get_trend_masks(dataframe) if trend_masks is None else trend_masks
+
+        # Windows are already zoomed by the 'timeframe_multiplier' in the parameter snapshot when TimeFrame-Zooming
+        condition = np.asarray(condition, dtype=bool)
+        rolling_conditions = {}
+        for trend_index, trend in enumerate(self.mgm_trends):
+            rolling_needed_value = int(windows[trend_index])
+            if rolling_needed_value not in rolling_conditions:
+                rolling_conditions[rolling_needed_value] = self._rolling_any(condition, rolling_needed_value)
+            signal_condition = trend_masks[trend] & rolling_conditions[rolling_needed_value]
 
             if self.debuggable_weighted_signal_dataframe:
+                parameter_name = f'{space}_{trend}_trend_{signal_name}_weight'
                 if parameter_name not in dataframe.columns:
-                    dataframe[parameter_name] = 0
+                    dataframe[parameter_name] = 0 if weight_dtype is None else np.zeros(len(dataframe), weight_dtype)
 
-                dataframe.loc[((dataframe['trend'] == trend) &
-                               (condition.rolling(rolling_needed_value).sum() > 0)), parameter_name] = \
-                    signal_weight.value / self.precision
+                dataframe.loc[signal_condition, parameter_name] = weights[trend_index]
 
-            dataframe.loc[((dataframe['trend'] == trend) &
-                           (condition.rolling(rolling_needed_value).sum() > 0)),
-                          f'total_{space}_signal_strength'] += signal_weight.value / self.precision
+            if debug_signals is not None:
+                debug_signals[f'{space}_{trend}_trend_{signal_name}_weight'] = \
+                    np.where(signal_condition, weights[trend_index], 0).astype(weight_dtype or np.float32)
+
+            dataframe.loc[signal_condition, f'total_{space}_signal_strength'] += weights[trend_index]
 
         return dataframe
 
@@ -939,16 +1550,1008 @@ class MasterMoniGoManiHyperStrategy(IStrategy, ABC):
 
         signals = getattr(self, f'{space}_signals')
 
+        # Refresh the parameter snapshot (only rebuilds when the parameter values changed since the last call)
+        self._refresh_parameter_snapshot()
+
+        # Attach to the published signal matrices (if any) instead of re-evaluating all signals
+        signal_matrices = None
+        if (self.is_dry_live_run_detected is False) and (self.shared_signal_matrices['enabled'] is True):
+            signal_matrices = self._attach_signal_matrices(dataframe, metadata)
+        trend_masks = self._get_trend_masks(dataframe, None if signal_matrices is None else signal_matrices['trend'])
+        # The file sink is skipped while HyperOpting, all workers would re-write the same files each epoch
+        debug_signals = {} if (self.debuggable_weighted_signal_store['enabled'] is True) and not (
+            (self.debuggable_weighted_signal_store['sink'] == 'file') and (self.is_hyperopt_run_detected is True)) \
+            else None
+
         # Calculates the weight and/or generates the debug column for each signal
-        for signal_name, condition_func in signals.items():
-            self._add_signal(signal_name, space, dataframe, condition_func(dataframe))
+        for signal_index, (signal_name, condition_func) in enumerate(signals.items()):
+            if signal_matrices is None:
+                condition = condition_func(dataframe)
+            else:
+                condition = pd.Series(signal_matrices[space][:, signal_index], index=dataframe.index, copy=False)
+            self._add_signal(signal_name, space, dataframe, condition, trend_masks, debug_signals)
+
+        if debug_signals is not None:
+            self._store_debug_signals(space, dataframe, metadata, debug_signals)
 
         # Generates the conditions responsible for searching and comparing the weights needed to activate a buy or sell
-        dataframe.loc[(self._generate_weight_condition(dataframe=dataframe, space=space)), space] = 1
+        dataframe.loc[(self._generate_weight_condition(dataframe=dataframe, space=space, trend_masks=trend_masks)),
+                      space] = 1
 
         # Override Signals: When configured sell/buy signals can be completely turned off for each kind of trend
         for trend in self.mgm_trends:
             if not self.mgm_config['trading_during_trends'][f'{space}_trades_when_{trend}']:
-                dataframe.loc[dataframe['trend'] == trend, space] = 0
+                dataframe.loc[trend_masks[trend], space] = 0
+
+        if self.dtype_policy['enabled'] is True:
+            dataframe[space] = dataframe[space].fillna(0).astype(self.dtype_policy['signals'])
+
+        # Report the memory used by each column once per pair, after its dataframe got fully populated
+        if (self.memory_report['enabled'] is True) and (space == self.mgm_spaces[-1]):
+            self._log_memory_report(dataframe, metadata)
+
+        return dataframe
+
+    def populate_trend_batch(self, dataframe: DataFrame, metadata: dict,
+                             parameter_sets: List[dict]) -> Dict[str, np.ndarray]:
+        """
+        Batched Multi-Candidate Evaluation:
+        -----------------------------------
+        Scores K parameter sets in one pass over a dataframe. Signal activations don't depend on the parameters, so
+        they are only calculated once, after which the total signal strengths of all candidates sharing the same
+        lookback window are calculated with a single (N × S) · (S × K) matrix product per trend.
+        Meant to be used by custom HyperOpt drivers or batch BackTesters for fast candidate screening.
+
+        :param dataframe: DataFrame populated with indicators (and the 'trend' column)
+        :param metadata: Additional information, like the currently traded pair
+        :param parameter_sets: List of K dictionaries containing raw (HyperOpt) parameter values by parameter name,
+            parameters missing from a set fall back to their current value
+        :return: Dictionary containing an (N × K) 'buy' and 'sell' signal array (1 = signal) for the dataframe
+        """
+
+        weights, thresholds, windows = self._parameter_values_to_arrays(self._parameter_sets_to_values(parameter_sets))
+        trend_codes = self._get_trend_codes(dataframe)
+
+        batch_signals = {}
+        for space_index, space in enumerate(self.mgm_spaces):
+            signal_matrix = self._get_signal_matrix(space, dataframe)
+            number_of_signals = signal_matrix.shape[1]
+            space_signals = np.zeros((len(dataframe), len(parameter_sets)), dtype=np.int8)
+
+            rolled_signal_matrices = {}
+            for trend_index, trend in enumerate(self.mgm_trends):
+                # Override Signals: When configured sell/buy signals can be completely turned off for each kind of trend
+                if not self.mgm_config['trading_during_trends'][f'{space}_trades_when_{trend}']:
+                    continue
+
+                trend_rows = np.flatnonzero(trend_codes == trend_index)
+                if len(trend_rows) == 0:
+                    continue
+
+                # Group the candidates by lookback window, so each rolled signal matrix only gets calculated once
+                trend_windows = windows[:, space_index, trend_index]
+                for window in np.unique(trend_windows):
+                    candidates = np.flatnonzero(trend_windows == window)
+                    if window not in rolled_signal_matrices:
+                        rolled_signal_matrices[window] = self._rolling_any(signal_matrix, int(window))
+
+                    signal_strength = rolled_signal_matrices[window][trend_rows].astype(float) @ \
+                        weights[candidates, space_index, trend_index, :number_of_signals].T
+                    space_signals[np.ix_(trend_rows, candidates)] = \
+                        signal_strength >= thresholds[candidates, space_index, trend_index]
+
+            batch_signals[space] = space_signals
+
+        return batch_signals
+
+    def _parameter_sets_to_values(self, parameter_sets: List[dict]) -> np.ndarray:
+        """
+        :param parameter_sets: List of K dictionaries containing raw (HyperOpt) parameter values by parameter name,
+            parameters missing from a set fall back to their current value
+        :return: Array of shape (K, number of parameters), ordered as 'parameter_names' in the parameter snapshot
+        """
+
+        snapshot = self._refresh_parameter_snapshot()
+        return np.array([[parameter_set.get(parameter_name, current_value) for parameter_name, current_value
+                          in zip(snapshot['parameter_names'], snapshot['key'])] for parameter_set in parameter_sets],
+                        dtype=float).reshape(len(parameter_sets), len(snapshot['parameter_names']))
+
+    def get_effective_parameter_keys(self, parameter_sets: List[dict]) -> List[str]:
+        """
+        Canonicalizes K parameter sets into keys which are only equal when the sets generate identical buy/sell signals
+        for any data. Keys are built from the effective weights, thresholds & windows (after '/ precision', the rounding
+        of the windows & the fixed values of overridden parameters). Trends of which the signals can never fire
+        (Trading disabled in 'trading_during_trends' or a threshold above the largest reachable signal strength) and
+        trends of which the signals always fire (A threshold at or below the lowest reachable signal strength) don't
+        depend on their weights & window, so those get zeroed out.
+        Meant to be used by custom HyperOpt drivers to skip parameter sets that were already scored.
+        :param parameter_sets: List of K dictionaries containing raw (HyperOpt) parameter values by parameter name,
+            parameters missing from a set fall back to their current value
+        :return: List of K hexadecimal keys
+        """
+
+        weights, thresholds, windows = self._parameter_values_to_arrays(self._parameter_sets_to_values(parameter_sets))
+        windows = windows.astype(float)
+        trading_enabled = np.array([[self.mgm_config['trading_during_trends'][f'{space}_trades_when_{trend}']
+                                     for trend in self.mgm_trends] for space in self.mgm_spaces], dtype=bool)
+
+        never_fires = (thresholds > np.clip(weights, 0, None).sum(axis=-1)) | ~trading_enabled
+        always_fires = ~never_fires & (thresholds <= np.clip(weights, None, 0).sum(axis=-1))
+        for trend_mask, threshold in [(never_fires, np.inf), (always_fires, -np.inf)]:
+            weights[trend_mask] = 0
+            windows[trend_mask] = 0
+            thresholds[trend_mask] = threshold
+
+        effective_keys = []
+        for candidate in range(len(parameter_sets)):
+            # Adding 0.0 turns -0.0 into 0.0, so equal values always share the same bytes
+            effective_values = np.concatenate([weights[candidate].ravel(), thresholds[candidate].ravel(),
+                                               windows[candidate].ravel()]) + 0.0
+            effective_keys.append(hashlib.sha1(effective_values.tobytes()).hexdigest())
+
+        return effective_keys
+
+    def _get_signal_matrix(self, space: str, dataframe: DataFrame) -> np.ndarray:
+        """
+        Evaluates all weighted signals of a space into one signal activation matrix
+        :param space: buy or sell
+        :param dataframe: DataFrame populated with indicators
+        :return: Boolean array of shape (N candles, S signals), signals ordered like in the parameter snapshot
+        """
+
+        signals = getattr(self, f'{space}_signals')
+        signal_matrix = np.zeros((len(dataframe), len(signals)), dtype=bool)
+        for signal_index, condition_func in enumerate(signals.values()):
+            signal_matrix[:, signal_index] = np.asarray(condition_func(dataframe), dtype=bool)
+
+        return signal_matrix
+
+    def _get_trend_masks(self, dataframe: DataFrame, trend_codes: np.ndarray = None) -> dict:
+        """
+        Calculates the boolean mask of each trend only once, instead of once per signal
+        :param dataframe: DataFrame populated with the 'trend' column
+        :param trend_codes: Optional (published) trend codes to use instead of the 'trend' column
+        :return: Dictionary containing a boolean Series for each trend
+        """
+
+        if trend_codes is None:
+            return {trend: dataframe['trend'] == trend for trend in self.mgm_trends}
+
+        return {trend: pd.Series(trend_codes == trend_index, index=dataframe.index)
+                for trend_index, trend in enumerate(self.mgm_trends)}
+
+    def _get_trend_codes(self, dataframe: DataFrame) -> np.ndarray:
+        """
+        Converts the 'trend' column to trend codes
+        :param dataframe: DataFrame populated with the 'trend' column
+        :return: Array containing the index of each candle's trend in 'mgm_trends' (-1 if no trend is detected yet)
+        """
+
+        return pd.Categorical(dataframe['trend'], categories=self.mgm_trends).codes
+
+    @staticmethod
+    def get_moving_averages(series: pd.Series, sma_periods: List[int] = None,
+                            ema_periods: List[int] = None) -> np.ndarray:
+        """
+        Calculates a whole family of Simple & Exponential Moving Averages over the same series at once, matching the
+        output of TA-Lib's 'SMA' & 'EMA'. All SMA's are taken from one single cumulative sum pass, each EMA is one
+        recursive filter pass seeded with the SMA of its first period (like TA-Lib does).
+        Adding more periods to the family only costs an extra column in the preallocated array.
+        :param series: Series to average (Like the close prices)
+        :param sma_periods: List of SMA periods (expressed in candles) to calculate
+        :param ema_periods: List of EMA periods (expressed in candles) to calculate
+        :return: Float array of shape (N candles, SMA's + EMA's) with the SMA columns first, NaN during each warmup
+        """
+
+        sma_periods = [] if sma_periods is None else list(sma_periods)
+        ema_periods = [] if ema_periods is None else list(ema_periods)
+        values = np.asarray(series, dtype=np.float64)
+        moving_averages = np.full((len(values), len(sma_periods) + len(ema_periods)), np.nan)
+
+        # Skip leading NaN's (like TA-Lib does)
+        valid_indexes = np.flatnonzero(~np.isnan(values))
+        if len(valid_indexes) == 0:
+            return moving_averages
+        first_valid_index = valid_indexes[0]
+        values = values[first_valid_index:]
+
+        # Centering on the first value keeps the cumulative sum precise on long series
+        cumulative_sum = np.zeros(len(values) + 1)
+        np.cumsum(values - values[0], out=cumulative_sum[1:])
+        for column, period in enumerate(sma_periods):
+            if period <= len(values):
+                moving_averages[first_valid_index + period - 1:, column] = \
+                    (cumulative_sum[period:] - cumulative_sum[:-period]) / period + values[0]
+
+        for column, period in enumerate(ema_periods, start=len(sma_periods)):
+            if period <= len(values):
+                alpha = 2 / (period + 1)
+                seed = values[:period].mean()
+                moving_averages[first_valid_index + period - 1, column] = seed
+                moving_averages[first_valid_index + period:, column] = \
+                    lfilter([alpha], [1, alpha - 1], values[period:], zi=[(1 - alpha) * seed])[0]
+
+        return moving_averages
+
+    @classmethod
+    def get_crossovers(cls, dataframe: DataFrame, series1: str, series2: Any) -> Tuple[pd.Series, pd.Series]:
+        """
+        Paired version of qtpylib's 'crossed_above' & 'crossed_below': The sign change of 'series1 - series2' is
+        calculated once and yields both the upwards & downwards crossings.
+        Results are cached for as long as the DataFrame is alive, so mirrored buy & sell signals (Like a Golden & Death
+        Cross) only difference & shift each pair of series once. Indicator columns shouldn't be altered afterwards!
+        :param dataframe: DataFrame populated with indicators
+        :param series1: Column name of the series crossing
+        :param series2: Column name of the series being crossed, or a constant value being crossed
+        :return: Tuple containing the 'crossed above' & 'crossed below' boolean Series
+        """
+
+        dataframe_id = id(dataframe)
+        cache_entry = cls._crossover_cache.get(dataframe_id)
+        if (cache_entry is None) or (cache_entry[0]() is not dataframe):
+            cache_entry = (weakref.ref(dataframe, lambda _: cls._crossover_cache.pop(dataframe_id, None)), {})
+            cls._crossover_cache[dataframe_id] = cache_entry
+
+        crossovers = cache_entry[1]
+        if (series1, series2) not in crossovers:
+            crossed_series = dataframe[series2].to_numpy(dtype=float) if isinstance(series2, str) else series2
+            difference = dataframe[series1].to_numpy(dtype=float) - crossed_series
+            previous_difference = np.empty_like(difference)
+            previous_difference[:1] = np.nan
+            previous_difference[1:] = difference[:-1]
+
+            with np.errstate(invalid='ignore'):
+                crossed_above = (difference > 0) & (previous_difference <= 0)
+                crossed_below = (difference < 0) & (previous_difference >= 0)
+            crossovers[(series1, series2)] = (pd.Series(crossed_above, index=dataframe.index),
+                                              pd.Series(crossed_below, index=dataframe.index))
+
+        return crossovers[(series1, series2)]
+
+    @classmethod
+    def crossed_above(cls, dataframe: DataFrame, series1: str, series2: Any) -> pd.Series:
+        """
+        Cached equivalent of "qtpylib.crossed_above(dataframe[series1], dataframe[series2])"
+        :param dataframe: DataFrame populated with indicators
+        :param series1: Column name of the series crossing
+        :param series2: Column name of the series being crossed, or a constant value being crossed
+        :return: Boolean Series, True where 'series1' crossed above 'series2'
+        """
+
+        return cls.get_crossovers(dataframe, series1, series2)[0]
+
+    @classmethod
+    def crossed_below(cls, dataframe: DataFrame, series1: str, series2: Any) -> pd.Series:
+        """
+        Cached equivalent of "qtpylib.crossed_below(dataframe[series1], dataframe[series2])"
+        :param dataframe: DataFrame populated with indicators
+        :param series1: Column name of the series crossing
+        :param series2: Column name of the series being crossed, or a constant value being crossed
+        :return: Boolean Series, True where 'series1' crossed below 'series2'
+        """
+
+        return cls.get_crossovers(dataframe, series1, series2)[1]
+
+    @classmethod
+    def _rolling_any(cls, signal_matrix: np.ndarray, window: int) -> np.ndarray:
+        """
+        Numpy equivalent of "condition.rolling(window).sum() > 0" applied on all columns of a signal matrix at once.
+        Just like pandas (which returns NaN there) the first 'window - 1' candles are never active.
+
+        Sparse signals (like crossovers, which only fire on a tiny fraction of the candles) are handled as events, for
+        which the rolling-any becomes an interval dilation proportional to the number of events. Signals firing too
+        often to be sparse (like level-type signals on un-zoomed data) fall back to a dense cumulative sum kernel.
+        :param signal_matrix: Boolean array of shape (N candles) or (N candles, S signals)
+        :param window: Amount of candles to look back
+        :return: Boolean array of the same shape as the signal matrix
+        """
+
+        if signal_matrix.ndim == 2:
+            rolled_signal_matrix = np.empty(signal_matrix.shape, dtype=bool)
+            for signal_index in range(signal_matrix.shape[1]):
+                rolled_signal_matrix[:, signal_index] = cls._rolling_any(signal_matrix[:, signal_index], window)
+            return rolled_signal_matrix
+
+        signal_events = cls._get_signal_events(signal_matrix)
+        if len(signal_events) * cls.sparse_signal_candles_per_event <= 2 * len(signal_matrix):
+            return cls._dilate_signal_events(signal_events, window, len(signal_matrix))
+
+        cumulative_signals = np.cumsum(signal_matrix, axis=0, dtype=np.int32)
+        rolling_sum = cumulative_signals.copy()
+        rolling_sum[window:] -= cumulative_signals[:-window]
+        rolled_signal_matrix = rolling_sum > 0
+        rolled_signal_matrix[:window - 1] = False
+
+        return rolled_signal_matrix
+
+    @staticmethod
+    def _get_signal_events(signal: np.ndarray) -> np.ndarray:
+        """
+        Converts a signal into its event-index representation.
+        Consecutive active candles are stored as one event (Like a crossover forward filled during TimeFrame-Zoom).
+        :param signal: Boolean array of shape (N candles)
+        :return: Flat array of alternating event start & (exclusive) end candle indexes
+        """
+
+        signal = np.asarray(signal, dtype=bool)
+        if len(signal) == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        signal_events = np.flatnonzero(signal[1:] != signal[:-1]) + 1
+        if signal[0]:
+            signal_events = np.concatenate(([0], signal_events))
+        if signal[-1]:
+            signal_events = np.concatenate((signal_events, [len(signal)]))
+
+        return signal_events
+
+    @staticmethod
+    def _dilate_signal_events(signal_events: np.ndarray, window: int, number_of_candles: int) -> np.ndarray:
+        """
+        Rolling-any over the event-index representation of a signal: Each event stays active for 'window - 1' more
+        candles, overlapping events get merged so each merged interval only gets filled once.
+        :param signal_events: Flat array of alternating event start & (exclusive) end candle indexes
+        :param window: Amount of candles to look back
+        :param number_of_candles: Amount of candles in the signal
+        :return: Boolean array of shape (N candles)
+        """
+
+        rolled_signal = np.zeros(number_of_candles, dtype=bool)
+        interval_starts = np.maximum(signal_events[0::2], window - 1)
+        interval_ends = np.minimum(signal_events[1::2] - 1 + window, number_of_candles)
+        valid_intervals = interval_starts < interval_ends
+        interval_starts = interval_starts[valid_intervals]
+        interval_ends = interval_ends[valid_intervals]
+        if len(interval_starts) == 0:
+            return rolled_signal
+
+        # Merge overlapping intervals
+        new_intervals = np.ones(len(interval_starts), dtype=bool)
+        new_intervals[1:] = interval_starts[1:] > interval_ends[:-1]
+        last_intervals = np.ones(len(interval_starts), dtype=bool)
+        last_intervals[:-1] = new_intervals[1:]
+
+        for interval_start, interval_end in zip(interval_starts[new_intervals].tolist(),
+                                                interval_ends[last_intervals].tolist()):
+            rolled_signal[interval_start:interval_end] = True
+
+        return rolled_signal
+
+    def simulate_trades(self, dataframe: DataFrame, metadata: dict, buy: np.ndarray = None, sell: np.ndarray = None,
+                        minimal_roi: dict = None, stoploss: float = None, trailing_stop: bool = None,
+                        trailing_stop_positive: float = None, trailing_stop_positive_offset: float = None,
+                        trailing_only_offset_is_reached: bool = None, fee: float = 0.001) -> DataFrame:
+        """
+        Vectorized Pre-Screening Simulator:
+        -----------------------------------
+        Approximates the trades Freqtrade's BackTesting would make for a single pair, in milliseconds instead of a full
+        BackTest. Meant to cheaply rank thousands of parameter candidates, after which only the best ones should be
+        sent to a real BackTest.
+
+        Mimics Freqtrade's BackTesting logic (signals act on the next candle, ROI checked on the high, (trailing)
+        stoploss checked on the low, ROI > sell signal > stoploss priority), but ignores the wallet, max_open_trades,
+        protections and the open trade unclogger (custom_sell). Each trade's exit is searched in growing chunks of
+        candles, so the work done is proportional to the duration of the trades instead of the length of the data.
+
+        :param dataframe: DataFrame populated with indicators (and the 'buy'/'sell' columns of '_populate_trend')
+        :param metadata: Additional information, like the currently traded pair
+        :param buy: Optional buy signal array (For example a column of 'populate_trend_batch'), defaults to 'buy'
+        :param sell: Optional sell signal array (For example a column of 'populate_trend_batch'), defaults to 'sell'
+        :param minimal_roi: Optional ROI-Table (For example from 'HyperOpt.generate_roi_table'), defaults to the
+            strategy's 'minimal_roi'
+        :param stoploss: Optional stoploss, defaults to the strategy's 'stoploss'
+        :param trailing_stop: Optional trailing stop setting, defaults to the strategy's 'trailing_stop'
+        :param trailing_stop_positive: Optional trailing stop setting, defaults to the strategy's value
+        :param trailing_stop_positive_offset: Optional trailing stop setting, defaults to the strategy's value
+        :param trailing_only_offset_is_reached: Optional trailing stop setting, defaults to the strategy's value
+        :param fee: Fee ratio to apply on both the buy and the sell
+        :return: DataFrame containing the simulated trades, using the column names of Freqtrade's BackTest results
+        """
+
+        minimal_roi = self.minimal_roi if minimal_roi is None else minimal_roi
+        stoploss = abs(self.stoploss if stoploss is None else stoploss)
+        trailing_stop = self.trailing_stop if trailing_stop is None else trailing_stop
+        trailing_stop_positive = \
+            self.trailing_stop_positive if trailing_stop_positive is None else trailing_stop_positive
+        trailing_stop_positive_offset = \
+            self.trailing_stop_positive_offset if trailing_stop_positive_offset is None \
+            else trailing_stop_positive_offset
+        trailing_only_offset_is_reached = \
+            self.trailing_only_offset_is_reached if trailing_only_offset_is_reached is None \
+            else trailing_only_offset_is_reached
+        timeframe_minutes = timeframe_to_minutes(self.timeframe)
+        sell_settings = self._get_sell_settings()
+
+        # Signals are only acted upon on the candle after the one that generated them
+        number_of_candles = len(dataframe)
+        buy = dataframe['buy'].fillna(0).to_numpy() if (buy is None) and ('buy' in dataframe.columns) else buy
+        sell = dataframe['sell'].fillna(0).to_numpy() if (sell is None) and ('sell' in dataframe.columns) else sell
+        buy_signals = np.zeros(number_of_candles, dtype=bool)
+        sell_signals = np.zeros(number_of_candles, dtype=bool)
+        if buy is not None:
+            buy_signals[1:] = np.asarray(buy)[:-1] == 1
+        if sell is not None:
+            sell_signals[1:] = np.asarray(sell)[:-1] == 1
+
+        candles = {
+            'open': dataframe['open'].to_numpy(dtype=float),
+            'high': dataframe['high'].to_numpy(dtype=float),
+            'low': dataframe['low'].to_numpy(dtype=float),
+            'minutes': dataframe['date'].values.astype('datetime64[m]').astype(np.int64),
+            'buy': buy_signals,
+            'sell': sell_signals & ~buy_signals if sell_settings['use_sell_signal'] is True
+            else np.zeros(number_of_candles, dtype=bool)
+        }
+        roi_minutes, roi_values = self.get_roi_breakpoints(minimal_roi)
+
+        trade_settings = {
+            'fee': fee,
+            'stoploss': stoploss,
+            'trailing_stop': trailing_stop,
+            'trailing_stop_positive': trailing_stop_positive,
+            'trailing_stop_positive_offset': trailing_stop_positive_offset,
+            'trailing_only_offset_is_reached': trailing_only_offset_is_reached,
+            'roi_minutes': roi_minutes,
+            'roi_values': roi_values,
+            'timeframe_minutes': timeframe_minutes,
+            **{setting: value for setting, value in sell_settings.items() if setting != 'use_sell_signal'}
+        }
+
+        # Walk from trade to trade, only one trade can be open at the same time per pair (No position stacking)
+        trades = {'open_index': [], 'close_index': [], 'close_rate': [], 'sell_reason': []}
+        entry_indexes = np.flatnonzero(buy_signals & ~sell_signals)
+        first_possible_entry = 0
+        while True:
+            entry_position = np.searchsorted(entry_indexes, first_possible_entry)
+            # Don't open trades on the last candle
+            if (entry_position == len(entry_indexes)) or (entry_indexes[entry_position] >= number_of_candles - 1):
+                break
+
+            open_index = entry_indexes[entry_position]
+            close_index, close_rate, sell_reason = self._simulate_trade_exit(candles, open_index, trade_settings)
+            trades['open_index'].append(open_index)
+            trades['close_index'].append(close_index)
+            trades['close_rate'].append(close_rate)
+            trades['sell_reason'].append(sell_reason)
+            first_possible_entry = close_index + 1
+
+        open_indexes = np.array(trades['open_index'], dtype=int)
+        close_indexes = np.array(trades['close_index'], dtype=int)
+        open_rates = candles['open'][open_indexes]
+        close_rates = np.array(trades['close_rate'], dtype=float)
+
+        return DataFrame({
+            'pair': metadata.get('pair'),
+            'profit_ratio': (close_rates * (1 - fee)) / (open_rates * (1 + fee)) - 1,
+            'open_date': dataframe['date'].iloc[open_indexes].reset_index(drop=True),
+            'close_date': dataframe['date'].iloc[close_indexes].reset_index(drop=True),
+            'open_rate': open_rates,
+            'close_rate': close_rates,
+            'trade_duration': candles['minutes'][close_indexes] - candles['minutes'][open_indexes],
+            'sell_reason': pd.Series(trades['sell_reason'], dtype=object)
+        })
+
+    def _get_sell_settings(self) -> dict:
+        """
+        Resolves the sell settings the simulator needs the same way Freqtrade's StrategyResolver does, so strategies
+        that weren't loaded through the resolver work too: The strategy attribute when set, else the value inside the
+        config (or its 'ask_strategy' section), else Freqtrade's default
+        :return: Dictionary containing 'use_sell_signal', 'ignore_roi_if_buy_signal', 'sell_profit_only' &
+            'sell_profit_offset'
+        """
+
+        config = getattr(self, 'config', None) or {}
+        sell_settings = {}
+        for setting, default in [('use_sell_signal', True), ('ignore_roi_if_buy_signal', False),
+                                 ('sell_profit_only', False), ('sell_profit_offset', 0.0)]:
+            value = getattr(self, setting, None)
+            if value is None:
+                value = config.get(setting, config.get('ask_strategy', {}).get(setting, default))
+            sell_settings[setting] = value
+        return sell_settings
+
+    @staticmethod
+    def _simulate_trade_exit(candles: dict, open_index: int, trade_settings: dict) -> Tuple[int, float, str]:
+        """
+        Searches the exit of a single simulated trade, in chunks of candles that double in size each time no exit
+        was found yet.
+        :param candles: Dictionary containing the candle & signal arrays prepared by 'simulate_trades'
+        :param open_index: Index of the candle on which the trade opened
+        :param trade_settings: Dictionary containing the ROI, (trailing) stoploss & fee settings
+        :return: Tuple containing the candle index, rate & reason of the exit
+        """
+
+        fee = trade_settings['fee']
+        open_rate = candles['open'][open_index]
+        open_cost = open_rate * (1 + fee)
+        initial_stop_rate = open_rate * (1 - trade_settings['stoploss'])
+        stop_rate = initial_stop_rate
+        number_of_candles = len(candles['open'])
+
+        chunk_start = open_index
+        chunk_size = 64
+        while chunk_start < number_of_candles:
+            chunk = slice(chunk_start, min(chunk_start + chunk_size, number_of_candles))
+            highs = candles['high'][chunk]
+            lows = candles['low'][chunk]
+            high_profits = (highs * (1 - fee)) / open_cost - 1
+
+            # (Trailing) stoploss, the stop rate can only move up
+            if trade_settings['trailing_stop']:
+                stoploss_values = np.full(len(highs), trade_settings['stoploss'])
+                if trade_settings['trailing_stop_positive'] is not None:
+                    stoploss_values[high_profits > trade_settings['trailing_stop_positive_offset']] = \
+                        abs(trade_settings['trailing_stop_positive'])
+                trailing_rates = highs * (1 - stoploss_values)
+                if trade_settings['trailing_only_offset_is_reached']:
+                    trailing_rates[high_profits < trade_settings['trailing_stop_positive_offset']] = -np.inf
+                stop_rates = np.maximum(np.maximum.accumulate(trailing_rates), stop_rate)
+                # The stop rate only trails along with the high when it wasn't already hit by the low
+                previous_stop_rates = np.concatenate(([stop_rate], stop_rates[:-1]))
+                stop_rates = np.where(previous_stop_rates >= lows, previous_stop_rates, stop_rates)
+            else:
+                stop_rates = np.full(len(highs), stop_rate)
+            stoploss_hit = stop_rates >= lows
+            initial_stoploss_hit = stoploss_hit & (stop_rates == initial_stop_rate)
+
+            # ROI, based on the highest ROI-Table entry reached by the trade duration
+            trade_durations = candles['minutes'][chunk] - candles['minutes'][open_index]
+            roi_indexes = np.searchsorted(trade_settings['roi_minutes'], trade_durations, side='right') - 1
+            roi_ratios = np.where(roi_indexes >= 0, trade_settings['roi_values'][np.maximum(roi_indexes, 0)], np.inf)
+            roi_hit = (high_profits > roi_ratios) & ~initial_stoploss_hit
+            if trade_settings['ignore_roi_if_buy_signal']:
+                roi_hit &= ~candles['buy'][chunk]
+
+            # Sell signals, sold on the open of the candle
+            sell_hit = candles['sell'][chunk]
+            if trade_settings['sell_profit_only']:
+                sell_hit = sell_hit & ((candles['open'][chunk] * (1 - fee)) / open_cost - 1 >
+                                       trade_settings['sell_profit_offset'])
+
+            exit_hit = roi_hit | sell_hit | stoploss_hit
+            if exit_hit.any():
+                chunk_index = int(np.argmax(exit_hit))
+                close_index = chunk_start + chunk_index
+                if roi_hit[chunk_index]:
+                    roi_ratio = roi_ratios[chunk_index]
+                    roi_entry = trade_settings['roi_minutes'][roi_indexes[chunk_index]]
+                    close_rate = open_rate * (roi_ratio + 1 + fee) / (1 - fee)
+                    trade_duration = trade_durations[chunk_index]
+                    if (trade_duration > 0) and (trade_duration == roi_entry) and \
+                            (roi_entry % trade_settings['timeframe_minutes'] == 0) and \
+                            (candles['open'][close_index] > close_rate):
+                        return close_index, candles['open'][close_index], 'roi'
+                    return close_index, min(max(close_rate, lows[chunk_index]), highs[chunk_index]), 'roi'
+                elif sell_hit[chunk_index]:
+                    return close_index, candles['open'][close_index], 'sell_signal'
+                else:
+                    sell_reason = 'stop_loss' if initial_stoploss_hit[chunk_index] else 'trailing_stop_loss'
+                    if stop_rates[chunk_index] > highs[chunk_index]:
+                        return close_index, candles['open'][close_index], sell_reason
+                    return close_index, stop_rates[chunk_index], sell_reason
+
+            stop_rate = stop_rates[-1]
+            chunk_start += chunk_size
+            chunk_size *= 2
+
+        # Trades left open at the end of the data get force sold on the open of the last candle
+        return number_of_candles - 1, candles['open'][-1], 'force_sell'
+
+    def min_roi_reached_entry(self, trade_dur: int) -> Tuple[Any, Any]:
+        """
+        Based on trade duration defines the ROI entry that may have been reached.
+        Binary searches the (cached) sorted ROI-Table keys, so the Long Continuous ROI-Table costs O(log k) per check
+        instead of Freqtrade's O(k) scan. The keys get re-sorted whenever a new ROI-Table is assigned (HyperOpt epoch).
+        :param trade_dur: trade duration in minutes
+        :return: minimal ROI entry value or None if none proper ROI entry was found.
+        """
+
+        if (self.roi_table_keys is None) or (self.roi_table_keys[0] is not self.minimal_roi) or \
+                (len(self.roi_table_keys[1]) != len(self.minimal_roi)):
+            roi_entries = sorted(self.minimal_roi.keys(), key=int)
+            self.roi_table_keys = (self.minimal_roi, roi_entries, [int(roi_entry) for roi_entry in roi_entries])
+
+        _, roi_entries, roi_minutes = self.roi_table_keys
+        roi_index = bisect.bisect_right(roi_minutes, trade_dur) - 1
+        if roi_index < 0:
+            return None, None
+        return roi_entries[roi_index], self.minimal_roi[roi_entries[roi_index]]
+
+    @staticmethod
+    def get_roi_breakpoints(minimal_roi: dict) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Converts a ROI-Table into sorted numpy arrays, ready for binary searching the ROI entry reached
+        :param minimal_roi: ROI-Table dictionary (Keys in minutes, can be strings when loaded from json)
+        :return: Tuple containing the sorted ROI-Table minutes and their ROI ratios
+        """
+
+        roi_entries = sorted((int(minutes), float(roi)) for minutes, roi in minimal_roi.items())
+        roi_minutes = np.array([minutes for minutes, _ in roi_entries], dtype=np.int64)
+        roi_values = np.array([roi for _, roi in roi_entries], dtype=float)
+
+        return roi_minutes, roi_values
+
+    def _validate_dtype_policy(self) -> None:
+        """
+        Rejects dtype policies that can't be applied: 'indicators' must be a float dtype, 'signals' an integer dtype,
+        'weights' a numeric dtype and 'trend' an integer dtype (or null to keep the trend as is)
+        """
+
+        expected_kinds = {'indicators': ('f', 'a float'), 'signals': ('iu', 'an integer'),
+                          'weights': ('iuf', 'a numeric'), 'trend': ('iu', 'an integer')}
+        for setting, (kinds, description) in expected_kinds.items():
+            value = self.dtype_policy[setting]
+            if (setting == 'trend') and (value is None):
+                continue
+            try:
+                valid = np.dtype(value).kind in kinds
+            except TypeError:
+                valid = False
+            if valid is False:
+                sys.exit(f'MoniGoManiHyperStrategy - ERROR - Dtype Policy - "{setting}" must be {description} dtype '
+                         f'name (like "{self.dtype_policy_defaults[setting]}"), but is set to: {value}')
+
+    @classmethod
+    def _is_trend_categorical(cls) -> bool:
+        """
+        :return: True if the dtype policy stores the trend as a categorical column (When 'trend' is an integer dtype)
+        """
+
+        try:
+            return (cls.dtype_policy['trend'] is not None) and (np.dtype(cls.dtype_policy['trend']).kind in 'iu')
+        except TypeError:
+            return False
+
+    def _apply_dtype_policy(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        """
+        Downcasts all float64 indicator columns (OHLCV data is left untouched) to the 'indicators' dtype and stores the
+        trend as a categorical column backed by integer codes, as configured in the dtype policy.
+        When 'validate' is enabled the signal activations of both spaces get evaluated before and after downcasting.
+        Identical signal activations (and trends) guarantee identical buy/sell decisions for any set of weights.
+        :param dataframe: DataFrame populated with indicators
+        :param metadata: Additional information, like the currently traded pair
+        :return: DataFrame with downcasted columns
+        """
+
+        dtype_policy = 'Dtype Policy'
+        if self.dtype_policy['validate'] is True:
+            original_signal_matrices = {space: self._get_signal_matrix(space, dataframe) for space in self.mgm_spaces}
+            original_trend_codes = self._get_trend_codes(dataframe)
+
+        column_dtypes = {column: self.dtype_policy['indicators'] for column in dataframe.columns
+                         if (column not in ['open', 'high', 'low', 'close', 'volume']) and
+                         (dataframe[column].dtype == np.float64)}
+        if (self._is_trend_categorical() is True) and ('trend' in dataframe.columns):
+            column_dtypes['trend'] = pd.CategoricalDtype(self.mgm_trends)
+        dataframe = dataframe.astype(column_dtypes)
+
+        if self.dtype_policy['validate'] is True:
+            mismatches = {f'{space}_{signal_name}': int(mismatch_count) for space in self.mgm_spaces
+                          for signal_name, mismatch_count in zip(getattr(self, f'{space}_signals'), np.sum(
+                              original_signal_matrices[space] != self._get_signal_matrix(space, dataframe), axis=0))
+                          if mismatch_count > 0}
+            trend_mismatches = int(np.sum(original_trend_codes != self._get_trend_codes(dataframe)))
+            if (len(mismatches) > 0) or (trend_mismatches > 0):
+                # Always reported (also without MGM logging), a lossy downcast changes the buy/sell decisions
+                logger.warning(f'{dtype_policy} - Downcasting changed the signals of pair ({metadata["pair"]})! '
+                               f'Mismatching candles per signal: {mismatches}, mismatching trend candles: '
+                               f'{trend_mismatches}')
+            else:
+                self.mgm_logger('info', dtype_policy, f'Validated that downcasting pair ({metadata["pair"]}) results '
+                                                      f'in identical buy/sell decisions')
+
+        return dataframe
+
+    @classmethod
+    def get_memory_report(cls, dataframe: DataFrame) -> DataFrame:
+        """
+        Memory Accounting Report:
+        -------------------------
+        Reports the bytes used by each column of an analyzed dataframe, flags object-dtype columns (like an unconverted
+        'trend') and estimates the bytes each column would use under the dtype policy ('indicators' for float64
+        indicators, 'signals' for the buy/sell columns, 'weights' for the signal strength & debug weight columns and a
+        categorical for the trend). Estimates come from actually converting the column, weights that can't be stored
+        exactly aren't counted as savings (The dtype policy keeps those as float64 too).
+        :param dataframe: Analyzed dataframe
+        :return: DataFrame with the column, kind, dtype, bytes, is_object, suggested_dtype, suggested_bytes & savings
+        of each column, sorted from largest to smallest
+        """
+
+        rows = []
+        for column in dataframe.columns:
+            series = dataframe[column]
+            if column in ['date', 'open', 'high', 'low', 'close', 'volume']:
+                kind, suggested_dtype = 'ohlcv', None
+            elif column == 'trend':
+                kind, suggested_dtype = 'trend', pd.CategoricalDtype(cls.mgm_trends) \
+                    if (cls._is_trend_categorical() is True) and (series.dtype == object) else None
+            elif column in cls.mgm_spaces:
+                kind, suggested_dtype = 'signal', cls.dtype_policy['signals']
+            elif column.startswith('total_') and column.endswith('_signal_strength'):
+                kind, suggested_dtype = 'signal_strength', cls.dtype_policy['weights']
+            elif column.startswith(tuple(f'{space}_' for space in cls.mgm_spaces)) and column.endswith('_weight'):
+                kind, suggested_dtype = 'debug_weight', cls.dtype_policy['weights']
+            else:
+                kind, suggested_dtype = 'indicator', \
+                    cls.dtype_policy['indicators'] if series.dtype == np.float64 else None
+
+            column_bytes = int(series.memory_usage(deep=True, index=False))
+            suggested_bytes = column_bytes
+            if (suggested_dtype is not None) and (series.dtype != suggested_dtype):
+                suggested_series = series.fillna(0) if kind == 'signal' else series
+                suggested_series = suggested_series.astype(suggested_dtype)
+                if (kind not in ['signal_strength', 'debug_weight']) or \
+                        np.array_equal(suggested_series.to_numpy(), series.to_numpy()):
+                    suggested_bytes = int(suggested_series.memory_usage(deep=True, index=False))
+                else:
+                    suggested_dtype = None
+            else:
+                suggested_dtype = None
+
+            rows.append({'column': column, 'kind': kind, 'dtype': str(series.dtype), 'bytes': column_bytes,
+                         'is_object': series.dtype == object,
+                         'suggested_dtype': '' if suggested_dtype is None else str(suggested_dtype),
+                         'suggested_bytes': suggested_bytes, 'savings': column_bytes - suggested_bytes})
+
+        return pd.DataFrame(rows).sort_values('bytes', ascending=False, kind='stable').reset_index(drop=True)
+
+    def _log_memory_report(self, dataframe: DataFrame, metadata: dict) -> None:
+        """
+        Logs the memory used by the analyzed dataframe of a pair (once per pair) & rewrites the memory report of all
+        pairs reported so far to 'user_data/' + 'memory_report' > 'file'
+        :param dataframe: Fully analyzed dataframe
+        :param metadata: Additional information, like the currently traded pair
+        """
+
+        if self.memory_reports is None:
+            self.memory_reports = {}
+        elif metadata['pair'] in self.memory_reports:
+            return
+
+        memory_report = self.get_memory_report(dataframe)
+        self.memory_reports[metadata['pair']] = memory_report
+        object_columns = memory_report.loc[memory_report['is_object'], 'column'].tolist()
+        self.mgm_logger('info', 'Memory Report',
+                        f'Pair ({metadata["pair"]}) uses {memory_report["bytes"].sum() / 1024 ** 2:.2f} MB in '
+                        f'{len(memory_report)} columns (object columns: {object_columns}), the dtype policy could save '
+                        f'{memory_report["savings"].sum() / 1024 ** 2:.2f} MB. All {len(self.memory_reports)} pairs '
+                        f'reported so far use '
+                        f'{sum(report["bytes"].sum() for report in self.memory_reports.values()) / 1024 ** 2:.2f} MB')
+
+        report_path = os.path.join(os.getcwd(), 'user_data', self.memory_report['file'])
+        temporary_path = f'{report_path}.{os.getpid()}.tmp'
+        pd.concat([report.assign(pair=pair) for pair, report in self.memory_reports.items()],
+                  ignore_index=True).to_csv(temporary_path, index=False)
+        os.replace(temporary_path, report_path)
+
+    @staticmethod
+    def _get_pair_directory(directory: str, pair: str) -> str:
+        """
+        Returns the sub-directory of a pair inside a directory of 'user_data'
+        :param directory: Directory inside 'user_data'
+        :param pair: Pair of which the sub-directory is needed
+        :return: Path to the directory
+        """
+
+        return os.path.join(os.getcwd(), 'user_data', directory, pair.replace('/', '_').replace(':', '_'))
+
+    def _get_signal_matrices_directory(self, pair: str) -> str:
+        """
+        Returns the directory in which the signal matrices of a pair are published. It lives inside a sub-directory
+        keyed on the fingerprint of the MGM strategy source, so runs never attach to matrices of other signals
+        :param pair: Pair of which the signal matrices are published
+        :return: Path to the directory
+        """
+
+        return self._get_pair_directory(
+            os.path.join(self.shared_signal_matrices['directory'], self._get_source_fingerprint()), pair)
+
+    def _publish_signal_matrices(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        """
+        Shared Signal Matrices:
+        -----------------------
+        Publishes the signal activation matrices (which don't depend on any HyperOptable parameter) + the trend codes
+        of a pair as memory-mapped '.npy' files. This happens only once, while Freqtrade populates the indicators of
+        all pairs before starting the HyperOpt workers. All workers then attach to the same files read-only, so they
+        share the page cache instead of each keeping & re-evaluating their own copies of the signals.
+
+        The candle dates are published too, so workers can attach to the rows matching their dataframe (Freqtrade trims
+        the startup candles before handing the dataframes over to the HyperOpt workers). The matrices are named after
+        the publishing process & 'metadata.json' (which refers to them) is replaced last, so parallel runs publishing
+        into the same directory never hand a worker a mix of their matrices.
+
+        When 'drop_indicator_columns' is enabled the indicator columns are dropped from the dataframe afterwards (only
+        when attaching to the just published matrices succeeds), which shrinks the analyzed data Freqtrade hands over
+        to each HyperOpt worker.
+
+        :param dataframe: DataFrame populated with indicators
+        :param metadata: Additional information, like the currently traded pair
+        :return: DataFrame, without its indicator columns if configured
+        """
+
+        if len(dataframe) == 0:
+            return dataframe
+
+        shared_signal_matrices = 'Shared Signal Matrices'
+        pair_directory = self._get_signal_matrices_directory(metadata['pair'])
+        os.makedirs(pair_directory, exist_ok=True)
+
+        # Signal matrices are stored column-major, so each signal can be attached as a contiguous Series
+        arrays = {space: np.asfortranarray(self._get_signal_matrix(space, dataframe)) for space in self.mgm_spaces}
+        arrays['trend'] = self._get_trend_codes(dataframe).astype(np.int8)
+        arrays['date'] = self._get_date_values(dataframe)
+        publisher = os.getpid()
+        for name, array in arrays.items():
+            # Write to a temporary file first, so workers never attach to a half written matrix
+            temporary_path = os.path.join(pair_directory, f'{name}-{publisher}.tmp.npy')
+            np.save(temporary_path, array)
+            os.replace(temporary_path, os.path.join(pair_directory, f'{name}-{publisher}.npy'))
+
+        metadata_path = os.path.join(pair_directory, 'metadata.json')
+        with open(f'{metadata_path}.{publisher}.tmp', 'w') as file_object:
+            json.dump({
+                'publisher': publisher,
+                'length': len(dataframe),
+                'first_date': str(dataframe['date'].iloc[0]),
+                'last_date': str(dataframe['date'].iloc[-1]),
+                'signals': {space: list(getattr(self, f'{space}_signals')) for space in self.mgm_spaces}
+            }, file_object)
+        os.replace(f'{metadata_path}.{publisher}.tmp', metadata_path)
+
+        # Clean up the matrices of previous publishers (Workers already attached to them keep their memory-maps)
+        for file_name in os.listdir(pair_directory):
+            if file_name.endswith('.npy') and (file_name.endswith(f'-{publisher}.npy') is False) and \
+                    (file_name.endswith('.tmp.npy') is False):
+                try:
+                    os.remove(os.path.join(pair_directory, file_name))
+                except OSError:
+                    pass
+
+        if self.attached_signal_matrices is not None:
+            self.attached_signal_matrices.pop(metadata['pair'], None)
+        self.mgm_logger('info', shared_signal_matrices,
+                        f'Published the signal matrices of pair ({metadata["pair"]}) to: {pair_directory}')
+
+        # Workers fall back to evaluating the signals (which needs the indicator columns) when they can't attach
+        if (self.shared_signal_matrices['drop_indicator_columns'] is True) and \
+                (self._attach_signal_matrices(dataframe, metadata) is not None):
+            dataframe = dataframe[['date', 'open', 'high', 'low', 'close', 'volume', 'trend']]
+
+        return dataframe
+
+    @staticmethod
+    def _get_date_values(dataframe: DataFrame) -> np.ndarray:
+        """
+        :param dataframe: DataFrame containing a 'date' column
+        :return: Array with the dates of the dataframe as int64 nanoseconds since epoch
+        """
+
+        return dataframe['date'].values.astype('datetime64[ns]').view(np.int64)
+
+    def _attach_signal_matrices(self, dataframe: DataFrame, metadata: dict) -> Any:
+        """
+        Attaches read-only to the signal matrices published for a pair. The published rows are aligned to the
+        dataframe by date, since the dataframe may only hold a slice of the published candles (e.g. without the
+        startup candles). Only validated on the first attach of each slice.
+        :param dataframe: DataFrame populated with indicators
+        :param metadata: Additional information, like the currently traded pair
+        :return: Dictionary containing the memory-mapped 'buy', 'sell' & 'trend' arrays (sliced to the rows of the
+            dataframe) or None if not published or not matching the dataframe
+        """
+
+        pair = metadata.get('pair')
+        if (pair is None) or (len(dataframe) == 0):
+            return None
+        if self.attached_signal_matrices is None:
+            self.attached_signal_matrices = {}
+
+        dates = self._get_date_values(dataframe[['date']].iloc[[0, -1]])
+        attached = self.attached_signal_matrices.get(pair)
+        if (attached is None) or (attached['slice'] != (int(dates[0]), len(dataframe))):
+            pair_directory = self._get_signal_matrices_directory(str(pair))
+            metadata_path = os.path.join(pair_directory, 'metadata.json')
+            if os.path.isfile(metadata_path) is False:
+                return None
+
+            with open(metadata_path, ) as file_object:
+                published_metadata = json.load(file_object)
+
+            # Only use matrices published for this signal setup, holding the exact candles of the dataframe
+            try:
+                published_arrays = {name: np.load(os.path.join(pair_directory,
+                                                                f'{name}-{published_metadata["publisher"]}.npy'),
+                                                   mmap_mode='r') for name in self.mgm_spaces + ['trend', 'date']}
+            except (OSError, KeyError):
+                # Replaced by a parallel run in the meantime
+                return None
+            published_dates = published_arrays['date']
+            first_index = int(np.searchsorted(published_dates, dates[0]))
+            last_index = first_index + len(dataframe) - 1
+            if (last_index >= len(published_dates)) or (published_dates[first_index] != dates[0]) or \
+                    (published_dates[last_index] != dates[-1]) or \
+                    any(published_metadata['signals'][space] != list(getattr(self, f'{space}_signals'))
+                        for space in self.mgm_spaces):
+                self.mgm_logger('warning', 'Shared Signal Matrices',
+                                f'Published signal matrices of pair ({pair}) do not match its dataframe, '
+                                f'falling back to evaluating the signals')
+                return None
+
+            attached = {name: published_arrays[name][first_index:last_index + 1]
+                        for name in self.mgm_spaces + ['trend']}
+            attached['slice'] = (int(dates[0]), len(dataframe))
+            self.attached_signal_matrices[pair] = attached
+
+        return attached
+
+    def _store_debug_signals(self, space: str, dataframe: DataFrame, metadata: dict, debug_signals: dict) -> None:
+        """
+        Stores the weighted signal contributions of a pair in the debuggable weighted signal store, instead of widening
+        the dataframe with a debug column for each (space, trend, signal):
+        - 'file': A compressed columnar '.npz' file inside 'user_data/' + 'directory'
+        - 'memory': A bounded in-memory ring, only keeping the contributions of the last 'ring_size' pairs & spaces
+        :param space: buy or sell
+        :param dataframe: DataFrame populated with the total signal strength of the space
+        :param metadata: Additional information, like the currently traded pair
+        :param debug_signals: Dictionary containing the contribution array of each weighted signal
+        """
+
+        debug_signals['date'] = dataframe['date'].to_numpy(dtype='datetime64[ns]')
+        debug_signals[f'total_{space}_signal_strength'] = dataframe[f'total_{space}_signal_strength'].to_numpy()
+
+        if self.debuggable_weighted_signal_store['sink'] == 'memory':
+            if self.debug_signal_ring is None:
+                self.debug_signal_ring = OrderedDict()
+            self.debug_signal_ring[(metadata['pair'], space)] = debug_signals
+            self.debug_signal_ring.move_to_end((metadata['pair'], space))
+            while len(self.debug_signal_ring) > self.debuggable_weighted_signal_store['ring_size']:
+                self.debug_signal_ring.popitem(last=False)
+            return
+
+        pair_directory = self._get_pair_directory(self.debuggable_weighted_signal_store['directory'], metadata['pair'])
+        os.makedirs(pair_directory, exist_ok=True)
+
+        # Write to a temporary file first, so a half written file is never read
+        temporary_path = os.path.join(pair_directory, f'{space}.{os.getpid()}.tmp.npz')
+        np.savez_compressed(temporary_path, **debug_signals)
+        os.replace(temporary_path, os.path.join(pair_directory, f'{space}.npz'))
+
+    def load_debug_signals(self, pair: str, space: str) -> Any:
+        """
+        Reads the weighted signal contributions of a pair on demand from the debuggable weighted signal store
+        :param pair: Pair of which the signal contributions are needed
+        :param space: buy or sell
+        :return: DataFrame containing the date, the contribution of each weighted signal and the total signal strength,
+        or None if nothing has been stored for the pair yet
+        """
+
+        if self.debuggable_weighted_signal_store['sink'] == 'memory':
+            debug_signals = (self.debug_signal_ring or {}).get((pair, space))
+            return None if debug_signals is None else DataFrame(debug_signals).assign(
+                date=lambda df: df['date'].dt.tz_localize('UTC'))
+
+        debug_signals_path = os.path.join(
+            self._get_pair_directory(self.debuggable_weighted_signal_store['directory'], pair), f'{space}.npz')
+        if os.path.isfile(debug_signals_path) is False:
+            return None
+
+        with np.load(debug_signals_path) as debug_signals:
+            return DataFrame({name: debug_signals[name] for name in debug_signals.files}).assign(
+                date=lambda df: df['date'].dt.tz_localize('UTC'))
+
+    def merge_debug_signals(self, dataframe: DataFrame, pair: str) -> DataFrame:
+        """
+        Merges the stored weighted signal contributions of both spaces into a (plotting) dataframe, making them
+        available for the 'plot_config' just like the columns of 'debuggable_weighted_signal_dataframe'
+        :param dataframe: Analyzed DataFrame of the pair
+        :param pair: Pair of which the signal contributions are needed
+        :return: DataFrame including the debug signal columns
+        """
+
+        for space in self.mgm_spaces:
+            debug_signals = self.load_debug_signals(pair, space)
+            if debug_signals is not None:
+                debug_signals = debug_signals.drop(columns=[column for column in debug_signals.columns
+                                                            if (column != 'date') and (column in dataframe.columns)])
+                dataframe = dataframe.merge(debug_signals, on='date', how='left')
 
         return dataframe
@@ -16,21 +16,21 @@ buy_signals = {
     # Weighted Buy Signal: ADX above 25 & +DI above -DI (The trend has strength while moving up)
     'adx_strong_up': lambda df: (df['adx'] > 25),
     # Weighted Buy Signal: Re-Entering Lower Bollinger Band after downward breakout
-    'bollinger_bands': lambda df: (qtpylib.crossed_above(df['close'], df['bb_lowerband'])),
+    'bollinger_bands': lambda df: (MasterMoniGoManiHyperStrategy.crossed_above(df, 'close', 'bb_lowerband')),
     # Weighted Buy Signal: EMA long term Golden Cross (Medium term EMA crosses above Long term EMA)
-    'ema_long_golden_cross': lambda df: (qtpylib.crossed_above(df['ema50'], df['ema200'])),
+    'ema_long_golden_cross': lambda df: (MasterMoniGoManiHyperStrategy.crossed_above(df, 'ema50', 'ema200')),
     # Weighted Buy Signal: EMA short term Golden Cross (Short term EMA crosses above Medium term EMA)
-    'ema_short_golden_cross': lambda df: (qtpylib.crossed_above(df['ema9'], df['ema50'])),
+    'ema_short_golden_cross': lambda df: (MasterMoniGoManiHyperStrategy.crossed_above(df, 'ema9', 'ema50')),
     # Weighted Buy Signal: MACD above Signal
     'macd': lambda df: (df['macd'] > df['macdsignal']),
     # Weighted Buy Signal: RSI crosses above 30 (Under-bought / low-price and rising indication)
-    'rsi': lambda df: (qtpylib.crossed_above(df['rsi'], 30)),
+    'rsi': lambda df: (MasterMoniGoManiHyperStrategy.crossed_above(df, 'rsi', 30)),
     # Weighted Buy Signal: SMA long term Golden Cross (Medium term SMA crosses above Long term SMA)
-    'sma_long_golden_cross': lambda df: (qtpylib.crossed_above(df['sma50'], df['sma200'])),
+    'sma_long_golden_cross': lambda df: (MasterMoniGoManiHyperStrategy.crossed_above(df, 'sma50', 'sma200')),
     # Weighted Buy Signal: SMA short term Golden Cross (Short term SMA crosses above Medium term SMA)
-    'sma_short_golden_cross': lambda df: (qtpylib.crossed_above(df['sma9'], df['sma50'])),
+    'sma_short_golden_cross': lambda df: (MasterMoniGoManiHyperStrategy.crossed_above(df, 'sma9', 'sma50')),
     # Weighted Sell Signal: VWAP crosses above current price
-    'vwap_cross': lambda df: (qtpylib.crossed_above(df['vwap'], df['close']))
+    'vwap_cross': lambda df: (MasterMoniGoManiHyperStrategy.crossed_above(df, 'vwap', 'close'))
 }
 
 # Define the Weighted Sell Signals to be used by MGM
@@ -38,21 +38,21 @@ sell_signals = {
     # Weighted Sell Signal: ADX above 25 & +DI below -DI (The trend has strength while moving down)
     'adx_strong_down': lambda df: (df['adx'] > 25),
     # Weighted Sell Signal: Re-Entering Upper Bollinger Band after upward breakout
-    'bollinger_bands': lambda df: (qtpylib.crossed_below(df['close'], df['bb_upperband'])),
+    'bollinger_bands': lambda df: (MasterMoniGoManiHyperStrategy.crossed_below(df, 'close', 'bb_upperband')),
     # Weighted Sell Signal: EMA long term Death Cross (Medium term EMA crosses below Long term EMA)
-    'ema_long_death_cross': lambda df: (qtpylib.crossed_below(df['ema50'], df['ema200'])),
+    'ema_long_death_cross': lambda df: (MasterMoniGoManiHyperStrategy.crossed_below(df, 'ema50', 'ema200')),
     # Weighted Sell Signal: EMA short term Death Cross (Short term EMA crosses below Medium term EMA)
-    'ema_short_death_cross': lambda df: (qtpylib.crossed_below(df['ema9'], df['ema50'])),
+    'ema_short_death_cross': lambda df: (MasterMoniGoManiHyperStrategy.crossed_below(df, 'ema9', 'ema50')),
     # Weighted Sell Signal: MACD below Signal
     'macd': lambda df: (df['macd'] < df['macdsignal']),
     # Weighted Sell Signal: RSI crosses below 70 (Over-bought / high-price and dropping indication)
-    'rsi': lambda df: (qtpylib.crossed_below(df['rsi'], 70)),
+    'rsi': lambda df: (MasterMoniGoManiHyperStrategy.crossed_below(df, 'rsi', 70)),
     # Weighted Sell Signal: SMA long term Death Cross (Medium term SMA crosses below Long term SMA)
-    'sma_long_death_cross': lambda df: (qtpylib.crossed_below(df['sma50'], df['sma200'])),
+    'sma_long_death_cross': lambda df: (MasterMoniGoManiHyperStrategy.crossed_below(df, 'sma50', 'sma200')),
     # Weighted Sell Signal: SMA short term Death Cross (Short term SMA crosses below Medium term SMA)
-    'sma_short_death_cross': lambda df: (qtpylib.crossed_below(df['sma9'], df['sma50'])),
+    'sma_short_death_cross': lambda df: (MasterMoniGoManiHyperStrategy.crossed_below(df, 'sma9', 'sma50')),
     # Weighted Sell Signal: VWAP crosses below current price
-    'vwap_cross': lambda df: (qtpylib.crossed_below(df['vwap'], df['close']))
+    'vwap_cross': lambda df: (MasterMoniGoManiHyperStrategy.crossed_below(df, 'vwap', 'close'))
 }
 
 # Returns the method responsible for decorating the current class with all the parameters of the MGM
@@ -162,15 +162,16 @@ class MoniGoManiHyperStrategy(MasterMoniGoManiHyperStrategy):
 
         # SMA's & EMA's are trend following tools (Should not be used when line goes sideways)
         # SMA - Simple Moving Average (Moves slower compared to EMA, price trend over X periods)
-        dataframe['sma9'] = ta.SMA(dataframe, timeperiod=9)
-        dataframe['sma50'] = ta.SMA(dataframe, timeperiod=50)
-        dataframe['sma200'] = ta.SMA(dataframe, timeperiod=200)
-
         # EMA - Exponential Moving Average (Moves quicker compared to SMA, more weight added)
         # (For traders who trade intra-day and fast-moving markets, the EMA is more applicable)
-        dataframe['ema9'] = ta.EMA(dataframe, timeperiod=9)  # timeperiod is expressed in candles
-        dataframe['ema50'] = ta.EMA(dataframe, timeperiod=50)
-        dataframe['ema200'] = ta.EMA(dataframe, timeperiod=200)
+        # Both families are calculated at once, extra periods can be added at little extra cost
+        moving_average_periods = [9, 50, 200]  # timeperiods are expressed in candles
+        moving_averages = self.get_moving_averages(dataframe['close'], sma_periods=moving_average_periods,
+                                                   ema_periods=moving_average_periods)
+        moving_average_names = [f'{moving_average}{period}' for moving_average in ['sma', 'ema']
+                                for period in moving_average_periods]
+        for column, moving_average_name in enumerate(moving_average_names):
+            dataframe[moving_average_name] = moving_averages[:, column]
 
         # Bollinger Bands
         bollinger = qtpylib.bollinger_bands(qtpylib.typical_price(dataframe), window=20, stds=2)